@@ -1,23 +1,114 @@
 # gatway_spec.py
 
 import copy
-from typing import Any, Optional
+import re
+from typing import Any, Callable, Iterable, Optional
 
 from cloud_foundry import Function
 from cloud_foundry.utils.aws_openapi_editor import AWSOpenAPISpecEditor
 
 from cloud_foundry import logger
 
+from api_foundry.utils import yaml_io
+from api_foundry.utils.copy_on_write import CopyOnWriteSpec
+from api_foundry.utils.spec_minifier import minify_spec
 
 log = logger(__name__)
 
 
+RELATION_MARKERS = ("x-af-parent-property", "x-af-child-property")
+
+
+class SchemaAnalysis:
+    """
+    What the CRUD generators need to know about one schema object,
+    found in a single pass over its properties.
+
+    Relation properties are dropped and $ref properties are resolved once;
+    `input_properties()` then builds each operation's properties from the
+    result without touching the spec again.
+    """
+
+    schema_object: dict
+    primary_key: Optional[tuple[str, dict[str, Any]]]
+    concurrency_property: Optional[tuple[str, dict[str, Any]]]
+    required: set[str]
+    filters: Optional[list[tuple[str, Any, str]]]
+
+    def __init__(
+        self,
+        schema_object: dict[str, Any],
+        resolve: Callable[[list[str]], Any],
+    ):
+        self.schema_object = schema_object
+        self.primary_key = None
+        self.required = set(schema_object.get("required", []))
+        # (name, type, pattern) of each query filter, filled in on first use
+        self.filters = None
+
+        concurrency_name = schema_object.get("x-af-concurrency-control", None)
+        self.concurrency_property = (
+            (concurrency_name, schema_object["properties"][concurrency_name])
+            if concurrency_name
+            else None
+        )
+
+        # (name, property, referenced schema or None) of the input properties
+        self._properties: list[tuple[str, dict, Optional[dict]]] = []
+        for name, prop in schema_object["properties"].items():
+            if self.primary_key is None and "x-af-primary-key" in prop:
+                self.primary_key = (name, prop)
+            if name == concurrency_name:
+                continue
+            referenced_schema = None
+            if "$ref" in prop:
+                referenced_schema = resolve(prop["$ref"].lstrip("#/").split("/"))
+                if not isinstance(referenced_schema, dict):
+                    referenced_schema = None
+            if any(
+                marker in prop
+                or (referenced_schema is not None and marker in referenced_schema)
+                for marker in RELATION_MARKERS
+            ):
+                continue
+            self._properties.append((name, prop, referenced_schema))
+
+    def input_properties(self, include_primary_key: bool = False) -> dict[str, Any]:
+        """Non-relation properties other than the concurrency property.
+
+        Resolved $ref properties are merged anew on each call, so operations
+        never share them.
+        """
+        excluded = (
+            self.primary_key[0]
+            if self.primary_key and not include_primary_key
+            else None
+        )
+        result = dict()
+        for name, prop, referenced_schema in self._properties:
+            if name == excluded:
+                continue
+            if referenced_schema is not None:
+                prop = {**prop, **referenced_schema}
+                prop.pop("$ref")
+            result[name] = prop
+        return result
+
+    def required_properties(self, input_properties: dict[str, Any]) -> list[str]:
+        """The names in `input_properties` the schema lists as required."""
+        return [name for name in input_properties if name in self.required]
+
+
 class APISpecEditor:
     api_spec: dict
     function: Optional[Function]
     integrations: list[dict]
     batch_path: Optional[str]
     token_validators: list[dict]
+    shared_parameters: bool
+    minify: bool
+    strip_docs: bool
+    crud_schemas: Optional[set[str]]
 
     def __init__(
         self,
@@ -26,14 +117,37 @@ class APISpecEditor:
         function: Optional[Function],
         batch_path: Optional[str] = None,
         token_validators: Optional[list[dict]] = None,
+        shared_parameters: bool = False,
+        minify: bool = False,
+        strip_docs: bool = False,
+        crud_schemas: Optional[Iterable[str]] = None,
+        database_functions: Optional[dict[str, Function]] = None,
     ):
         self.function = function
+        # Functions serving the operations of each x-af-database, in place
+        # of `function`
+        self.database_functions = database_functions or {}
         self.batch_path = batch_path
         self.token_validators = token_validators or []
+        # Emit query filters once per schema under components/parameters
+        self.shared_parameters = shared_parameters
+        self.shared_parameter_keys: dict[tuple[str, str], str] = {}
+        # Drop x-af-* extensions, and with strip_docs documentation, from
+        # the spec rest_api_spec returns
+        self.minify = minify or strip_docs
+        self.strip_docs = strip_docs
+        self.minified_bytes: Optional[int] = None
+        # Schemas to generate CRUD operations for; None means all
+        self.crud_schemas = set(crud_schemas) if crud_schemas is not None else None
+        self._minify_report: Optional[dict[str, Any]] = None
+        self.regex_patterns: dict[tuple, str] = {}
+        # SchemaAnalysis by id of the schema object it analyzes
+        self.schema_analyses: dict[int, SchemaAnalysis] = {}
         self.integrations = []
-        self.editor = AWSOpenAPISpecEditor(
-            copy.deepcopy(open_api_spec) if open_api_spec else None
-        )
+        # The editor's tree shares subtrees with open_api_spec; containers
+        # are copied before they are written to
+        self.spec_tree = CopyOnWriteSpec(open_api_spec or {})
+        self.editor = AWSOpenAPISpecEditor(open_api_spec or None)
 
     def _get_validators_for_schema(self, schema_object: dict) -> list[str]:
         """Extract validator names from schema object.
@@ -105,7 +219,7 @@ class APISpecEditor:
                     {
                         "path": path,
                         "method": method,
-                        "function": self.function,
+                        "function": self.function_for(operation),
                     }
                 )
 
@@ -122,21 +236,117 @@ class APISpecEditor:
         if schemas:
             if isinstance(schemas, dict):
                 for schema_name, schema_object in schemas.items():
-                    self.generate_crud_operations(schema_name, schema_object)
+                    if self.serves(schema_name):
+                        self.generate_crud_operations(schema_name, schema_object)
             elif isinstance(schemas, list):
                 for schema_object in schemas:
                     schema_name = schema_object.get("name", None)
-                    if schema_name:
+                    if schema_name and self.serves(schema_name):
                         self.generate_crud_operations(schema_name, schema_object)
 
         # Generate batch operation endpoint if batch_path is specified
         if self.batch_path:
             self.generate_batch_operation(self.batch_path)
 
-        #        self.editor.remove_attributes_with_pattern("^x-af-.*$")
+        self.correct_schema_names()
+        if self.minify:
+            return self.minified_spec_yaml()
+        return self.spec_yaml()
+
+    def function_for(self, item: Any) -> Optional[Function]:
+        """The function serving a schema object or path operation."""
+        if (
+            isinstance(item, dict)
+            and item.get("x-af-database") in self.database_functions
+        ):
+            return self.database_functions[item["x-af-database"]]
+        return self.function
+
+    def serves(self, schema_name: str) -> bool:
+        """Whether CRUD operations are generated for `schema_name`."""
+        return self.crud_schemas is None or schema_name in self.crud_schemas
+
+    def writable_spec_part(self, keys: list[str]) -> Any:
+        """The spec node at `keys`, copied first if shared with the source."""
+        return self.spec_tree.writable(self.editor.openapi_spec, keys)
+
+    def correct_schema_names(self):
+        """Rename component schemas to alphabetic names and update $refs.
+
+        Matches AWSOpenAPISpecEditor.correct_schema_names, but only copies
+        the source containers it changes instead of editing them.
+        """
+        schemas = self.editor.get_spec_part(["components", "schemas"])
+        if not schemas:
+            return
+
+        renamed = {}
+        for schema_name in schemas:
+            new_schema_name = re.sub(r"[^a-zA-Z]", "", schema_name)
+            if new_schema_name != schema_name:
+                renamed[schema_name] = new_schema_name
+        if not renamed:
+            return
+
+        schemas = self.writable_spec_part(["components", "schemas"])
+        for old_name, new_name in renamed.items():
+            schemas[new_name] = schemas.pop(old_name)
+
+        marker = "#/components/schemas/"
+        order = {old_name: index for index, old_name in enumerate(renamed)}
+        lengths = sorted({len(old_name) for old_name in renamed})
+        rewritten: dict[str, str] = {}
+
+        def rewrite(ref: str) -> str:
+            if ref in rewritten:
+                return rewritten[ref]
+            # Renamed schemas whose reference occurs in ref; as upstream, the
+            # last one in rename order rewrites the original ref
+            matches = []
+            start = ref.find(marker)
+            while start >= 0:
+                tail = ref[start:].removeprefix(marker)
+                matches.extend(tail[:n] for n in lengths if tail[:n] in order)
+                start = ref.find(marker, start + 1)
+            result = ref
+            if matches:
+                old_name = max(matches, key=order.__getitem__)
+                result = ref.replace(marker + old_name, marker + renamed[old_name])
+            rewritten[ref] = result
+            return result
+
+        self.spec_tree.rewrite_refs(self.editor.openapi_spec, rewrite)
+
+    def spec_yaml(self) -> str:
+        """Serialize the spec under construction, preserving key order."""
+        return yaml_io.safe_dump(self.editor.openapi_spec, sort_keys=False)
+
+    def minified_spec_yaml(self) -> str:
+        """Serialize the spec without x-af-* extensions (and docs)."""
+        specification = yaml_io.safe_dump(
+            minify_spec(self.editor.openapi_spec, strip_docs=self.strip_docs),
+            sort_keys=False,
+        )
+        self.minified_bytes = len(specification.encode("utf-8"))
+        return specification
 
-        self.editor.correct_schema_names()
-        return self.editor.yaml
+    def minify_report(self) -> Optional[dict[str, Any]]:
+        """Bytes of the spec before and after minification, or None.
+
+        Serializes the unminified spec to measure it, so it costs about
+        as much as rest_api_spec itself; it is computed once, on request.
+        """
+        if self.minified_bytes is None:
+            return None
+        if self._minify_report is None:
+            full_bytes = len(self.spec_yaml().encode("utf-8"))
+            self._minify_report = {
+                "bytes": full_bytes,
+                "minified_bytes": self.minified_bytes,
+                "saved_bytes": full_bytes - self.minified_bytes,
+                "saved_ratio": round(1 - self.minified_bytes / full_bytes, 4),
+            }
+        return self._minify_report
 
     def add_operation(
         self,
@@ -164,9 +374,23 @@ class APISpecEditor:
             {
                 "path": path,
                 "method": method,
-                "function": function or self.function,
+                "function": function or self.function_for(schema_object),
             }
         )
+        # The editor adds the method to an existing path item in place, and
+        # may extend the oauth2 scopes of an existing security scheme
+        self.writable_spec_part(["paths", path])
+        if isinstance(schema_object, dict) and "x-af-security" in schema_object:
+            self.writable_spec_part(
+                [
+                    "components",
+                    "securitySchemes",
+                    schema_name,
+                    "flows",
+                    "clientCredentials",
+                    "scopes",
+                ]
+            )
         self.editor.add_operation(
             path=path,
             method=method,
@@ -175,7 +399,33 @@ class APISpecEditor:
             schema_object=schema_object,
         )
 
+    @staticmethod
+    def regex_signature(property: dict[str, Any]) -> tuple:
+        """The property attributes generate_regex depends on."""
+        return (
+            property.get("type"),
+            property.get("format"),
+            property.get("pattern"),
+            property.get("max_length"),
+            property.get("min_length"),
+            property.get("signed"),
+        )
+
     def generate_regex(self, property: dict[str, Any]) -> str:
+        """Filter pattern for a property, shared by equal signatures.
+
+        Patterns are built once per regex_signature; `regex_patterns` maps
+        each signature seen to its pattern.
+        """
+        signature = self.regex_signature(property)
+        pattern = self.regex_patterns.get(signature)
+        if pattern is None:
+            pattern = self._build_regex(property)
+            self.regex_patterns[signature] = pattern
+        return pattern
+
+    @staticmethod
+    def _build_regex(property: dict[str, Any]) -> str:
         regex_pattern = ""
         relational_patterns = []
 
@@ -239,25 +489,63 @@ class APISpecEditor:
             + rf"|^not-like::.+$"
         )
 
-    def generate_query_parameters(self, schema_object: dict[str, Any]):
+    def generate_query_parameters(
+        self, schema_object: dict[str, Any], schema_name: Optional[str] = None
+    ):
+        """Query filter parameters for the properties of a schema object.
+
+        In shared_parameters mode each filter of `schema_name` is defined
+        once under components/parameters and returned as a $ref.
+        """
+        analysis = self.analyze(schema_object)
+        if analysis.filters is None:
+            analysis.filters = [
+                (name, prop["type"], self.generate_regex(prop))
+                for name, prop in analysis.input_properties(
+                    include_primary_key=True
+                ).items()
+            ]
+
         parameters = []
-        for (
-            property_name,
-            property_details,
-        ) in self.get_input_properties(schema_object, include_primary_key=True).items():
+        for property_name, property_type, pattern in analysis.filters:
             parameter = {
                 "in": "query",
                 "name": property_name,
                 "required": False,
                 "schema": {
-                    "type": property_details["type"],
-                    "pattern": self.generate_regex(property_details),
+                    "type": property_type,
+                    "pattern": pattern,
                 },  # Assuming default type is string
                 "description": f"Filter by {property_name}",
             }
+            if self.shared_parameters and schema_name:
+                parameter = self._shared_parameter(
+                    schema_name, property_name, parameter
+                )
             parameters.append(parameter)
         return parameters
 
+    def _shared_parameter(
+        self, schema_name: str, property_name: str, parameter: dict
+    ) -> dict:
+        """$ref to `parameter`, registered under components/parameters once."""
+        key = self.shared_parameter_keys.get((schema_name, property_name))
+        if key is None:
+            self.editor.get_or_create_spec_part(
+                ["components", "parameters"], create=True
+            )
+            components = self.writable_spec_part(["components", "parameters"])
+            # API Gateway only accepts alphanumeric component names
+            base = re.sub(r"[^A-Za-z0-9]", "", f"{schema_name}_{property_name}")
+            key = f"{base}Filter"
+            suffix = 2
+            while key in components:
+                key = f"{base}Filter{suffix}"
+                suffix += 1
+            components[key] = parameter
+            self.shared_parameter_keys[(schema_name, property_name)] = key
+        return {"$ref": f"#/components/parameters/{key}"}
+
     def __list_of_schema(self, schema_name: str):
         return {
             "application/json": {
@@ -268,63 +556,35 @@ class APISpecEditor:
             }
         }
 
+    def analyze(self, schema_object: dict[str, Any]) -> SchemaAnalysis:
+        """The SchemaAnalysis of `schema_object`, made on first request."""
+        analysis = self.schema_analyses.get(id(schema_object))
+        if analysis is None or analysis.schema_object is not schema_object:
+            analysis = SchemaAnalysis(schema_object, self.editor.get_spec_part)
+            self.schema_analyses[id(schema_object)] = analysis
+        return analysis
+
     def get_primary_key(
         self, schema_object: dict[str, Any]
     ) -> Optional[tuple[str, dict[str, Any]]]:
-        for name, property in schema_object["properties"].items():
-            if "x-af-primary-key" in property:
-                return (name, property)
-        return None
+        return self.analyze(schema_object).primary_key
 
     def get_concurrency_property(
         self, schema_object: dict[str, Any]
     ) -> Optional[tuple[str, dict[str, Any]]]:
-        concurrency_property = schema_object.get("x-af-concurrency-control", None)
-        if concurrency_property:
-            return (
-                concurrency_property,
-                schema_object["properties"][concurrency_property],
-            )
-        return None
+        return self.analyze(schema_object).concurrency_property
 
     def get_input_properties(
         self, schema_object: dict[str, Any], include_primary_key: bool = False
     ) -> dict[str, Any]:
-        # Retrieve primary key and concurrency property if they exist
-        primary_key = (
-            self.get_primary_key(schema_object) if not include_primary_key else None
-        )
-        concurrency_property = self.get_concurrency_property(schema_object)
-
-        result = dict()
-        for name, prop in schema_object["properties"].items():
-            if "$ref" in prop:
-                ref_parts = prop["$ref"].lstrip("#/").split("/")
-                referenced_schema = self.editor.get_spec_part(ref_parts)
-                if isinstance(referenced_schema, dict):
-                    prop = {**prop, **referenced_schema}
-                    prop.pop("$ref")
-
-            if (
-                "x-af-parent-property" not in prop
-                and "x-af-child-property" not in prop
-                and (
-                    include_primary_key
-                    or name != (primary_key[0] if primary_key else None)
-                )
-                and name != (concurrency_property[0] if concurrency_property else None)
-            ):
-                result[name] = prop
-        return result
+        return self.analyze(schema_object).input_properties(include_primary_key)
 
     def get_required_input_properties(
         self,
         schema_object: dict[str, Any],
         input_properties: dict[str, Any],
     ) -> list[str]:
-        # Filter the required properties from input properties
-        required_properties = schema_object.get("required", [])
-        return [name for name in input_properties if name in required_properties]
+        return self.analyze(schema_object).required_properties(input_properties)
 
     def generate_crud_operations(self, schema_name: str, schema_object: dict):
         path = f"/{schema_name.lower()}"
@@ -384,7 +644,9 @@ class APISpecEditor:
             method="get",
             operation={
                 "summary": f"Retrieve all {schema_name}",
-                "parameters": self.generate_query_parameters(schema_object),
+                "parameters": self.generate_query_parameters(
+                    schema_object, schema_name
+                ),
                 "responses": {
                     "200": {
                         "description": f"A list of {schema_name}.",
@@ -551,7 +813,9 @@ class APISpecEditor:
             method="put",
             operation={
                 "summary": f"Update an existing {schema_name} by ID",
-                "parameters": self.generate_query_parameters(schema_object),
+                "parameters": self.generate_query_parameters(
+                    schema_object, schema_name
+                ),
                 "requestBody": {
                     "required": False,
                     "content": {
@@ -674,7 +938,9 @@ class APISpecEditor:
             method="delete",
             operation={
                 "summary": f"Delete many existing {schema_name} using query",
-                "parameters": self.generate_query_parameters(schema_object),
+                "parameters": self.generate_query_parameters(
+                    schema_object, schema_name
+                ),
                 "responses": {
                     "204": {
                         "description": f"{schema_name} deleted successfully",
@@ -686,6 +952,17 @@ class APISpecEditor:
             schema_object=schema_object,
         )
 
+    def add_component_schemas(self, schemas: dict[str, dict]) -> None:
+        """Add component schemas to the spec under construction, in place.
+
+        Existing schemas of the same name are replaced. The definitions are
+        copied, so the spec never shares nodes with the caller.
+        """
+        self.editor.get_or_create_spec_part(["components", "schemas"], create=True)
+        components = self.writable_spec_part(["components", "schemas"])
+        for schema_name, schema_def in schemas.items():
+            components[schema_name] = copy.deepcopy(schema_def)
+
     def generate_batch_operation(self, path: str):
         """Generate batch operations endpoint with full schema definitions."""
 
@@ -814,22 +1091,7 @@ class APISpecEditor:
             },
         }
 
-        # Add schemas to the editor's spec by directly accessing components
-        # The editor will handle this when generating the final YAML
-        import yaml as yaml_lib
-
-        current_spec = yaml_lib.safe_load(self.editor.yaml)
-        if "components" not in current_spec:
-            current_spec["components"] = {}
-        if "schemas" not in current_spec["components"]:
-            current_spec["components"]["schemas"] = {}
-
-        # Add batch schemas
-        for schema_name, schema_def in batch_schemas.items():
-            current_spec["components"]["schemas"][schema_name] = schema_def
-
-        # Update the editor with the modified spec
-        self.editor = AWSOpenAPISpecEditor(current_spec)
+        self.add_component_schemas(batch_schemas)
 
         # Add batch endpoint
         self.add_operation(
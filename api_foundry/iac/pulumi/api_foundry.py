@@ -1,19 +1,54 @@
 import os
 import json
-import yaml
+import logging
+import time
 import boto3
-from typing import Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, Union
 from pulumi import ComponentResource
 
 import pulumi
+import pulumi_aws as aws
 import cloud_foundry
+from cloud_foundry.pulumi.custom_domain import CustomCertificate
+from cloud_foundry.utils.names import resource_id
 
 from api_foundry.iac.gateway_spec import APISpecEditor
+from api_foundry.utils import app_exception, config_writer, model_artifact, yaml_io
+from api_foundry.utils.instrumentation import BuildInstrumentation, profiled
+from api_foundry.utils.model_compiler import compile_model, model_cache_enabled
 from api_foundry.utils.model_factory import ModelFactory
+from api_foundry.utils.sharding import ShardBy, SpecShard, partition_spec
+from api_foundry.utils.spec_cache import SpecCache, get_spec_cache
 from cloud_foundry import logger
 
 log = logger(__name__)
 
+# Upper bound on concurrent S3 GETs issued while loading spec fragments
+S3_MAX_WORKERS = 16
+
+# Formats the compiled model can be shipped to the Lambda in
+MODEL_FORMATS = ("yaml", "binary")
+
+# pip requirements of each query engine database driver
+DRIVER_REQUIREMENTS = {
+    "psycopg2": ["psycopg2-binary"],
+    "data-api": [],
+    "cx_oracle": ["cx_Oracle"],
+    "mysqlclient": ["mysqlclient"],
+}
+DRIVER_PACKAGES = {p for packages in DRIVER_REQUIREMENTS.values() for p in packages}
+
+# Driver the query engine uses for an x-af-engine naming only a dialect
+DEFAULT_DRIVERS = {
+    "postgres": "psycopg2",
+    "oracle": "cx_oracle",
+    "mysql": "mysqlclient",
+}
+
+# Dialect assumed for databases without an x-af-engine
+DEFAULT_ENGINE = "postgres"
+
 
 def is_valid_openapi_spec(spec_dict: dict) -> bool:
     return (
@@ -23,7 +58,96 @@ def is_valid_openapi_spec(spec_dict: dict) -> bool:
     )
 
 
-def load_api_spec(api_spec: Union[str, list[str]]) -> dict:
+def list_s3_spec_objects(s3, bucket: str, prefix: str) -> list[tuple[str, str]]:
+    """
+    List the .yaml/.yml objects under an S3 prefix as (key, etag) pairs,
+    following pagination, sorted by key so fragments merge in a stable
+    order.
+    """
+    objects = []
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            if obj["Key"].endswith((".yaml", ".yml")):
+                objects.append((obj["Key"], obj.get("ETag")))
+    return sorted(objects)
+
+
+def load_s3_specs(
+    s3,
+    urls: list[str],
+    max_workers: Optional[int] = None,
+    etags: Optional[dict[str, str]] = None,
+    cache: Optional[SpecCache] = None,
+) -> dict[str, dict]:
+    """
+    Download and parse the given s3:// spec files concurrently with a
+    shared client.
+
+    When a cache is given, objects are looked up by ETag (taken from
+    `etags` or a HEAD request) and only cache misses are downloaded and
+    parsed. Returns a mapping of URL to the parsed document. Per-file fetch
+    timings are logged at debug level along with an overall summary.
+    """
+    if not urls:
+        return {}
+    etags = etags or {}
+
+    def _load(url: str) -> tuple[dict, float]:
+        bucket, key = url[5:].split("/", 1)
+        start = time.perf_counter()
+        cache_key = None
+        if cache is not None:
+            etag = etags.get(url) or s3.head_object(Bucket=bucket, Key=key)["ETag"]
+            cache_key = SpecCache.etag_key(bucket, key, etag)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                log.debug("loaded %s from cache in %.1f ms", url, elapsed_ms)
+                return cached, elapsed_ms
+
+        obj = s3.get_object(Bucket=bucket, Key=key)
+        body = obj["Body"].read().decode("utf-8")
+        spec_dict = yaml_io.safe_load(body)
+        if cache is not None and obj.get("ETag"):
+            cache.put(SpecCache.etag_key(bucket, key, obj["ETag"]), spec_dict)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        log.debug("fetched %s (%d bytes) in %.1f ms", url, len(body), elapsed_ms)
+        return spec_dict, elapsed_ms
+
+    workers = max(1, min(max_workers or S3_MAX_WORKERS, len(urls)))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_load, urls))
+    log.info(
+        "loaded %d spec files from S3 in %.1f ms (%d workers, %.1f ms serial)",
+        len(urls),
+        (time.perf_counter() - start) * 1000,
+        workers,
+        sum(elapsed for _, elapsed in results),
+    )
+    return {url: spec_dict for url, (spec_dict, _) in zip(urls, results)}
+
+
+def load_spec_file(path: str, cache: Optional[SpecCache] = None) -> dict:
+    """Parse a local spec file, reusing a cached parse of identical content."""
+    if cache is None:
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml_io.safe_load(f)
+
+    with open(path, "rb") as f:
+        content = f.read()
+    cache_key = SpecCache.content_key(content)
+    spec_dict = cache.get(cache_key)
+    if spec_dict is None:
+        spec_dict = yaml_io.safe_load(content.decode("utf-8"))
+        cache.put(cache_key, spec_dict)
+    return spec_dict
+
+
+def load_api_spec(
+    api_spec: Union[str, list[str]], max_workers: Optional[int] = None
+) -> dict:
     """
     Load one or more OpenAPI specs from files, directories,
     S3, or inline YAML.
@@ -34,8 +158,24 @@ def load_api_spec(api_spec: Union[str, list[str]]) -> dict:
             - S3 URL(s): s3://bucket/key or s3://bucket/prefix/
             - Inline YAML string with an OpenAPI document
 
+        S3 files are downloaded concurrently (at most `max_workers`, default
+        S3_MAX_WORKERS) through a single shared client.
+
+        With API_FOUNDRY_SPEC_CACHE or API_FOUNDRY_SPEC_CACHE_DIR set,
+        parsed file and S3 documents are kept in an on-disk cache (see
+        api_foundry.utils.spec_cache) keyed by content hash or ETag, so
+        unchanged fragments skip YAML parsing on later runs.
+
         Returns a shallow-merged spec dict; later documents win on conflicts.
     """
+    s3_client = None
+    s3_etags: dict[str, str] = {}
+
+    def _s3():
+        nonlocal s3_client
+        if s3_client is None:
+            s3_client = boto3.client("s3")
+        return s3_client
 
     def _is_s3_url(s: str) -> bool:
         return isinstance(s, str) and s.startswith("s3://")
@@ -66,23 +206,19 @@ def load_api_spec(api_spec: Union[str, list[str]]) -> dict:
             if _is_s3_url(spec):
                 bucket, key = spec[5:].split("/", 1)
                 if key.endswith("/"):
-                    s3 = boto3.client("s3")
-                    resp = s3.list_objects_v2(Bucket=bucket, Prefix=key)
-                    contents = resp.get("Contents", [])
-                    keys = [
-                        o["Key"]
-                        for o in contents
-                        if o["Key"].endswith((".yaml", ".yml"))
-                    ]
-                    inputs.extend([f"s3://{bucket}/{k}" for k in sorted(keys)])
+                    for k, etag in list_s3_spec_objects(_s3(), bucket, key):
+                        url = f"s3://{bucket}/{k}"
+                        if etag:
+                            s3_etags[url] = etag
+                        inputs.append(url)
                 else:
                     inputs.append(spec)
                 continue
 
             # Inline YAML
             try:
-                as_yaml = yaml.safe_load(spec)
-            except yaml.YAMLError as exc:  # not YAML
+                as_yaml = yaml_io.safe_load(spec)
+            except yaml_io.YAMLError as exc:  # not YAML
                 raise ValueError(f"Invalid OpenAPI spec source: {spec}") from exc
 
             if is_valid_openapi_spec(as_yaml):
@@ -92,29 +228,82 @@ def load_api_spec(api_spec: Union[str, list[str]]) -> dict:
 
         return inputs
 
+    cache = get_spec_cache()
+    inputs = _gather_inputs(api_spec)
+    s3_urls = list(dict.fromkeys(s for s in inputs if _is_s3_url(s)))
+    s3_specs = (
+        load_s3_specs(_s3(), s3_urls, max_workers, etags=s3_etags, cache=cache)
+        if s3_urls
+        else {}
+    )
+
     merged: dict = {}
-    for source in _gather_inputs(api_spec):
+    for source in inputs:
         if isinstance(source, dict):
             spec_dict = source
         elif _is_s3_url(source):
-            bucket, key = source[5:].split("/", 1)
-            s3 = boto3.client("s3")
-            obj = s3.get_object(Bucket=bucket, Key=key)
-            spec_dict = yaml.safe_load(obj["Body"].read().decode("utf-8"))
+            spec_dict = s3_specs[source]
         else:
-            with open(source, "r", encoding="utf-8") as f:
-                spec_dict = yaml.safe_load(f)
+            spec_dict = load_spec_file(source, cache)
 
         if not is_valid_openapi_spec(spec_dict):
             raise ValueError(f"Invalid OpenAPI spec found in: {source}")
 
         merged.update(spec_dict)
 
+    if cache is not None:
+        log.info("spec cache: %d hits, %d misses", cache.hits, cache.misses)
+        cache.prune()
+
     return merged
 
 
+def driver_requirements(engines: list[str], env_vars: dict) -> list[str]:
+    """
+    Driver packages for x-af-engine values ("postgres", "postgres:data-api",
+    ...), resolving a bare dialect's driver as the query engine does: from
+    <DIALECT>_DEFAULT_DRIVER in the Lambda environment, else the default.
+    """
+    requirements = []
+    for engine in engines:
+        dialect, _, driver = engine.partition(":")
+        if not driver:
+            driver = env_vars.get(f"{dialect.upper()}_DEFAULT_DRIVER")
+            if not isinstance(driver, str):
+                driver = DEFAULT_DRIVERS.get(dialect)
+        for requirement in DRIVER_REQUIREMENTS.get(driver, []):
+            if requirement not in requirements:
+                requirements.append(requirement)
+    return requirements
+
+
+def database_secrets(secrets_map: dict[str, str], databases: list[str]) -> dict:
+    """The entries of a secrets map for `databases`."""
+    own = {}
+    for database in databases:
+        for key in (database, database.lower()):
+            if key in secrets_map:
+                own[key] = secrets_map[key]
+                break
+        else:
+            log.warning("no secret configured for database %s", database)
+    return own
+
+
+def shard_export_name(export_api: Optional[str], shard: str) -> Optional[str]:
+    """Export target of one shard's spec: `<root>-<shard><ext>`."""
+    if not export_api:
+        return export_api
+    root, ext = os.path.splitext(export_api)
+    return f"{root}-{shard}{ext}"
+
+
 class APIFoundry(ComponentResource):
     api_spec_editor: APISpecEditor
+    # shard name -> (function, rest_api) when built in shards
+    shards: dict[str, tuple]
+    # every Lambda built, by resource name
+    functions: dict[str, Any]
 
     def __init__(
         self,
@@ -133,11 +322,79 @@ class APIFoundry(ComponentResource):
         hosted_zone_id: Optional[str] = None,
         subdomain: Optional[str] = None,
         export_api: Optional[str] = None,
+        model_format: Optional[str] = None,
+        shared_parameters: Optional[bool] = None,
+        minify: Optional[bool] = None,
+        strip_docs: Optional[bool] = None,
+        shards: Optional[ShardBy] = None,
+        function_per_database: Optional[Union[bool, dict[str, dict]]] = None,
+        instrumentation: Optional[BuildInstrumentation] = None,
         opts=None,
     ):
         super().__init__("cloud_foundry:apigw:APIFoundry", name, None, opts)
 
-        api_spec_dict = load_api_spec(api_spec)
+        self.instrumentation = instrumentation or BuildInstrumentation()
+        self.shards = {}
+        self.functions = {}
+        with profiled(name):
+            self._synthesize(
+                name,
+                api_spec=api_spec,
+                batch_path=batch_path,
+                secrets=secrets,
+                path_prefix=path_prefix,
+                environment=environment,
+                integrations=integrations,
+                token_validators=token_validators,
+                timeout_seconds=timeout_seconds,
+                policy_statements=policy_statements,
+                vpc_config=vpc_config,
+                hosted_zone_id=hosted_zone_id,
+                subdomain=subdomain,
+                export_api=export_api,
+                model_format=model_format,
+                shared_parameters=shared_parameters,
+                minify=minify,
+                strip_docs=strip_docs,
+                shards=shards,
+                function_per_database=function_per_database,
+            )
+        self.instrumentation.log_summary(name)
+
+        outputs = {f"{name}_domain": self.domain}
+        for shard, (_, rest_api) in self.shards.items():
+            outputs[f"{name}_{shard}_domain"] = rest_api.domain
+        self.register_outputs(outputs)
+
+    def _synthesize(
+        self,
+        name,
+        *,
+        api_spec: Union[str, list[str]],
+        batch_path: Optional[str],
+        secrets: Optional[str],
+        path_prefix: Optional[str],
+        environment: Optional[dict[str, Union[str, pulumi.Output[str]]]],
+        integrations: Optional[list[dict]],
+        token_validators: Optional[list[dict]],
+        timeout_seconds: Optional[int],
+        policy_statements: Optional[list],
+        vpc_config: Optional[dict],
+        hosted_zone_id: Optional[str],
+        subdomain: Optional[str],
+        export_api: Optional[str],
+        model_format: Optional[str],
+        shared_parameters: Optional[bool],
+        minify: Optional[bool],
+        strip_docs: Optional[bool],
+        shards: Optional[ShardBy],
+        function_per_database: Optional[Union[bool, dict[str, dict]]],
+    ):
+        """Build the Lambda and REST API, a pair per shard when sharded."""
+        instrumentation = self.instrumentation
+
+        with instrumentation.phase("load_spec"):
+            api_spec_dict = load_api_spec(api_spec)
         config_defaults = api_spec_dict.get("x-af-configuration", {})
 
         secrets = secrets or config_defaults.get("secrets", "")
@@ -152,31 +409,45 @@ class APIFoundry(ComponentResource):
             "policy_statements", []
         )
         vpc_config = vpc_config or config_defaults.get("vpc_config", {})
+        model_format = model_format or config_defaults.get("model_format", "yaml")
+        if model_format not in MODEL_FORMATS:
+            raise ValueError(
+                f"Invalid model_format '{model_format}'; "
+                f"expected one of: {', '.join(MODEL_FORMATS)}"
+            )
+        if shared_parameters is None:
+            shared_parameters = config_defaults.get("shared_parameters", False)
+        if minify is None:
+            minify = config_defaults.get("minify", False)
+        if strip_docs is None:
+            strip_docs = config_defaults.get("strip_docs", False)
+        shards = shards or config_defaults.get("shards")
+        if function_per_database is None:
+            function_per_database = config_defaults.get("function_per_database")
 
         env_vars["SECRETS"] = secrets
         requirements = []
+        secrets_map = secrets_statement = None
 
         # Grant read access to referenced secrets
         if secrets:
             try:
-                secret_arns = list(json.loads(secrets).values())
-                policy_statements.append(
-                    {
-                        "Effect": "Allow",
-                        "Actions": ["secretsmanager:GetSecretValue"],
-                        "Resources": secret_arns,
-                    }
-                )
-            except (json.JSONDecodeError, AttributeError):
+                secrets_map = json.loads(secrets)
+                secrets_statement = {
+                    "Effect": "Allow",
+                    "Actions": ["secretsmanager:GetSecretValue"],
+                    "Resources": list(secrets_map.values()),
+                }
+            except (json.JSONDecodeError, AttributeError, TypeError):
                 # If secrets is an Output or invalid JSON, we can't parse it yet
                 # Add a broad policy (will be restricted during deployment)
-                policy_statements.append(
-                    {
-                        "Effect": "Allow",
-                        "Actions": ["secretsmanager:GetSecretValue"],
-                        "Resources": "*",
-                    }
-                )
+                secrets_map = None
+                secrets_statement = {
+                    "Effect": "Allow",
+                    "Actions": ["secretsmanager:GetSecretValue"],
+                    "Resources": "*",
+                }
+            policy_statements.append(secrets_statement)
 
             requirements.extend(
                 [
@@ -212,48 +483,395 @@ class APIFoundry(ComponentResource):
         if env_vars.get("JWKS_HOST"):
             requirements.extend(["PyJWT", "cryptography", "requests"])
 
-        self.api_function = cloud_foundry.python_function(
-            name=name,
-            environment=env_vars,
-            runtime="python3.12",
-            handler="api_foundry_query_engine.lambda_handler.handler",
-            sources={
-                "api_spec.yaml": yaml.safe_dump(
-                    ModelFactory(api_spec_dict).get_config_output()
-                ),
-            },
+        build = dict(
+            env_vars=env_vars,
             requirements=requirements,
-            timeout=timeout_seconds or 30,
             policy_statements=policy_statements,
+            timeout_seconds=timeout_seconds,
             vpc_config=vpc_config,
-        )
-
-        gateway_spec = APISpecEditor(
-            open_api_spec=api_spec_dict,
-            function=self.api_function,
+            model_format=model_format,
             batch_path=batch_path,
             token_validators=token_validators,
+            shared_parameters=shared_parameters,
+            minify=minify,
+            strip_docs=strip_docs,
+            path_prefix=path_prefix,
+            function_per_database=function_per_database,
+            secrets_map=secrets_map,
+            secrets_statement=secrets_statement,
+        )
+        if not shards:
+            self.api_function, self.rest_api = self._build_api(
+                name,
+                api_spec_dict,
+                integrations=integrations,
+                export_api=export_api,
+                hosted_zone_id=hosted_zone_id,
+                subdomain=subdomain,
+                **build,
+            )
+            self.domain = self.rest_api.domain
+            return
+
+        spec_shards = partition_spec(api_spec_dict, shards)
+        instrumentation.count("shards", len(spec_shards))
+        log.info("sharding %s into: %s", name, ", ".join(spec_shards))
+        shard_integrations = self._assign_integrations(integrations, spec_shards)
+        self.api_function = self.rest_api = None
+        self.shards = {}
+        for shard in spec_shards.values():
+            self.shards[shard.name] = self._build_api(
+                f"{name}-{shard.name}",
+                shard.spec,
+                crud_schemas=shard.schema_names,
+                integrations=shard_integrations[shard.name],
+                export_api=shard_export_name(export_api, shard.name),
+                hosted_zone_id=None,
+                subdomain=None,
+                **build,
+            )
+        self.domain = (
+            self._shared_domain(name, hosted_zone_id, subdomain)
+            if hosted_zone_id
+            else None
+        )
+
+    def _build_api(
+        self,
+        name: str,
+        api_spec_dict: dict,
+        *,
+        env_vars: dict[str, Union[str, pulumi.Output[str]]],
+        requirements: list[str],
+        policy_statements: list,
+        timeout_seconds: Optional[int],
+        vpc_config: dict,
+        model_format: str,
+        batch_path: Optional[str],
+        token_validators: list[dict],
+        shared_parameters: bool,
+        minify: bool,
+        strip_docs: bool,
+        path_prefix: Optional[str],
+        function_per_database: Optional[Union[bool, dict[str, dict]]],
+        secrets_map: Optional[dict[str, str]],
+        secrets_statement: Optional[dict],
+        integrations: list[dict],
+        export_api: Optional[str],
+        hosted_zone_id: Optional[str],
+        subdomain: Optional[str],
+        crud_schemas: Optional[list[str]] = None,
+    ):
+        """
+        Build the REST API for a spec and the Lambda behind it, or one
+        Lambda per database with `function_per_database`.
+        """
+        instrumentation = self.instrumentation
+        function_settings = dict(
+            env_vars=env_vars,
+            requirements=requirements,
+            policy_statements=policy_statements,
+            timeout_seconds=timeout_seconds,
+            vpc_config=vpc_config,
+            model_format=model_format,
+        )
+        database_functions = {}
+        # Batch requests may span databases, so they need the full model,
+        # as do schema objects and path operations without an x-af-database
+        full_function = not function_per_database or bool(batch_path)
+        if function_per_database:
+            built = len(self.functions)
+            for shard in partition_spec(api_spec_dict, "database").values():
+                # schemas only referenced from another shard's are not served
+                if not shard.paths and not any(
+                    crud_schemas is None or schema_name in crud_schemas
+                    for schema_name in shard.schema_names
+                ):
+                    continue
+                if shard.attribute_values("x-af-database"):
+                    database_functions.update(
+                        self._database_function(
+                            name,
+                            shard,
+                            function_per_database,
+                            secrets_map=secrets_map,
+                            secrets_statement=secrets_statement,
+                            **function_settings,
+                        )
+                    )
+                elif shard.schema_names or shard.paths:
+                    full_function = True
+            instrumentation.count("database_functions", len(self.functions) - built)
+        api_function = (
+            self._build_function(name, api_spec_dict, **function_settings)
+            if full_function
+            else None
         )
 
+        with instrumentation.phase("gateway_spec"):
+            gateway_spec = APISpecEditor(
+                open_api_spec=api_spec_dict,
+                function=api_function,
+                batch_path=batch_path,
+                token_validators=token_validators,
+                shared_parameters=shared_parameters,
+                minify=minify,
+                strip_docs=strip_docs,
+                crud_schemas=crud_schemas,
+                database_functions=database_functions,
+            )
+            specification = gateway_spec.rest_api_spec()
+        instrumentation.count("operations_generated", len(gateway_spec.integrations))
+        instrumentation.count("gateway_spec_bytes", len(specification))
+        if gateway_spec.minify and log.isEnabledFor(logging.DEBUG):
+            # measuring the savings serializes the spec a second time
+            report = gateway_spec.minify_report()
+            log.debug(
+                "minified gateway spec of %s from %d to %d bytes",
+                name,
+                report["bytes"],
+                report["minified_bytes"],
+            )
+
         # Merge gateway_spec.integrations with user-provided integrations
-        specification = gateway_spec.rest_api_spec()
         merged_integrations = (integrations or []) + (gateway_spec.integrations or [])
 
-        self.rest_api = cloud_foundry.rest_api(
-            name,
-            specification=[specification],
-            integrations=merged_integrations,
-            token_validators=token_validators or [],
-            export_api=export_api,
-            path_prefix=path_prefix,
+        with instrumentation.phase("rest_api"):
+            rest_api = cloud_foundry.rest_api(
+                name,
+                specification=[specification],
+                integrations=merged_integrations,
+                token_validators=token_validators or [],
+                export_api=export_api,
+                path_prefix=path_prefix,
+                hosted_zone_id=hosted_zone_id,
+                subdomain=subdomain,
+                opts=pulumi.ResourceOptions(parent=self),
+            )
+        return api_function, rest_api
+
+    def _build_function(
+        self,
+        name: str,
+        api_spec_dict: dict,
+        *,
+        env_vars: dict[str, Union[str, pulumi.Output[str]]],
+        requirements: list[str],
+        policy_statements: list,
+        timeout_seconds: Optional[int],
+        vpc_config: dict,
+        model_format: str,
+        memory_size: Optional[int] = None,
+    ):
+        """
+        Compile the model of a spec and build the Lambda serving it.
+
+        A YAML model compiled without the model cache is streamed from a
+        lazy ModelFactory to api_spec.yaml, so the config is never held in
+        memory as a whole; otherwise the config dict is compiled first.
+        """
+        instrumentation = self.instrumentation
+        env_vars = dict(env_vars)
+        model_path = os.path.abspath(os.path.join("temp", name, "api_spec.yaml"))
+        sources = {"api_spec.yaml": f"file://{model_path}"}
+
+        if model_format == "yaml" and not model_cache_enabled():
+            with instrumentation.phase("compile_model"):
+                factory = ModelFactory(api_spec_dict, lazy=True)
+            with instrumentation.phase("serialize_model"):
+                counts = config_writer.stream_model_config_file(factory, model_path)
+            instrumentation.count("refs_resolved", factory.refs_resolved)
+            instrumentation.count(
+                "entries_rebuilt", counts["schema_objects"] + counts["path_operations"]
+            )
+            instrumentation.count("entries_reused", 0)
+        else:
+            with instrumentation.phase("compile_model"):
+                model_config = compile_model(api_spec_dict, instrumentation)
+            schema_objects = model_config["schema_objects"]
+            counts = {
+                "schema_objects": len(schema_objects),
+                "path_operations": len(model_config["path_operations"]),
+                "properties": sum(
+                    len(s.get("properties", {})) for s in schema_objects.values()
+                ),
+            }
+            with instrumentation.phase("serialize_model"):
+                config_writer.write_config_file(model_config, model_path)
+                if model_format == "binary":
+                    sources.update(self._model_artifact_sources(name, model_config))
+                    artifact_path = f"/var/task/{model_artifact.MODEL_ARTIFACT_FILE}"
+                    env_vars[model_artifact.MODEL_ARTIFACT_ENV] = artifact_path
+
+        instrumentation.count("schemas", counts["schema_objects"])
+        instrumentation.count("properties", counts["properties"])
+        instrumentation.count("path_operations", counts["path_operations"])
+        instrumentation.count("model_bytes", os.path.getsize(model_path))
+
+        with instrumentation.phase("lambda_function"):
+            api_function = cloud_foundry.python_function(
+                name=name,
+                environment=env_vars,
+                runtime="python3.12",
+                handler="api_foundry_query_engine.lambda_handler.handler",
+                sources=sources,
+                requirements=requirements,
+                timeout=timeout_seconds or 30,
+                memory_size=memory_size,
+                policy_statements=policy_statements,
+                vpc_config=vpc_config,
+            )
+        self.functions[name] = api_function
+        return api_function
+
+    def _database_function(
+        self,
+        name: str,
+        shard: SpecShard,
+        function_per_database: Union[bool, dict[str, dict]],
+        *,
+        secrets_map: Optional[dict[str, str]],
+        secrets_statement: Optional[dict],
+        env_vars: dict[str, Union[str, pulumi.Output[str]]],
+        requirements: list[str],
+        policy_statements: list,
+        timeout_seconds: Optional[int],
+        **function_settings,
+    ) -> dict[str, Any]:
+        """
+        The Lambda of one database shard, mapped from each of its databases.
+
+        It gets the model of the shard's own schema objects and path
+        operations (plus the schemas they reference), only its own secret,
+        and only the driver its x-af-engine needs. A mapping for
+        `function_per_database` sets memory_size and timeout per database.
+        """
+        databases = shard.attribute_values("x-af-database")
+        env = dict(env_vars)
+        # The policy granting every secret is replaced by one for this shard
+        statements = [s for s in policy_statements if s is not secrets_statement]
+        if secrets_map is not None:
+            own = database_secrets(secrets_map, databases)
+            env["SECRETS"] = json.dumps(own)
+            if own:
+                statements.append(
+                    {**secrets_statement, "Resources": list(own.values())}
+                )
+        elif secrets_statement is not None:
+            statements.append(secrets_statement)
+
+        if env.get("SECRETS"):
+            engines = shard.attribute_values("x-af-engine") or [DEFAULT_ENGINE]
+            requirements = driver_requirements(engines, env) + [
+                r for r in requirements if r not in DRIVER_PACKAGES
+            ]
+
+        sizing = (
+            function_per_database if isinstance(function_per_database, dict) else {}
+        )
+        settings = {}
+        for database in databases:
+            settings.update(sizing.get(database) or {})
+        function = self._build_function(
+            f"{name}-{shard.name}",
+            shard.spec,
+            env_vars=env,
+            requirements=requirements,
+            policy_statements=statements,
+            timeout_seconds=settings.get("timeout", timeout_seconds),
+            memory_size=settings.get("memory_size"),
+            **function_settings,
+        )
+        return {database: function for database in databases}
+
+    @staticmethod
+    def _assign_integrations(
+        integrations: list[dict], spec_shards: dict[str, SpecShard]
+    ) -> dict[str, list[dict]]:
+        """
+        User integrations by shard: each goes to the shard serving its
+        path and method, else to one serving its path, else to the first.
+        """
+        assigned: dict[str, list[dict]] = {shard: [] for shard in spec_shards}
+        first = next(iter(spec_shards))
+        for integration in integrations or []:
+            path = integration.get("path")
+            method = str(integration.get("method", "")).lower()
+            serving = [
+                shard.name for shard in spec_shards.values() if path in shard.paths
+            ]
+            shard = next(
+                (name for name in serving if method in spec_shards[name].paths[path]),
+                serving[0] if serving else first,
+            )
+            assigned[shard].append(integration)
+        return assigned
+
+    def _shared_domain(
+        self, name: str, hosted_zone_id: str, subdomain: Optional[str]
+    ) -> pulumi.Output[str]:
+        """
+        One custom domain for all shard APIs, each mapped at its shard
+        name: https://<domain>/<shard>/<path>.
+        """
+        certificate = CustomCertificate(
+            name=name,
             hosted_zone_id=hosted_zone_id,
-            subdomain=subdomain,
+            subdomain=subdomain or resource_id(name),
             opts=pulumi.ResourceOptions(parent=self),
         )
-
-        self.domain = self.rest_api.domain
-
-        self.register_outputs({f"{name}_domain": self.domain})
+        custom_domain = aws.apigateway.DomainName(
+            f"{name}-custom-domain",
+            domain_name=certificate.domain_name,
+            regional_certificate_arn=certificate.certificate.arn,
+            endpoint_configuration={"types": "REGIONAL"},
+            opts=pulumi.ResourceOptions(
+                parent=self, depends_on=[certificate.validation]
+            ),
+        )
+        for shard, (_, rest_api) in self.shards.items():
+            aws.apigateway.BasePathMapping(
+                f"{name}-{shard}-base-path-map",
+                rest_api=rest_api.rest_api_id,
+                stage_name=rest_api.stage_name,
+                domain_name=custom_domain.domain_name,
+                base_path=shard,
+                opts=pulumi.ResourceOptions(parent=self, depends_on=[custom_domain]),
+            )
+        aws.route53.Record(
+            f"{name}-dns-record",
+            name=custom_domain.domain_name,
+            type="A",
+            zone_id=hosted_zone_id,
+            aliases=[
+                {
+                    "name": custom_domain.regional_domain_name,
+                    "zone_id": custom_domain.regional_zone_id,
+                    "evaluate_target_health": False,
+                }
+            ],
+            opts=pulumi.ResourceOptions(parent=self, depends_on=[custom_domain]),
+        )
+        return custom_domain.domain_name
+
+    @staticmethod
+    def _model_artifact_sources(name: str, model_config: dict) -> dict[str, str]:
+        """
+        Write the binary model artifact and return the Lambda sources that
+        ship it along with its loader. api_spec.yaml is kept alongside so
+        runtimes without artifact support still find a model.
+        """
+        artifact_path = model_artifact.write_model_artifact(
+            model_config,
+            os.path.abspath(
+                os.path.join("temp", name, model_artifact.MODEL_ARTIFACT_FILE)
+            ),
+        )
+        return {
+            model_artifact.MODEL_ARTIFACT_FILE: f"file://{artifact_path}",
+            "api_foundry/utils/model_artifact.py": f"file://{model_artifact.__file__}",
+            "api_foundry/utils/app_exception.py": f"file://{app_exception.__file__}",
+        }
 
     def integrations(self) -> list[dict]:
         return self.api_spec_editor.integrations
@@ -0,0 +1,143 @@
+# config_writer.py
+
+"""
+Streaming YAML writer for the compiled model config.
+
+The config is written one entry at a time: each schema object, path
+operation, relation graph node or SQL template is dumped on its own and
+indented under its section key. No YAML string of the whole model is
+built, and with stream_model_config no dict of the whole model either.
+The output loads to the same config as yaml_io.safe_dump of the dict,
+except that objects shared between entries are repeated, not aliased.
+"""
+
+import os
+import tempfile
+import textwrap
+from typing import IO, Any, Callable, Dict, Iterable, Mapping, Tuple
+
+from api_foundry.utils import yaml_io
+from api_foundry.utils.model_factory import ModelFactory, build_relation_graph
+from api_foundry.utils.sql_templates import schema_sql_templates
+
+
+def _write_entry(sink: IO[str], name: str, value: Any) -> None:
+    """Write `name: value` as an entry of the current section."""
+    # anchors restart with each dump, so entries must not use them
+    text = yaml_io.safe_dump({name: value}, aliases=False)
+    sink.write(textwrap.indent(text, "  "))
+
+
+def write_section(
+    sink: IO[str], section: str, entries: Iterable[Tuple[str, Any]]
+) -> int:
+    """Write a top-level mapping from (name, value) pairs; returns the count."""
+    sink.write(f"{section}:")
+    count = 0
+    for name, value in entries:
+        if count == 0:
+            sink.write("\n")
+        _write_entry(sink, name, value)
+        count += 1
+    if count == 0:
+        sink.write(" {}\n")
+    return count
+
+
+def write_config(config: Mapping[str, Any], sink: IO[str]) -> None:
+    """
+    Write a config dict section by section, in the sorted key order
+    yaml_io.safe_dump uses. Entries of each section are sorted likewise.
+    """
+    for section in sorted(config):
+        value = config[section]
+        if isinstance(value, Mapping):
+            write_section(sink, section, sorted(value.items()))
+        else:
+            sink.write(yaml_io.safe_dump({section: value}))
+
+
+def _graph_summary(schema_object: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a schema object config build_relation_graph reads."""
+    return {
+        "table_name": schema_object.get("table_name"),
+        "primary_key": schema_object.get("primary_key"),
+        "relations": schema_object.get("relations", {}),
+        "properties": {
+            name: {"column_name": prop.get("column_name")}
+            for name, prop in schema_object.get("properties", {}).items()
+        },
+    }
+
+
+def stream_model_config(factory: ModelFactory, sink: IO[str]) -> Dict[str, int]:
+    """
+    Write the config output of `factory` without holding it in memory.
+
+    Each schema object is converted and written, and its SQL templates are
+    spooled to a temporary file, before the next one is built; only a small
+    summary per schema is kept for the relation graph. With a lazy factory
+    the model elements themselves are not kept either.
+
+    Returns the number of schema objects, path operations and schema
+    object properties written.
+    """
+    counts = {"schema_objects": 0, "path_operations": 0, "properties": 0}
+    counts["path_operations"] = write_section(
+        sink, "path_operations", factory.iter_config("path_operations")
+    )
+
+    summaries: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as templates:
+
+        def schema_objects():
+            for name, schema_object in factory.iter_config("schema_objects"):
+                summaries[name] = _graph_summary(schema_object)
+                counts["properties"] += len(summaries[name]["properties"])
+                _write_entry(templates, name, schema_sql_templates(schema_object))
+                yield name, schema_object
+
+        counts["schema_objects"] = write_section(
+            sink, "schema_objects", schema_objects()
+        )
+
+        templates.seek(0)
+        sink.write("sql_templates:")
+        sink.write("\n" if summaries else " {}\n")
+        while True:
+            chunk = templates.read(1 << 16)
+            if not chunk:
+                break
+            sink.write(chunk)
+
+    write_section(sink, "relation_graph", build_relation_graph(summaries).items())
+    return counts
+
+
+def _write_atomically(path: str, write: Callable[[IO[str]], Any]) -> Any:
+    """Run `write` on a temporary file that replaces `path` once it is done."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            result = write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return result
+
+
+def stream_model_config_file(factory: ModelFactory, path: str) -> Dict[str, int]:
+    """
+    Atomically stream the config output of `factory` to a YAML file;
+    returns the counts of stream_model_config.
+    """
+    return _write_atomically(path, lambda f: stream_model_config(factory, f))
+
+
+def write_config_file(config: Mapping[str, Any], path: str) -> str:
+    """Atomically write a config dict to a YAML file and return its path."""
+    _write_atomically(path, lambda f: write_config(config, f))
+    return path
@@ -0,0 +1,98 @@
+# copy_on_write.py
+
+"""
+Copy-on-write access to a spec tree that shares nodes with a source spec.
+
+A generator that only adds to a spec can build on top of the source
+instead of a deep copy of it: the new tree's containers reference the
+source's subtrees, and the few containers that are edited are copied
+first. CopyOnWriteSpec records which containers belong to the source and
+materializes private copies along the paths that are written to.
+"""
+
+from typing import Any, Callable, Dict, Iterable
+
+
+def _containers(node: Any) -> Iterable[Any]:
+    """Every dict and list in a tree, each once."""
+    seen = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if not isinstance(current, (dict, list)) or id(current) in seen:
+            continue
+        seen.add(id(current))
+        yield current
+        stack.extend(current.values() if isinstance(current, dict) else current)
+
+
+class CopyOnWriteSpec:
+    """
+    Guards the containers of `source` against writes made through a tree
+    that shares them.
+
+    Call `writable(root, keys)` before editing the node at `keys`: every
+    source container on the way is replaced in its parent by a shallow
+    copy, so the edit lands on a private node. `root` itself must be
+    private (for example a fresh dict merged from the source).
+    """
+
+    def __init__(self, source: Any):
+        self.source = source
+        self._source_ids = {id(node) for node in _containers(source)}
+
+    def is_shared(self, node: Any) -> bool:
+        """Whether `node` is a container of the source."""
+        return id(node) in self._source_ids
+
+    def writable(self, root: dict, keys: list[str]) -> Any:
+        """
+        Private copy of the node at `keys` under `root`, installed in its
+        parent. Stops at the deepest existing key and returns that node.
+        """
+        node = root
+        for key in keys:
+            if not isinstance(node, dict) or key not in node:
+                break
+            child = node[key]
+            if self.is_shared(child):
+                child = child.copy()
+                node[key] = child
+            node = child
+        return node
+
+    def rewrite_refs(self, root: dict, rewrite: Callable[[str], str]) -> None:
+        """
+        Apply `rewrite` to every $ref string under `root`.
+
+        Private containers are edited in place, as AWSOpenAPISpecEditor
+        does; source containers holding a changed $ref are copied, along
+        with their ancestors. A source container reachable along several
+        paths is copied once, so shared nodes stay shared.
+        """
+        copies: Dict[int, Any] = {}
+
+        def visit(node: Any) -> Any:
+            shared = self.is_shared(node)
+            if shared and id(node) in copies:
+                return copies[id(node)]
+            result = node
+            if shared:
+                copies[id(node)] = result
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, value in list(items):
+                if key == "$ref" and isinstance(value, str):
+                    new_value = rewrite(value)
+                elif isinstance(value, (dict, list)):
+                    new_value = visit(value)
+                else:
+                    continue
+                if new_value is value:
+                    continue
+                if result is node and shared:
+                    result = node.copy()
+                    copies[id(node)] = result
+                result[key] = new_value
+            return result
+
+        visit(root)
@@ -0,0 +1,103 @@
+# instrumentation.py
+
+"""
+Phase timings, counters and optional profiling for API synthesis.
+
+A BuildInstrumentation is passed to APIFoundry (or created by it). Each
+synthesis step runs inside `phase(name)`, which records its wall time and
+notifies the `on_phase` callback; steps add counters with `count()`.
+
+Setting API_FOUNDRY_PROFILE to a directory also runs the whole synthesis
+under cProfile and writes `<directory>/<name>.pstats`, which can be read
+with `python -m pstats`.
+"""
+
+import cProfile
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from cloud_foundry import logger
+
+log = logger(__name__)
+
+# Directory to write cProfile stats of each APIFoundry synthesis to
+PROFILE_DIR_ENV = "API_FOUNDRY_PROFILE"
+
+PhaseCallback = Callable[[str, float, Dict[str, int]], None]
+
+
+class BuildInstrumentation:
+    """
+    Collects per-phase wall time and named counters for one synthesis.
+
+    `on_phase(name, seconds, counters)` is called as each phase ends, with
+    a snapshot of the counters so far.
+    """
+
+    def __init__(self, on_phase: Optional[PhaseCallback] = None):
+        self.on_phase = on_phase
+        self.phases: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator["BuildInstrumentation"]:
+        """Time the enclosed block as phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            seconds = time.perf_counter() - start
+            # a repeated phase accumulates
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+            log.debug("phase %s took %.1f ms", name, seconds * 1000)
+            if self.on_phase is not None:
+                self.on_phase(name, seconds, dict(self.counters))
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add `value` to counter `name`."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self) -> Dict[str, Any]:
+        """Phase seconds, total seconds and counters recorded so far."""
+        return {
+            "phases": {name: round(s, 4) for name, s in self.phases.items()},
+            "total_seconds": round(sum(self.phases.values()), 4),
+            "counters": dict(self.counters),
+        }
+
+    def log_summary(self, name: str) -> None:
+        phases = ", ".join(f"{p} {s * 1000:.1f} ms" for p, s in self.phases.items())
+        counters = ", ".join(f"{c}={v}" for c, v in self.counters.items())
+        log.info("synthesis of %s: %s; %s", name, phases, counters)
+
+
+def profile_path(name: str) -> Optional[str]:
+    """Stats file for synthesis `name`, or None if profiling is off."""
+    directory = os.environ.get(PROFILE_DIR_ENV, "").strip()
+    if not directory:
+        return None
+    return os.path.join(directory, f"{name}.pstats")
+
+
+@contextmanager
+def profiled(name: str) -> Iterator[Optional[cProfile.Profile]]:
+    """
+    Run the enclosed block under cProfile when API_FOUNDRY_PROFILE is set,
+    writing the stats on exit. Yields the profiler, or None.
+    """
+    path = profile_path(name)
+    if path is None:
+        yield None
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        profiler.dump_stats(path)
+        log.info("wrote synthesis profile of %s to %s", name, path)
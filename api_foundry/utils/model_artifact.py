@@ -0,0 +1,119 @@
+# model_artifact.py
+
+"""
+Compact binary form of the compiled API model.
+
+The artifact is an 8 byte magic marker, a big-endian uint16 format version
+and a pickle of the plain config dict produced by
+ModelFactory.get_config_output(). Loading it is a single C-level unpickle,
+avoiding the YAML parse of api_spec.yaml at cold start.
+
+This module only depends on the standard library and app_exception so it
+can be shipped inside the Lambda package and imported by the runtime as
+`api_foundry.utils.model_artifact`.
+"""
+
+import datetime
+import io
+import os
+import pickle
+import struct
+import tempfile
+from typing import Any, Dict, Union
+
+from api_foundry.utils.app_exception import ApplicationException
+
+MAGIC = b"AFMODEL\x00"
+# Bump when the payload layout changes; loaders reject other versions
+MODEL_ARTIFACT_VERSION = 1
+
+MODEL_ARTIFACT_FILE = "api_model.bin"
+# Environment variable pointing the runtime at the artifact
+MODEL_ARTIFACT_ENV = "API_MODEL_ARTIFACT"
+
+_HEADER = struct.Struct(">8sH")
+
+
+# Globals a config may hold besides builtin containers and scalars:
+# yaml.safe_load turns timestamps such as a property default into these
+ALLOWED_GLOBALS = {
+    ("datetime", "date"): datetime.date,
+    ("datetime", "datetime"): datetime.datetime,
+    ("datetime", "time"): datetime.time,
+}
+
+
+class ConfigUnpickler(pickle.Unpickler):
+    """
+    Unpickler that only accepts builtin containers and scalars and the
+    datetime values of ALLOWED_GLOBALS. Also used for the on-disk spec
+    and model caches.
+    """
+
+    def find_class(self, module: str, name: str):
+        allowed = ALLOWED_GLOBALS.get((module, name))
+        if allowed is None:
+            raise pickle.UnpicklingError(
+                f"disallowed global {module}.{name} in pickled config"
+            )
+        return allowed
+
+
+def dump_model_artifact(config: Dict[str, Any]) -> bytes:
+    """Serialize a model config dict to artifact bytes."""
+    payload = pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(MAGIC, MODEL_ARTIFACT_VERSION) + payload
+
+
+def write_model_artifact(config: Dict[str, Any], path: str) -> str:
+    """
+    Atomically write the artifact for `config` to `path` and return it.
+
+    The artifact is loaded back before it is installed, so a config the
+    runtime could not load fails the build instead of the deployed function.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    data = dump_model_artifact(config)
+    load_model_artifact(data)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_model_artifact(source: Union[str, bytes, os.PathLike]) -> Dict[str, Any]:
+    """
+    Load a model config dict from artifact bytes or an artifact file path.
+
+    Raises ApplicationException if the data is not a model artifact or was
+    written with a different format version.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    else:
+        with open(source, "rb") as f:
+            data = f.read()
+
+    if len(data) < _HEADER.size:
+        raise ApplicationException(500, "Model artifact is truncated")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ApplicationException(500, "Data is not an API Foundry model artifact")
+    if version != MODEL_ARTIFACT_VERSION:
+        raise ApplicationException(
+            500,
+            f"Unsupported model artifact version {version}; "
+            f"expected {MODEL_ARTIFACT_VERSION}",
+        )
+
+    stream = io.BytesIO(data)
+    stream.seek(_HEADER.size)
+    try:
+        config = ConfigUnpickler(stream).load()
+    except (pickle.UnpicklingError, EOFError, ValueError) as e:
+        raise ApplicationException(500, f"Corrupt model artifact: {e}") from e
+    if not isinstance(config, dict):
+        raise ApplicationException(500, "Model artifact does not contain a config")
+    return config
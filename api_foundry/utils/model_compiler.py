@@ -0,0 +1,292 @@
+# model_compiler.py
+
+"""
+Incremental compilation of an OpenAPI spec into the model config.
+
+Each schema object and path operation is fingerprinted from its own
+definition plus the definitions its $refs point at. Entries whose
+fingerprint matches the previous run reuse the cached to_dict() output;
+only changed entries are built by ModelFactory.
+"""
+
+import hashlib
+import json
+import os
+import re
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+from cloud_foundry import logger
+
+from api_foundry.utils import model_factory, schema_validator
+from api_foundry.utils.instrumentation import BuildInstrumentation
+from api_foundry.utils.model_factory import (
+    ModelFactory,
+    PathOperation,
+    SchemaObject,
+    build_elements_parallel,
+    build_relation_graph,
+)
+from api_foundry.utils.spec_cache import SpecCache
+from api_foundry.utils.sql_templates import build_sql_templates
+
+log = logger(__name__)
+
+# The model cache is opt-in: set to 1/true/on, or set the cache directory;
+# 0/false/off always compiles the full model
+MODEL_CACHE_ENABLED_ENV = "API_FOUNDRY_MODEL_CACHE"
+MODEL_CACHE_DIR_ENV = "API_FOUNDRY_MODEL_CACHE_DIR"
+# Process pool size for building schema objects; unset builds serially
+MODEL_WORKERS_ENV = "API_FOUNDRY_MODEL_WORKERS"
+
+DEFAULT_MODEL_CACHE_DIR = os.path.join("temp", "model_cache")
+
+# Bump when the cached entry layout changes so stale entries are ignored
+MODEL_CACHE_VERSION = "1"
+
+INDEX_KEY = f"model-index-v{MODEL_CACHE_VERSION}"
+
+REF_PATTERN = re.compile(r'"\$ref":"((?:[^"\\]|\\.)*)"')
+
+
+def _compiler_digest() -> str:
+    """Digest of the model classes, so code changes invalidate the cache."""
+    digest = hashlib.sha256(MODEL_CACHE_VERSION.encode("utf-8"))
+    for module in (model_factory, schema_validator):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _definition_digest(node: Any) -> tuple[str, list[str]]:
+    """Digest of a definition and the $refs it contains, in order."""
+    content = json.dumps(node, default=str, separators=(",", ":"))
+    refs = [json.loads(f'"{ref}"') for ref in REF_PATTERN.findall(content)]
+    return hashlib.sha256(content.encode("utf-8")).hexdigest(), refs
+
+
+def _lookup(ref: str, spec: dict) -> Any:
+    """Target of a local $ref, or None if it does not exist."""
+    node: Any = spec
+    for part in ref.lstrip("#/").split("/"):
+        if not isinstance(node, dict):
+            return None
+        node = node.get(part)
+    return node
+
+
+def _has_top_level_refs(spec: dict) -> bool:
+    """Whether any schema, path item or operation is itself a $ref."""
+    schemas = spec.get("components", {}).get("schemas", {})
+    if any(isinstance(s, dict) and "$ref" in s for s in schemas.values()):
+        return True
+    for methods in (spec.get("paths") or {}).values():
+        if not isinstance(methods, dict) or "$ref" in methods:
+            return True
+        if any(isinstance(op, dict) and "$ref" in op for op in methods.values()):
+            return True
+    return False
+
+
+def _database_operations(spec: dict) -> Dict[str, tuple[str, str]]:
+    """
+    (path, method) of each path operation backed by a database, keyed as
+    in ModelFactory.path_operations.
+    """
+    operations = {}
+    for path, methods in (spec.get("paths") or {}).items():
+        for method, operation in methods.items():
+            if "x-af-database" in operation:
+                operations[PathOperation.operation_key(path, method)] = (path, method)
+    return operations
+
+
+class IncrementalModelCompiler:
+    """
+    Compile specs into model config, reusing cached entries whose
+    fingerprint is unchanged.
+
+    A fingerprint covers the entry's own definition and the definitions its
+    $refs point at (following alias chains), which is everything
+    ModelFactory sees of the entry after resolve_all_refs. The cache holds
+    one index per directory with the entries of the last compile.
+
+    After compile(), `rebuilt` and `reused` list the entries (as
+    "schema_objects/<name>" or "path_operations/<name>") that were built or
+    served from the cache, and `refs_resolved` counts the $refs resolved
+    while building the rebuilt ones. With `workers`, rebuilt schema objects
+    are built in a process pool as in ModelFactory.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, workers: Optional[int] = None):
+        self.workers = workers
+        self.cache = SpecCache(
+            directory=cache_dir
+            or os.environ.get(MODEL_CACHE_DIR_ENV)
+            or DEFAULT_MODEL_CACHE_DIR
+        )
+        self.compiler_digest = _compiler_digest()
+        self.rebuilt: list[str] = []
+        self.reused: list[str] = []
+        self.refs_resolved = 0
+
+    def compile(self, spec: dict) -> Dict[str, Any]:
+        """Return the config output for `spec`, as ModelFactory would."""
+        self.rebuilt = []
+        self.reused = []
+        self.refs_resolved = 0
+        previous = self.cache.get(INDEX_KEY) or {}
+        index: Dict[str, dict] = {}
+        digests: Dict[str, str] = {}
+        resolver = ModelFactory({})
+
+        if _has_top_level_refs(spec):
+            # Entries that are themselves $refs only show their x-af-database
+            # after resolution, so fingerprint the resolved spec instead.
+            spec = resolver.resolve_all_refs(spec)
+        schemas = spec.get("components", {}).get("schemas", {})
+        operation_paths = _database_operations(spec)
+
+        def target_digest(ref: str, chain: tuple = ()) -> str:
+            if ref in digests:
+                return digests[ref]
+            if ref in chain:
+                return "circular"
+            target = _lookup(ref, spec)
+            digest, _ = _definition_digest(target)
+            if isinstance(target, dict) and list(target) == ["$ref"]:
+                digest += target_digest(target["$ref"], chain + (ref,))
+            digests[ref] = digest
+            return digest
+
+        def builder(section: str, name: str, definition: Any) -> Callable:
+            # Resolve only this entry; the rest of the spec is not needed
+            resolved = resolver.resolve_refs(definition, spec)
+            if section == "schema_objects":
+                return partial(SchemaObject, name, resolved)
+            path, method = operation_paths[name]
+            return partial(PathOperation, path, method, resolved)
+
+        def entry_key(section: str, name: str, definition: Any) -> str:
+            own, refs = _definition_digest(definition)
+            return hashlib.sha256(
+                "\0".join(
+                    [self.compiler_digest, section, name, own]
+                    + [target_digest(ref) for ref in refs]
+                ).encode("utf-8")
+            ).hexdigest()
+
+        def compile_section(section: str, definitions: Dict[str, Any]) -> dict:
+            keys = {
+                name: entry_key(section, name, definition)
+                for name, definition in definitions.items()
+            }
+            builders = {
+                name: builder(section, name, definitions[name])
+                for name, key in keys.items()
+                if key not in previous
+            }
+            if (
+                section == "schema_objects"
+                and self.workers
+                and self.workers > 1
+                and len(builders) >= model_factory.PARALLEL_MIN_SCHEMAS
+            ):
+                built = build_elements_parallel(builders, self.workers)
+            else:
+                built = {name: build() for name, build in builders.items()}
+
+            output = {}
+            for name, key in keys.items():
+                if name in built:
+                    data = built[name].to_dict()
+                    self.rebuilt.append(f"{section}/{name}")
+                    log.debug("rebuilt %s/%s", section, name)
+                else:
+                    data = previous[key]
+                    self.reused.append(f"{section}/{name}")
+                index[key] = data
+                output[name] = data
+            return output
+
+        schema_objects = compile_section(
+            "schema_objects",
+            {
+                name: schema
+                for name, schema in schemas.items()
+                if "x-af-database" in schema
+            },
+        )
+        path_operations = compile_section(
+            "path_operations",
+            {
+                name: spec["paths"][path][method]
+                for name, (path, method) in operation_paths.items()
+            },
+        )
+
+        log.info(
+            "model compile: %d entries rebuilt, %d reused",
+            len(self.rebuilt),
+            len(self.reused),
+        )
+        self.refs_resolved = resolver.refs_resolved
+        if self.rebuilt or len(index) != len(previous):
+            self.cache.put(INDEX_KEY, index)
+        return {
+            "schema_objects": schema_objects,
+            "path_operations": path_operations,
+            "relation_graph": build_relation_graph(schema_objects),
+            "sql_templates": build_sql_templates(schema_objects),
+        }
+
+    def report(self) -> Dict[str, list[str]]:
+        """Entries rebuilt and reused by the last compile()."""
+        return {"rebuilt": list(self.rebuilt), "reused": list(self.reused)}
+
+
+def model_cache_enabled() -> bool:
+    value = os.environ.get(MODEL_CACHE_ENABLED_ENV, "").strip().lower()
+    if value:
+        return value not in ("0", "false", "off", "no")
+    return bool(os.environ.get(MODEL_CACHE_DIR_ENV, "").strip())
+
+
+def model_workers() -> Optional[int]:
+    """Process pool size from API_FOUNDRY_MODEL_WORKERS (0 = one per CPU)."""
+    value = os.environ.get(MODEL_WORKERS_ENV, "").strip()
+    if not value:
+        return None
+    workers = int(value)
+    return workers or os.cpu_count() or 1
+
+
+def compile_model(
+    spec: dict, instrumentation: Optional[BuildInstrumentation] = None
+) -> Dict[str, Any]:
+    """
+    Compile `spec` into the model config, incrementally when
+    API_FOUNDRY_MODEL_CACHE or API_FOUNDRY_MODEL_CACHE_DIR enables the
+    cache. Schema objects are built
+    in a process pool when API_FOUNDRY_MODEL_WORKERS is set.
+
+    When given, `instrumentation` receives the refs_resolved,
+    entries_rebuilt and entries_reused counters.
+    """
+    if not model_cache_enabled():
+        factory = ModelFactory(spec, workers=model_workers())
+        config = factory.get_config_output()
+        refs_resolved = factory.refs_resolved
+        rebuilt = len(config["schema_objects"]) + len(config["path_operations"])
+        reused = 0
+    else:
+        compiler = IncrementalModelCompiler(workers=model_workers())
+        config = compiler.compile(spec)
+        refs_resolved = compiler.refs_resolved
+        rebuilt, reused = len(compiler.rebuilt), len(compiler.reused)
+
+    if instrumentation is not None:
+        instrumentation.count("refs_resolved", refs_resolved)
+        instrumentation.count("entries_rebuilt", rebuilt)
+        instrumentation.count("entries_reused", reused)
+    return config
@@ -1,10 +1,21 @@
+import os
 import re
-from typing import Any, Dict, Optional
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 
 from cloud_foundry import logger
 
 from api_foundry.utils.app_exception import ApplicationException
-from api_foundry.utils.schema_validator import validate_permissions
+from api_foundry.utils.schema_validator import (
+    compiled_pattern,
+    is_legacy_permissions,
+    validate_permissions,
+    validate_tags,
+)
+from api_foundry.utils.sql_templates import build_sql_templates
 
 log = logger(__name__)
 
@@ -18,6 +29,16 @@ METHODS_TO_ACTIONS = {
     "delete": "delete",
 }
 
+# Response status codes whose schemas define path operation outputs
+SUCCESS_STATUS_PATTERN = re.compile(r"2\d{2}|2xx")
+
+# Below this many schema objects a parallel factory builds serially, as
+# starting the process pool costs more than it saves
+PARALLEL_MIN_SCHEMAS = 200
+
+# Chunks per worker, so uneven schemas still spread across the pool
+PARALLEL_CHUNKS_PER_WORKER = 4
+
 SUPPORTED_TYPES = {
     "string",
     "integer",
@@ -36,22 +57,194 @@ SUPPORTED_TYPES = {
 }
 
 
+def _rule_pattern(rule: Any) -> Optional[str]:
+    """Field-mask regex of a read/write permission rule."""
+    if isinstance(rule, str):
+        return rule
+    if isinstance(rule, dict):
+        return rule.get("properties") or rule.get("fields")
+    return None
+
+
+# Legacy role-first action names the runtime folds into "write"
+LEGACY_ACTIONS = {"create": "write", "update": "write"}
+
+
+def _legacy_rules(permissions: Dict[str, Any]) -> Iterator[tuple[str, str, Any]]:
+    """
+    (role, action, rule) of legacy role-first permissions, with create and
+    update normalized to write as the runtime does; a later rule for the
+    same role and action wins. Role-level 'where' keys are not rules.
+    """
+    rules: Dict[tuple[str, str], Any] = {}
+    for role, actions in permissions.items():
+        if not isinstance(actions, dict):
+            continue
+        for action, rule in actions.items():
+            if action != "where":
+                rules[(role, LEGACY_ACTIONS.get(action, action))] = rule
+    for (role, action), rule in rules.items():
+        yield role, action, rule
+
+
+def compile_permission_masks(
+    permissions: Dict[str, Any], candidates: Dict[str, list[str]]
+) -> Dict[str, Any]:
+    """
+    Resolve the field-mask regexes of normalized permissions against a
+    fixed set of property names.
+
+    `candidates` maps an action ("read"/"write") to the property names the
+    runtime filters for it. Returns provider -> action -> role -> list of
+    allowed property names, using the same re.match semantics as the
+    runtime. Legacy role-first rules are reported under "default", with
+    create and update folded into write.
+    """
+    if not permissions:
+        return {}
+
+    providers: Dict[str, Any] = permissions
+    if is_legacy_permissions(permissions):
+        providers = {"default": {}}
+        for role, action, rule in _legacy_rules(permissions):
+            providers["default"].setdefault(action, {})[role] = rule
+
+    compiled: Dict[str, Any] = {}
+    for provider, actions in providers.items():
+        if not isinstance(actions, dict):
+            continue
+        for action, roles in actions.items():
+            names = candidates.get(action)
+            if names is None or not isinstance(roles, dict):
+                continue
+            for role, rule in roles.items():
+                pattern = _rule_pattern(rule)
+                if not pattern:
+                    continue
+                regex = compiled_pattern(pattern)
+                compiled.setdefault(provider, {}).setdefault(action, {})[role] = [
+                    name for name in names if regex.match(name)
+                ]
+    return compiled
+
+
+# Any ${...} reference in a where clause, and the claim form the runtime binds
+TEMPLATE_REFERENCE_PATTERN = re.compile(r"'?\$\{([^}]*)\}'?")
+CLAIM_REFERENCE_PATTERN = re.compile(r"claims\.([A-Za-z0-9_]+)")
+
+
+def compile_where_clause(where: str, owner: str, role: str) -> Dict[str, Any]:
+    """
+    Compile a row-level where expression into a pyformat SQL fragment.
+
+    Each `${claims.<name>}` becomes `%(claim_<name>)s`; quotes around a
+    reference are dropped since the bound value is typed by the driver,
+    and literal `%` signs are escaped. Returns the fragment and the
+    ordered, de-duplicated claim names to bind. Malformed references
+    raise an ApplicationException naming the owner and role.
+    """
+    claims: list[str] = []
+    parts: list[str] = []
+    position = 0
+    for match in TEMPLATE_REFERENCE_PATTERN.finditer(where):
+        claim = CLAIM_REFERENCE_PATTERN.fullmatch(match.group(1).strip())
+        if claim is None:
+            raise ApplicationException(
+                500,
+                (
+                    f"Invalid claim reference '${{{match.group(1)}}}' in where "
+                    f"clause for role '{role}' in {owner}. Use "
+                    f"'${{claims.<name>}}' with a letter, digit or underscore "
+                    f"claim name."
+                ),
+            )
+        name = claim.group(1)
+        if name not in claims:
+            claims.append(name)
+        start = match.start()
+        parts.append(where[position:start].replace("%", "%%"))
+        # keep a quote that only one side of the match consumed
+        text = match.group(0)
+        leading = "'" if text.startswith("'") and not text.endswith("'") else ""
+        trailing = "'" if text.endswith("'") and not text.startswith("'") else ""
+        parts.append(f"{leading}%(claim_{name})s{trailing}")
+        position = match.end()
+    remainder = where[position:]
+    if "${" in remainder:
+        raise ApplicationException(
+            500,
+            f"Unterminated claim reference in where clause for role '{role}' "
+            f"in {owner}.",
+        )
+    parts.append(remainder.replace("%", "%%"))
+    return {"sql": "".join(parts).strip(), "claims": claims}
+
+
+def compile_permission_where(permissions: Dict[str, Any], owner: str) -> Dict[str, Any]:
+    """
+    Compile the row-level where clauses of normalized permissions.
+
+    Returns provider -> action -> role -> compiled fragment (see
+    compile_where_clause). For legacy role-first rules, a role-level
+    'where' applies to each of the role's actions that lacks its own, as
+    in the runtime, and results are reported under "default" with create
+    and update folded into write.
+    """
+    if not permissions:
+        return {}
+
+    entries = []  # (provider, action, role, where)
+    if is_legacy_permissions(permissions):
+        for role, action, rule in _legacy_rules(permissions):
+            role_where = permissions[role].get("where")
+            where = rule.get("where") if isinstance(rule, dict) else None
+            entries.append(("default", action, role, where or role_where))
+    else:
+        for provider, actions in permissions.items():
+            if not isinstance(actions, dict):
+                continue
+            for action, roles in actions.items():
+                if not isinstance(roles, dict):
+                    continue
+                for role, rule in roles.items():
+                    if isinstance(rule, dict):
+                        entries.append((provider, action, role, rule.get("where")))
+
+    compiled: Dict[str, Any] = {}
+    for provider, action, role, where in entries:
+        if isinstance(where, str) and where.strip():
+            compiled.setdefault(provider, {}).setdefault(action, {})[
+                role
+            ] = compile_where_clause(where, owner, role)
+    return compiled
+
+
 class OpenAPIElement:
     """
     Base class for OpenAPI elements like schema properties and
     associations.
+
+    Subclasses store their attributes in __slots__ and list them in
+    `_fields`, in output order; to_dict emits exactly those fields.
     """
 
+    __slots__ = ()
+    _fields: tuple = ()
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the OpenAPI element to a dictionary, including nested
         properties.
         """
-        return {
-            k: (v.to_dict() if isinstance(v, OpenAPIElement) else v)
-            for k, v in self.__dict__.items()
-            if v is not None  # Exclude items with a value of None
-        }
+        data = {}
+        for field in self._fields:
+            value = getattr(self, field, None)
+            if value is None:  # Exclude items with a value of None
+                continue
+            data[field] = (
+                value.to_dict() if isinstance(value, OpenAPIElement) else value
+            )
+        return data
 
 
 class SchemaObjectProperty(OpenAPIElement):
@@ -60,6 +253,28 @@ class SchemaObjectProperty(OpenAPIElement):
     specification.
     """
 
+    _fields = (
+        "api_name",
+        "api_type",
+        "numeric_format",
+        "column_name",
+        "column_type",
+        "required",
+        "min_length",
+        "max_length",
+        "pattern",
+        "default",
+        "key_type",
+        "sequence_name",
+        "concurrency_control",
+        "inject_value",
+        "inject_on",
+        "soft_delete",
+        "sub_properties",
+        "items_sub_properties",
+    )
+    __slots__ = _fields
+
     def __init__(self, schema_name: str, name: str, prop: Dict[str, Any]):
         super().__init__()
         self.api_name = name
@@ -267,6 +482,8 @@ class SchemaObjectProperty(OpenAPIElement):
 class SchemaObjectKey(SchemaObjectProperty):
     """Represents a primary key in a schema object."""
 
+    __slots__ = ()
+
     def __init__(self, schema_name: str, name: str, properties: Dict[str, Any]):
         super().__init__(schema_name, name, properties)
         self.key_type = properties.get("x-af-primary-key", "auto")
@@ -300,6 +517,15 @@ class SchemaObjectKey(SchemaObjectProperty):
 class SchemaObjectAssociation(OpenAPIElement):
     """Represents an association (relationship) between schema objects."""
 
+    _fields = (
+        "api_name",
+        "api_type",
+        "schema_name",
+        "child_property",
+        "parent_property",
+    )
+    __slots__ = _fields
+
     def __init__(self, name: str, prop: Dict[str, Any], parent_key):
         super().__init__()
         self.api_name = name
@@ -370,6 +596,21 @@ class SchemaObjectAssociation(OpenAPIElement):
 class SchemaObject(OpenAPIElement):
     """Represents a schema object in the OpenAPI specification."""
 
+    _fields = (
+        "api_name",
+        "database",
+        "table_name",
+        "properties",
+        "primary_key",
+        "relations",
+        "concurrency_property",
+        "permissions",
+        "permission_properties",
+        "permission_where",
+        "inject_properties",
+    )
+    __slots__ = _fields
+
     def __init__(self, api_name: str, schema_object: Dict[str, Any]):
         super().__init__()
         self.api_name = api_name
@@ -386,6 +627,8 @@ class SchemaObject(OpenAPIElement):
                     f"value. Provide a valid database connection name."
                 ),
             )
+        if "x-af-tags" in schema_object:
+            validate_tags(schema_object["x-af-tags"], f"schema object '{api_name}'")
 
         self.table_name = self._get_table_name(schema_object)
         self.properties = self._resolve_properties(schema_object)
@@ -393,6 +636,17 @@ class SchemaObject(OpenAPIElement):
         self.relations = self._resolve_relations(schema_object)
         self.concurrency_property = self._get_concurrency_property(schema_object)
         self.permissions = self._get_permissions(schema_object)
+        names = list(self.properties)
+        self.permission_properties = (
+            compile_permission_masks(self.permissions, {"read": names, "write": names})
+            or None
+        )
+        self.permission_where = (
+            compile_permission_where(
+                self.permissions, f"schema object '{self.api_name}'"
+            )
+            or None
+        )
         self.inject_properties = self._get_inject_properties()
 
     def _get_table_name(self, schema_object: dict) -> str:
@@ -618,18 +872,24 @@ class PathOperation(OpenAPIElement):
     specification.
     """
 
+    _fields = (
+        "action",
+        "entity",
+        "database",
+        "sql",
+        "inputs",
+        "outputs",
+        "permissions",
+        "permission_properties",
+        "permission_where",
+    )
+    __slots__ = _fields
+
     def __init__(self, path: str, method: str, path_operation: Dict[str, Any]):
         super().__init__()
         self.action = METHODS_TO_ACTIONS[method]
 
-        parts = [p for p in path.lower().split("/") if p]
-        api_prefixes = {"api", "v1", "v2", "v3"}
-        literal_parts = [
-            p
-            for p in parts
-            if p not in api_prefixes and not (p.startswith("{") and p.endswith("}"))
-        ]
-        self.entity = "_".join(literal_parts)
+        self.entity = self.path_entity(path)
 
         # Validate required x-af-database attribute
         if "x-af-database" not in path_operation:
@@ -664,6 +924,36 @@ class PathOperation(OpenAPIElement):
         self.inputs = self.get_inputs(path_operation)
         self.outputs = self._extract_properties(path_operation, "responses")
         self.permissions = self._get_permissions(path_operation)
+        self.permission_properties = (
+            compile_permission_masks(
+                self.permissions,
+                {"read": list(self.outputs), "write": list(self.inputs)},
+            )
+            or None
+        )
+        self.permission_where = (
+            compile_permission_where(
+                self.permissions, f"path operation '{method.upper()} {path}'"
+            )
+            or None
+        )
+
+    @staticmethod
+    def path_entity(path: str) -> str:
+        """Entity name for a path: its literal segments minus API prefixes."""
+        parts = [p for p in path.lower().split("/") if p]
+        api_prefixes = {"api", "v1", "v2", "v3"}
+        literal_parts = [
+            p
+            for p in parts
+            if p not in api_prefixes and not (p.startswith("{") and p.endswith("}"))
+        ]
+        return "_".join(literal_parts)
+
+    @classmethod
+    def operation_key(cls, path: str, method: str) -> str:
+        """Key of a path operation in ModelFactory.path_operations."""
+        return f"{cls.path_entity(path)}_{METHODS_TO_ACTIONS[method]}"
 
     def get_inputs(
         self, path_operation: Dict[str, Any]
@@ -696,7 +986,7 @@ class PathOperation(OpenAPIElement):
                 )
         elif section == "responses":
             responses = path_operation.get("responses", {})
-            pattern = re.compile(r"2\d{2}|2xx")
+            pattern = SUCCESS_STATUS_PATTERN
             for status_code, response in responses.items():
                 if pattern.fullmatch(status_code):
                     content = (
@@ -741,13 +1031,233 @@ class PathOperation(OpenAPIElement):
         return normalized or {}
 
 
+def _column_name(schema_object: Dict[str, Any], property_name: str) -> str:
+    """Column behind a property, or the name itself if it is not a property."""
+    prop = schema_object.get("properties", {}).get(property_name)
+    return (prop or {}).get("column_name") or property_name
+
+
+def build_relation_graph(schema_objects: Mapping) -> Dict[str, Any]:
+    """
+    Build the relation graph from compiled schema object configs.
+
+    For each schema object, every relation is resolved to the tables and
+    columns the runtime joins on, along with its cardinality ("one" for
+    object relations, "many" for arrays). `reachable` maps each schema
+    reachable through relations to the shortest list of relation names
+    leading to it.
+
+    Column defaults follow the runtime: a missing parent_property or
+    child_property means the primary key of that side.
+    """
+    graph: Dict[str, Any] = {}
+    for name, schema_object in schema_objects.items():
+        relations = {}
+        for key, relation in schema_object.get("relations", {}).items():
+            child = schema_objects.get(relation.get("schema_name"))
+            parent_property = relation.get("parent_property") or schema_object.get(
+                "primary_key"
+            )
+            edge = {
+                "schema_name": relation.get("schema_name"),
+                "cardinality": "many" if relation.get("api_type") == "array" else "one",
+                "parent_table": schema_object.get("table_name"),
+                "parent_column": (
+                    _column_name(schema_object, parent_property)
+                    if parent_property
+                    else None
+                ),
+            }
+            if child is not None:
+                child_property = relation.get("child_property") or child.get(
+                    "primary_key"
+                )
+                edge["child_table"] = child.get("table_name")
+                if child_property:
+                    edge["child_column"] = _column_name(child, child_property)
+            relations[key] = {k: v for k, v in edge.items() if v is not None}
+        graph[name] = {
+            "table_name": schema_object.get("table_name"),
+            "relations": relations,
+        }
+
+    for name, node in graph.items():
+        reachable: Dict[str, list] = {}
+        frontier = [(name, [])]
+        while frontier:
+            next_frontier = []
+            for current, path in frontier:
+                for key, edge in graph[current]["relations"].items():
+                    target = edge["schema_name"]
+                    if target == name or target in reachable or target not in graph:
+                        continue
+                    reachable[target] = path + [key]
+                    next_frontier.append((target, reachable[target]))
+            frontier = next_frontier
+        node["reachable"] = reachable
+    return graph
+
+
+class LazyElementMap(Mapping):
+    """
+    Read-only mapping whose values are built on first lookup.
+
+    Keys are known up front; each value is produced by its builder the
+    first time it is accessed and cached afterwards. A builder that raises
+    is not cached, so a later lookup raises the same error again.
+    """
+
+    def __init__(self, builders: Dict[str, Callable[[], OpenAPIElement]]):
+        self._builders = builders
+        self._built: Dict[str, OpenAPIElement] = {}
+
+    def __getitem__(self, key: str) -> OpenAPIElement:
+        if key in self._built:
+            return self._built[key]
+        element = self._builders[key]()
+        self._built[key] = element
+        return element
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._builders
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._builders)
+
+    def __len__(self) -> int:
+        return len(self._builders)
+
+    def build(self, key: str) -> OpenAPIElement:
+        """The entry for `key`, built without caching it if not yet built."""
+        if key in self._built:
+            return self._built[key]
+        return self._builders[key]()
+
+    @property
+    def built_count(self) -> int:
+        """Number of entries built so far."""
+        return len(self._built)
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}({list(self._builders)}, "
+            f"built={len(self._built)})"
+        )
+
+
+# Builders of the current parallel build, installed in each pool worker
+_worker_builders: Dict[str, Callable[[], OpenAPIElement]] = {}
+
+
+def _init_worker(builders: Dict[str, Callable[[], OpenAPIElement]]) -> None:
+    global _worker_builders
+    _worker_builders = builders
+
+
+def _build_chunk(
+    names: list[str],
+) -> list[Tuple[str, Optional[OpenAPIElement], Optional[Tuple[int, str]]]]:
+    """
+    Build a chunk of elements in a pool worker.
+
+    Returns (name, element, error) per entry, stopping at the first
+    ApplicationException, which is returned as (status_code, message)
+    since the exception itself does not survive pickling.
+    """
+    results = []
+    for name in names:
+        try:
+            results.append((name, _worker_builders[name](), None))
+        except ApplicationException as e:
+            results.append((name, None, (e.status_code, e.message)))
+            break
+    return results
+
+
+def build_elements_parallel(
+    builders: Dict[str, Callable[[], OpenAPIElement]], workers: int
+) -> Dict[str, OpenAPIElement]:
+    """
+    Build elements across a process pool of `workers` processes.
+
+    The builders are handed to each worker once (inherited without copying
+    where processes fork) and chunks only carry names. Results keep the
+    order of `builders`, and the error raised is the one the serial build
+    would raise first: chunks are collected in order and the first failing
+    entry stops the merge.
+    """
+    names = list(builders)
+    chunk_count = min(len(names), workers * PARALLEL_CHUNKS_PER_WORKER)
+    size = -(-len(names) // chunk_count)
+    remaining = iter(names)
+    chunks = list(iter(lambda: list(islice(remaining, size)), []))
+
+    elements: Dict[str, OpenAPIElement] = {}
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(builders,)
+    ) as pool:
+        futures = [pool.submit(_build_chunk, chunk) for chunk in chunks]
+        try:
+            for future in futures:
+                for name, element, error in future.result():
+                    if error is not None:
+                        raise ApplicationException(*error)
+                    elements[name] = element
+        finally:
+            for future in futures:
+                future.cancel()
+    return elements
+
+
 class ModelFactory:
-    """Factory class to load and process OpenAPI specifications into models."""
+    """Factory class to load and process OpenAPI specifications into models.
 
-    def __init__(self, spec: dict):
+    By default every schema object and path operation is built (and
+    validated) up front. With `lazy=True`, `schema_objects` and
+    `path_operations` are LazyElementMaps that build each entry on first
+    access; call `validate_all()` to build and validate everything.
+
+    `workers` opts into building schema objects across a process pool of
+    that many processes (0 means one per CPU). Specs with fewer than
+    PARALLEL_MIN_SCHEMAS schema objects are still built serially. Results
+    and errors are the same as for a serial build.
+
+    `refs_resolved` counts the $ref nodes resolved so far.
+    """
+
+    def __init__(self, spec: dict, lazy: bool = False, workers: Optional[int] = None):
+        self.refs_resolved = 0
         self.spec = self.resolve_all_refs(spec)
-        self.schema_objects = self._load_schema_objects()
-        self.path_operations = self._load_path_operations()
+        self.lazy = lazy
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        self.workers = workers
+        schema_builders = self._schema_object_builders()
+        operation_builders = self._path_operation_builders()
+        if lazy:
+            self.schema_objects: Mapping = LazyElementMap(schema_builders)
+            self.path_operations: Mapping = LazyElementMap(operation_builders)
+        elif workers and workers > 1 and len(schema_builders) >= PARALLEL_MIN_SCHEMAS:
+            self.schema_objects = build_elements_parallel(schema_builders, workers)
+            self.path_operations = {
+                name: build() for name, build in operation_builders.items()
+            }
+        else:
+            self.schema_objects = {
+                name: build() for name, build in schema_builders.items()
+            }
+            self.path_operations = {
+                name: build() for name, build in operation_builders.items()
+            }
+
+    def validate_all(self) -> None:
+        """
+        Build every schema object and path operation, raising the first
+        validation error. A no-op for an eagerly built factory.
+        """
+        for elements in (self.schema_objects, self.path_operations):
+            for name in elements:
+                elements[name]
 
     def resolve_reference(self, ref: str, base_spec: Dict[str, Any]) -> Any:
         """Resolve a single $ref reference."""
@@ -775,60 +1285,110 @@ class ModelFactory:
         Recursively resolve all $ref references in an OpenAPI
         specification.
         """
+        return self.resolve_refs(spec, spec)
+
+    def resolve_refs(self, node: Any, spec: Dict[str, Any]) -> Any:
+        """
+        Resolve the $ref references in `node`, a part of `spec`, against
+        `spec`.
+
+        Each reference target is looked up once. Bare `{"$ref": ...}` nodes
+        resolve to a single dict shared by every use of that target; nodes
+        with sibling keys (like x-af-child-property) get their own shallow
+        merge. A target that is itself a bare $ref is followed to the end
+        of the chain, and a chain that loops back on itself is rejected.
+        """
+        targets: Dict[str, Any] = {}
+        shared_nodes: Dict[str, Dict[str, Any]] = {}
+
+        def resolve_target(ref: str, chain: tuple = ()) -> Any:
+            if ref in targets:
+                return targets[ref]
+            if ref in chain:
+                raise ApplicationException(
+                    500,
+                    "Circular $ref chain detected: " + " -> ".join(chain + (ref,)),
+                )
+            target = self.resolve_reference(ref, spec)
+            if isinstance(target, dict) and list(target) == ["$ref"]:
+                target = resolve_target(target["$ref"], chain + (ref,))
+            targets[ref] = target
+            return target
 
         def resolve(obj: Any) -> Any:
             if isinstance(obj, dict):
                 if "$ref" in obj:
-                    # Resolve the reference
-                    resolved_ref = self.resolve_reference(obj["$ref"], spec)
+                    ref = obj["$ref"]
+                    self.refs_resolved += 1
+                    if len(obj) == 1:
+                        node = shared_nodes.get(ref)
+                        if node is None:
+                            node = self.merge_dicts(resolve_target(ref), obj)
+                            shared_nodes[ref] = node
+                        return node
                     # Merge the resolved reference with the original object
                     # (so we keep attributes like x-af-child-property)
-                    return self.merge_dicts(resolved_ref, obj)
+                    return self.merge_dicts(resolve_target(ref), obj)
                 # Recursively resolve other properties
                 return {k: resolve(v) for k, v in obj.items()}
             elif isinstance(obj, list):
                 return [resolve(v) for v in obj]
             return obj
 
-        return resolve(spec)
+        return resolve(node)
 
-    def _load_schema_objects(self) -> Dict[str, SchemaObject]:
-        """Loads all schema objects from the OpenAPI specification.
+    def _schema_object_builders(self) -> Dict[str, Callable[[], SchemaObject]]:
+        """Builders for the schema objects in the OpenAPI specification.
 
         Only schemas with x-af-database attribute are loaded. Other schemas
         (like DTOs, enums, or reference-only types) are silently skipped.
         """
-        schema_objects = {}
+        builders = {}
         schemas = self.spec.get("components", {}).get("schemas", {})
         for name, schema in schemas.items():
             if "x-af-database" in schema:
-                schema_objects[name] = SchemaObject(name, schema)
+                builders[name] = partial(SchemaObject, name, schema)
             else:
                 log.debug(f"Skipping schema '{name}' - no x-af-database attribute")
-        return schema_objects
+        return builders
 
-    def _load_path_operations(self) -> Dict[str, PathOperation]:
-        """Loads all path operations from the OpenAPI specification."""
-        path_operations = {}
+    def _path_operation_builders(self) -> Dict[str, Callable[[], PathOperation]]:
+        """Builders for the path operations in the OpenAPI specification."""
+        builders = {}
         paths = self.spec.get("paths", {})
         if paths:
             for path, methods in paths.items():
                 for method, operation in methods.items():
                     if "x-af-database" in operation:
-                        path_operation = PathOperation(path, method, operation)
-                        path_operations[
-                            f"{path_operation.entity}_{path_operation.action}"
-                        ] = path_operation
-        return path_operations
+                        builders[PathOperation.operation_key(path, method)] = partial(
+                            PathOperation, path, method, operation
+                        )
+        return builders
+
+    def iter_config(self, section: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        (name, config dict) of each entry of `section` ("schema_objects" or
+        "path_operations"). A lazy factory builds entries one at a time
+        without keeping them.
+        """
+        elements = getattr(self, section)
+        for name in elements:
+            if isinstance(elements, LazyElementMap):
+                yield name, elements.build(name).to_dict()
+            else:
+                yield name, elements[name].to_dict()
 
     def get_config_output(self) -> Dict[str, Any]:
         """Generates and returns the configuration output."""
         log.info("path_operations: %s", self.path_operations)
+        schema_objects = {
+            name: obj.to_dict() for name, obj in self.schema_objects.items()
+        }
         return {
-            "schema_objects": {
-                name: obj.to_dict() for name, obj in self.schema_objects.items()
-            },
+            "schema_objects": schema_objects,
             "path_operations": {
                 name: obj.to_dict() for name, obj in self.path_operations.items()
             },
+            "relation_graph": build_relation_graph(schema_objects),
+            "sql_templates": build_sql_templates(schema_objects),
         }
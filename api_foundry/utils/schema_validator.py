@@ -1,6 +1,56 @@
 # schema_validator.py
 
 import re
+from functools import lru_cache
+
+# Upper bound on distinct permission patterns kept compiled per process
+PATTERN_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compiled_pattern(pattern: str) -> re.Pattern:
+    """
+    Return the compiled form of a permission field-mask regex.
+
+    Compiled patterns are shared process-wide, so the validator, the
+    permission compiler and the runtime reuse one object per distinct
+    pattern. Invalid patterns raise re.error and are not cached.
+    """
+    return re.compile(pattern)
+
+
+def pattern_cache_info():
+    """Hit/miss statistics of the compiled pattern cache."""
+    return compiled_pattern.cache_info()
+
+
+def is_legacy_permissions(permissions: dict) -> bool:
+    """
+    Detect the legacy role-first form: role -> {action: rule}, or a role
+    with a role-level 'where'.
+    """
+    if not permissions:
+        return False
+    # If any top-level value is a dict where an action maps to a non-dict
+    # rule (e.g., string/bool/object rule), it's the legacy form.
+    # Also detect if there's a 'where' key at the role level.
+    for v in permissions.values():
+        if isinstance(v, dict):
+            # Check for role-level 'where' clause (hybrid approach)
+            if "where" in v:
+                return True
+            for k2, v2 in v.items():
+                actions = {"read", "write", "delete"}
+                if k2 in actions and not isinstance(v2, dict):
+                    return True
+    return False
+
+
+def validate_tags(tags, owner: str):
+    """Validate `x-af-tags`: a list of tag name strings."""
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ValueError(f"`x-af-tags` of {owner} must be a list of strings.")
+    return True
 
 
 def validate_permissions(permissions):
@@ -39,7 +89,7 @@ def validate_permissions(permissions):
             # {properties: regex, where?: string}
             if isinstance(rule, str):
                 try:
-                    re.compile(rule)
+                    compiled_pattern(rule)
                 except re.error as e:
                     raise ValueError(
                         "Invalid regex pattern '"
@@ -70,7 +120,7 @@ def validate_permissions(permissions):
                         f"string."
                     )
                 try:
-                    re.compile(properties)
+                    compiled_pattern(properties)
                 except re.error as e:
                     raise ValueError(
                         "Invalid regex pattern in 'properties' for role '"
@@ -132,26 +182,8 @@ def validate_permissions(permissions):
                 f"'read', 'write', and 'delete'."
             )
 
-    # Detect legacy form: role -> {action: rule} or role with 'where'
-    def _is_legacy_form(obj: dict) -> bool:
-        if not obj:
-            return False
-        # If any top-level value is a dict where an action maps to a non-dict
-        # rule (e.g., string/bool/object rule), it's the legacy form.
-        # Also detect if there's a 'where' key at the role level.
-        for v in obj.values():
-            if isinstance(v, dict):
-                # Check for role-level 'where' clause (hybrid approach)
-                if "where" in v:
-                    return True
-                for k2, v2 in v.items():
-                    actions = {"read", "write", "delete"}
-                    if k2 in actions and not isinstance(v2, dict):
-                        return True
-        return False
-
     # Legacy path: {role: {read|write|delete: rule, where?: string}}
-    if _is_legacy_form(permissions):
+    if is_legacy_permissions(permissions):
         for role_name, actions in permissions.items():
             if not isinstance(role_name, str):
                 raise ValueError("Role names must be strings in legacy form.")
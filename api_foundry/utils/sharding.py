@@ -0,0 +1,200 @@
+# sharding.py
+
+"""
+Partitioning of an API spec into shards that are deployed separately.
+
+Schema objects and path operations are assigned to shards by their
+x-af-database, by tag, or by a user-defined grouping. A shard's spec
+holds the path operations and schema objects assigned to it plus every
+schema those reach through $refs, so the shard's Lambda can still
+resolve relations; CRUD operations are generated only for the shard's
+own schema objects.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Union
+
+# Ways to assign schema objects and path operations to shards
+SHARD_MODES = ("database", "tag")
+
+# Shard of schema objects and path operations no rule assigns
+DEFAULT_SHARD = "default"
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+# A mode name, or shard name -> schema names and path prefixes ("/...")
+ShardBy = Union[str, Mapping[str, Iterable[str]]]
+
+
+class SpecShard:
+    """
+    One partition of a spec.
+
+    `spec` is a complete spec sharing nodes with the original;
+    `schema_names` are the schema objects the shard serves, a subset of
+    the schemas in `spec`.
+    """
+
+    name: str
+    spec: Dict[str, Any]
+    schema_names: List[str]
+
+    def __init__(self, name: str, spec: Dict[str, Any], schema_names: List[str]):
+        self.name = name
+        self.spec = spec
+        self.schema_names = schema_names
+
+    @property
+    def paths(self) -> Dict[str, Any]:
+        return self.spec.get("paths", {})
+
+    def attribute_values(self, key: str) -> List[Any]:
+        """Distinct values of `key` on the shard's schemas and path operations."""
+        schemas = self.spec.get("components", {}).get("schemas", {})
+        items = [schemas[name] for name in self.schema_names]
+        for path_item in self.paths.values():
+            items.extend(
+                operation
+                for method, operation in path_item.items()
+                if method in HTTP_METHODS
+            )
+        return list(dict.fromkeys(item[key] for item in items if item.get(key)))
+
+
+def shard_name(key: Any) -> str:
+    """A shard key as usable in resource names and base paths."""
+    name = re.sub(r"[^a-z0-9]+", "-", str(key).lower()).strip("-")
+    return name or DEFAULT_SHARD
+
+
+class _Assigner:
+    """Shard keys of schema objects and path operations for one ShardBy."""
+
+    def __init__(self, shard_by: ShardBy):
+        self.mode: Optional[str] = None
+        self.schema_groups: Dict[str, str] = {}
+        self.path_groups: List[tuple[str, str]] = []
+
+        if isinstance(shard_by, str):
+            if shard_by not in SHARD_MODES:
+                raise ValueError(
+                    f"Invalid shard mode '{shard_by}'; expected one of: "
+                    f"{', '.join(SHARD_MODES)} or a mapping of shard names"
+                )
+            self.mode = shard_by
+            return
+
+        for shard, members in shard_by.items():
+            for member in members:
+                if member.startswith("/"):
+                    self.path_groups.append((member.rstrip("/"), shard))
+                else:
+                    self.schema_groups[member] = shard
+        # the longest matching prefix wins
+        self.path_groups.sort(key=lambda group: len(group[0]), reverse=True)
+
+    def schema_shard(self, schema_name: str, schema_object: dict) -> str:
+        if self.mode == "database":
+            key = schema_object.get("x-af-database")
+        elif self.mode == "tag":
+            key = next(iter(schema_object.get("x-af-tags") or []), None)
+        else:
+            key = self.schema_groups.get(schema_name)
+        return shard_name(key) if key else DEFAULT_SHARD
+
+    def operation_shard(self, path: str, operation: dict) -> str:
+        if self.mode == "database":
+            key = operation.get("x-af-database")
+        elif self.mode == "tag":
+            key = next(iter(operation.get("tags") or []), None)
+        else:
+            key = next(
+                (
+                    shard
+                    for prefix, shard in self.path_groups
+                    if path == prefix or path.startswith(prefix + "/")
+                ),
+                None,
+            )
+        return shard_name(key) if key else DEFAULT_SHARD
+
+
+def schema_refs(node: Any) -> set[str]:
+    """Names of the component schemas $ref'd anywhere in `node`."""
+    names = set()
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            ref = current.get("$ref")
+            if isinstance(ref, str) and ref.startswith(SCHEMA_REF_PREFIX):
+                names.add(ref.removeprefix(SCHEMA_REF_PREFIX).split("/")[0])
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+    return names
+
+
+def _reachable(roots: Iterable[str], refs: Dict[str, set[str]]) -> set[str]:
+    """`roots` and every schema they reach through $refs."""
+    reached = set()
+    stack = list(roots)
+    while stack:
+        name = stack.pop()
+        if name in reached or name not in refs:
+            continue
+        reached.add(name)
+        stack.extend(refs[name])
+    return reached
+
+
+def partition_spec(spec: Dict[str, Any], shard_by: ShardBy) -> Dict[str, SpecShard]:
+    """
+    Split `spec` into shards, in order of first appearance.
+
+    A path item whose operations fall in different shards is split by
+    method; path-level keys (parameters, summary, ...) go with every part.
+    """
+    assigner = _Assigner(shard_by)
+    schemas = spec.get("components", {}).get("schemas", {}) or {}
+
+    owned: Dict[str, List[str]] = {}
+    paths: Dict[str, Dict[str, Any]] = {}
+    for schema_name, schema_object in schemas.items():
+        shard = assigner.schema_shard(schema_name, schema_object)
+        owned.setdefault(shard, []).append(schema_name)
+        paths.setdefault(shard, {})
+
+    for path, path_item in (spec.get("paths") or {}).items():
+        methods = {
+            method: assigner.operation_shard(path, operation)
+            for method, operation in path_item.items()
+            if method in HTTP_METHODS
+        }
+        for shard in dict.fromkeys(methods.values()):
+            owned.setdefault(shard, [])
+            paths.setdefault(shard, {})[path] = {
+                key: value
+                for key, value in path_item.items()
+                if methods.get(key, shard) == shard
+            }
+
+    refs = {name: schema_refs(schema) for name, schema in schemas.items()}
+    shards = {}
+    for shard, schema_names in owned.items():
+        needed = _reachable(
+            list(schema_names) + sorted(schema_refs(paths[shard])), refs
+        )
+        shard_spec = dict(spec)
+        shard_spec["paths"] = paths[shard]
+        if "components" in spec:
+            shard_spec["components"] = {
+                **spec["components"],
+                "schemas": {
+                    name: schema for name, schema in schemas.items() if name in needed
+                },
+            }
+        shards[shard] = SpecShard(shard, shard_spec, schema_names)
+    return shards
@@ -0,0 +1,156 @@
+# spec_cache.py
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from typing import Any, Optional, Union
+
+from cloud_foundry import logger
+
+from api_foundry.utils.model_artifact import ConfigUnpickler
+
+log = logger(__name__)
+
+# The spec cache is opt-in: set to 1/true/on, or set the cache directory;
+# 0/false/off bypasses the cache entirely
+CACHE_ENABLED_ENV = "API_FOUNDRY_SPEC_CACHE"
+CACHE_DIR_ENV = "API_FOUNDRY_SPEC_CACHE_DIR"
+CACHE_MAX_BYTES_ENV = "API_FOUNDRY_SPEC_CACHE_MAX_BYTES"
+
+DEFAULT_CACHE_DIR = os.path.join("temp", "spec_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump when the cached representation changes so stale entries are ignored
+CACHE_FORMAT_VERSION = "1"
+
+ENTRY_SUFFIX = ".pickle"
+
+
+class SpecCache:
+    """
+    On-disk cache of parsed spec documents.
+
+    Entries are parsed dicts stored as pickles and addressed by a digest of
+    the source content (local files) or of the object ETag (S3), so an
+    unchanged fragment is loaded without running the YAML parser. Entries
+    are loaded with ConfigUnpickler, so one can hold only plain data. Total
+    size is bounded; the least recently used entries are evicted first.
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, max_bytes: Optional[int] = None
+    ):
+        self.directory = directory or os.environ.get(CACHE_DIR_ENV) or DEFAULT_CACHE_DIR
+        if max_bytes is None:
+            max_bytes = int(os.environ.get(CACHE_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_key(content: Union[str, bytes]) -> str:
+        """Cache key for a document identified by its content."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        digest = hashlib.sha256(content).hexdigest()
+        return f"v{CACHE_FORMAT_VERSION}-content-{digest}"
+
+    @staticmethod
+    def etag_key(bucket: str, key: str, etag: str) -> str:
+        """Cache key for an S3 object identified by its ETag."""
+        source = f"s3://{bucket}/{key}\0{etag}".encode("utf-8")
+        digest = hashlib.sha256(source).hexdigest()
+        return f"v{CACHE_FORMAT_VERSION}-etag-{digest}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached document for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = ConfigUnpickler(f).load()
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+            log.warning("Discarding unreadable spec cache entry %s: %s", path, e)
+            self._remove(path)
+            self._count(hit=False)
+            return None
+
+        # Refresh the modification time so eviction is least-recently-used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count(hit=True)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a parsed document; failures only cost a future re-parse."""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except (OSError, pickle.PicklingError) as e:
+            log.warning("Unable to write spec cache entry %s: %s", key, e)
+
+    def prune(self) -> int:
+        """
+        Evict least recently used entries until the cache fits within
+        max_bytes. Returns the number of entries removed.
+        """
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.directory)
+                if entry.is_file() and entry.name.endswith(ENTRY_SUFFIX)
+            ]
+        except FileNotFoundError:
+            return 0
+
+        stats = [(entry.path, entry.stat()) for entry in entries]
+        total = sum(stat.st_size for _, stat in stats)
+        removed = 0
+        for path, stat in sorted(stats, key=lambda item: item[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                total -= stat.st_size
+                removed += 1
+        if removed:
+            log.info("Evicted %d spec cache entries from %s", removed, self.directory)
+        return removed
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+def spec_cache_enabled() -> bool:
+    value = os.environ.get(CACHE_ENABLED_ENV, "").strip().lower()
+    if value:
+        return value not in ("0", "false", "off", "no")
+    return bool(os.environ.get(CACHE_DIR_ENV, "").strip())
+
+
+def get_spec_cache() -> Optional[SpecCache]:
+    """Return a SpecCache configured from the environment, or None if disabled."""
+    return SpecCache() if spec_cache_enabled() else None
@@ -0,0 +1,134 @@
+# spec_minifier.py
+
+"""
+Minification of the OpenAPI spec handed to API Gateway.
+
+API Gateway ignores the x-af-* extensions that drive the query engine
+(SQL, permissions, column metadata), and the documentation fields are
+only for people reading the spec. `minify_spec` drops the extensions
+and, on request, the documentation, returning a new tree; the input is
+not modified and unchanged subtrees are shared with it.
+"""
+
+import re
+from typing import Any, Dict, Optional
+
+EXTENSION_PATTERN = re.compile(r"^x-af-")
+
+# Documentation keys removed by strip_docs
+DOC_KEYS = frozenset({"description", "summary", "example", "examples", "externalDocs"})
+
+# Keys whose value maps arbitrary names to objects; a property may be
+# called "description", so keys of these maps are never removed
+NAME_MAPS = frozenset(
+    {
+        "callbacks",
+        "content",
+        "encoding",
+        "headers",
+        "links",
+        "mapping",
+        "parameters",
+        "paths",
+        "patternProperties",
+        "properties",
+        "requestBodies",
+        "responses",
+        "schemas",
+        "scopes",
+        "securitySchemes",
+        "variables",
+    }
+)
+
+# Keys holding literal data or another vendor's extension, left as is
+DATA_KEYS = frozenset({"default", "enum", "const"})
+
+# Node kinds while walking. Keys are only removed from objects; the
+# keys of name maps (and of security requirements) are names
+OBJECT = "object"
+RESPONSE = "response"
+NAME_MAP = "name_map"
+RESPONSE_MAP = "response_map"
+SECURITY = "security"
+
+
+def _removable(key: str, kind: str, strip_docs: bool) -> bool:
+    if EXTENSION_PATTERN.match(key):
+        return True
+    if not strip_docs or key not in DOC_KEYS:
+        return False
+    # description is required on response objects
+    return not (kind == RESPONSE and key == "description")
+
+
+def _child_kind(key: str, kind: str) -> str:
+    """Kind of the value at `key` of a node of `kind`."""
+    if kind == NAME_MAP:
+        return OBJECT
+    if kind == RESPONSE_MAP:
+        return RESPONSE
+    if kind == SECURITY:
+        return NAME_MAP
+    if key == "responses":
+        return RESPONSE_MAP
+    if key == "security":
+        return SECURITY
+    if key in NAME_MAPS:
+        return NAME_MAP
+    return OBJECT
+
+
+def minify_spec(spec: Dict[str, Any], strip_docs: bool = False) -> Dict[str, Any]:
+    """
+    Return `spec` without x-af-* keys and, with `strip_docs`, without
+    description, summary, example(s) and externalDocs keys.
+
+    Containers that lose nothing are shared with `spec`; a container
+    reached along several paths is minified once, so shared nodes stay
+    shared in the result.
+    """
+    memo: Dict[tuple, Any] = {}
+
+    def visit(node: Any, kind: str) -> Any:
+        if not isinstance(node, (dict, list)):
+            return node
+        memo_key = (id(node), kind)
+        if memo_key in memo:
+            return memo[memo_key]
+
+        result: Optional[Any] = None
+        if isinstance(node, list):
+            # lists hold objects, or name maps in a security requirement
+            item_kind = NAME_MAP if kind == SECURITY else OBJECT
+            for index, item in enumerate(node):
+                new_item = visit(item, item_kind)
+                if new_item is not item:
+                    if result is None:
+                        result = list(node)
+                    result[index] = new_item
+        else:
+            names = kind in (NAME_MAP, RESPONSE_MAP)
+            for key, value in node.items():
+                if not isinstance(key, str):
+                    continue
+                if not names and _removable(key, kind, strip_docs):
+                    new_value = None
+                elif not names and (key in DATA_KEYS or key.startswith("x-")):
+                    continue
+                else:
+                    new_value = visit(value, _child_kind(key, kind))
+                    if new_value is value:
+                        continue
+                if result is None:
+                    result = dict(node)
+                if new_value is None:
+                    del result[key]
+                else:
+                    result[key] = new_value
+
+        result = node if result is None else result
+        memo[memo_key] = result
+        return result
+
+    return visit(spec, OBJECT)
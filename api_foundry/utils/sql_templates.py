@@ -0,0 +1,183 @@
+# sql_templates.py
+
+"""
+Parameterized SQL statement templates compiled from schema object configs.
+
+Templates use pyformat placeholders named after the property's api_name
+(`%(title)s`), matching the psycopg2 path of the query engine, so the
+runtime only has to bind values. They cover the full column list; the
+runtime narrows them when a request touches fewer properties.
+"""
+
+from typing import Any, Dict, Mapping, Optional
+
+
+def _placeholder(name: str) -> str:
+    return f"%({name})s"
+
+
+def _literal(value: Any) -> str:
+    """Render a constant from the spec as a SQL literal."""
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _concurrency_update(prop: Dict[str, Any]) -> str:
+    """Expression producing the next concurrency token for a row."""
+    if prop.get("api_type") == "date-time":
+        return "CURRENT_TIMESTAMP"
+    if prop.get("api_type") == "integer":
+        return f"{prop['column_name']} + 1"
+    return "gen_random_uuid()"
+
+
+def _concurrency_initial(prop: Dict[str, Any]) -> str:
+    """Expression producing the first concurrency token of a new row."""
+    if prop.get("column_type") == "integer":
+        return "1"
+    return _concurrency_update(prop)
+
+
+def soft_delete_filter(schema_object: Dict[str, Any]) -> Optional[str]:
+    """WHERE predicate excluding soft-deleted rows, or None."""
+    conditions = []
+    for prop in schema_object.get("properties", {}).values():
+        config = prop.get("soft_delete") or {}
+        strategy = config.get("strategy")
+        column = prop["column_name"]
+        if strategy == "null_check":
+            conditions.append(f"{column} IS NULL")
+        elif strategy == "boolean_flag":
+            active_value = config.get("active_value", True)
+            conditions.append(f"{column} = {_literal(active_value)}")
+        elif strategy == "exclude_values" and config.get("values"):
+            values = ", ".join(_literal(v) for v in config["values"])
+            conditions.append(f"{column} NOT IN ({values})")
+    return " AND ".join(conditions) if conditions else None
+
+
+def _soft_delete_assignments(schema_object: Dict[str, Any]) -> list[str]:
+    """SET assignments that mark a row deleted."""
+    assignments = []
+    for prop in schema_object.get("properties", {}).values():
+        config = prop.get("soft_delete") or {}
+        strategy = config.get("strategy")
+        column = prop["column_name"]
+        if strategy == "null_check":
+            if prop.get("api_type") in ("date-time", "datetime"):
+                assignments.append(f"{column} = CURRENT_TIMESTAMP")
+            else:
+                assignments.append(f"{column} = 'deleted'")
+        elif strategy == "boolean_flag":
+            inactive_value = not config.get("active_value", True)
+            assignments.append(f"{column} = {_literal(inactive_value)}")
+        elif strategy == "exclude_values" and config.get("delete_value"):
+            assignments.append(f"{column} = {_literal(config['delete_value'])}")
+        elif strategy == "audit_field" and config.get("action") == "delete":
+            placeholder = _placeholder(f"audit_{prop['api_name']}")
+            assignments.append(f"{column} = {placeholder}")
+    return assignments
+
+
+def schema_sql_templates(schema_object: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Statement templates for one schema object config.
+
+    Key-addressed statements (read_by_key, update, delete) are only
+    produced when the schema object has a primary key.
+    """
+    table = schema_object["table_name"]
+    properties = schema_object.get("properties", {})
+    columns = [prop["column_name"] for prop in properties.values()]
+    select_list = ", ".join(columns)
+    returning = f" RETURNING {select_list}"
+
+    key_name = schema_object.get("primary_key")
+    key = properties.get(key_name) if key_name else None
+    concurrency_name = schema_object.get("concurrency_property")
+    concurrency = properties.get(concurrency_name) if concurrency_name else None
+    soft_filter = soft_delete_filter(schema_object)
+
+    templates: Dict[str, Any] = {"table_name": table, "columns": columns}
+
+    key_predicate = None
+    if key:
+        key_predicate = f"{key['column_name']} = {_placeholder(key['api_name'])}"
+        templates["key_predicate"] = key_predicate
+    concurrency_predicate = None
+    if concurrency:
+        concurrency_predicate = (
+            f"{concurrency['column_name']} = "
+            f"{_placeholder(concurrency['api_name'])}"
+        )
+        templates["concurrency_predicate"] = concurrency_predicate
+    if soft_filter:
+        templates["soft_delete_filter"] = soft_filter
+
+    select = f"SELECT {select_list} FROM {table}"
+    templates["read"] = select + (f" WHERE {soft_filter}" if soft_filter else "")
+    if key_predicate:
+        templates["read_by_key"] = f"{select} WHERE " + " AND ".join(
+            p for p in (key_predicate, soft_filter) if p
+        )
+
+    insert_columns = []
+    insert_values = []
+    for name, prop in properties.items():
+        if name == concurrency_name:
+            continue
+        if name == key_name and prop.get("key_type") == "auto":
+            continue
+        insert_columns.append(prop["column_name"])
+        if name == key_name and prop.get("key_type") == "sequence":
+            insert_values.append(f"nextval('{prop['sequence_name']}')")
+        else:
+            insert_values.append(_placeholder(prop["api_name"]))
+    if concurrency:
+        insert_columns.append(concurrency["column_name"])
+        insert_values.append(_concurrency_initial(concurrency))
+    templates["create"] = (
+        f"INSERT INTO {table} ( {', '.join(insert_columns)} ) "
+        f"VALUES ( {', '.join(insert_values)} ){returning}"
+    )
+
+    if key_predicate:
+        where = " WHERE " + " AND ".join(
+            p for p in (key_predicate, concurrency_predicate) if p
+        )
+        assignments = [
+            f"{prop['column_name']} = {_placeholder(prop['api_name'])}"
+            for name, prop in properties.items()
+            if name not in (key_name, concurrency_name)
+        ]
+        if concurrency:
+            assignments.append(
+                f"{concurrency['column_name']} = {_concurrency_update(concurrency)}"
+            )
+        if assignments:
+            update_set = ", ".join(assignments)
+            templates["update"] = f"UPDATE {table} SET {update_set}{where}{returning}"
+
+        soft_assignments = []
+        if soft_filter:
+            soft_assignments = _soft_delete_assignments(schema_object)
+        if soft_assignments:
+            delete_set = ", ".join(soft_assignments)
+            templates["delete"] = f"UPDATE {table} SET {delete_set}{where}{returning}"
+        else:
+            templates["delete"] = f"DELETE FROM {table}{where}{returning}"
+
+    return templates
+
+
+def build_sql_templates(schema_objects: Mapping) -> Dict[str, Any]:
+    """Statement templates for every compiled schema object config."""
+    return {
+        name: schema_sql_templates(schema_object)
+        for name, schema_object in schema_objects.items()
+    }
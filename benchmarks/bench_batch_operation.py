@@ -0,0 +1,62 @@
+# bench_batch_operation.py
+
+"""
+Cost of adding the batch endpoint to generated specs of growing size,
+next to the YAML round trip generate_batch_operation used to make.
+
+    python -m benchmarks.bench_batch_operation --schemas 25 100 400
+"""
+
+import argparse
+import json
+import time
+
+from cloud_foundry.utils.aws_openapi_editor import AWSOpenAPISpecEditor
+
+from api_foundry.iac.gateway_spec import APISpecEditor
+from api_foundry.utils import yaml_io
+from benchmarks.synthetic import synthetic_spec
+
+
+def _editor(schema_count: int) -> APISpecEditor:
+    """Editor holding the generated CRUD spec, before the batch endpoint."""
+    editor = APISpecEditor(open_api_spec=synthetic_spec(schema_count), function=None)
+    editor.rest_api_spec()
+    return editor
+
+
+def run(schema_counts: list[int], repeat: int) -> list[dict]:
+    results = []
+    for count in schema_counts:
+        editor = _editor(count)
+        batch = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            editor.generate_batch_operation("/batch")
+            batch.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        AWSOpenAPISpecEditor(yaml_io.safe_load(editor.spec_yaml()))
+        round_trip = time.perf_counter() - start
+
+        results.append(
+            {
+                "schemas": count,
+                "paths": len(editor.editor.openapi_spec["paths"]),
+                "batch_operation_ms": round(min(batch) * 1000, 3),
+                "yaml_round_trip_ms": round(round_trip * 1000, 1),
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, nargs="+", default=[25, 100, 400])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.schemas, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# bench_config_writer.py
+
+"""
+Peak memory of serializing the model config: one safe_dump of the full
+dict versus the streaming writer.
+
+    python -m benchmarks.bench_config_writer --schemas 100 250
+"""
+
+import argparse
+import gc
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from api_foundry.utils import yaml_io
+from api_foundry.utils.config_writer import stream_model_config, write_config
+from api_foundry.utils.model_factory import ModelFactory
+from benchmarks.synthetic import synthetic_spec
+
+
+def _measure(func) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 3), "peak_mib": round(peak / 2**20, 1)}
+
+
+def run(schema_counts: list[int]) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        path = os.path.join(work_dir, "api_spec.yaml")
+        for count in schema_counts:
+            spec = synthetic_spec(count, properties=20, relation_density=1.0)
+
+            def full_dump():
+                config = ModelFactory(spec).get_config_output()
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(yaml_io.safe_dump(config))
+
+            def write_dict():
+                config = ModelFactory(spec).get_config_output()
+                with open(path, "w", encoding="utf-8") as f:
+                    write_config(config, f)
+
+            def stream_lazy():
+                with open(path, "w", encoding="utf-8") as f:
+                    stream_model_config(ModelFactory(spec, lazy=True), f)
+
+            results.append(
+                {
+                    "schemas": count,
+                    "safe_dump": _measure(full_dump),
+                    "write_config": _measure(write_dict),
+                    "stream_model_config": _measure(stream_lazy),
+                    "output_mib": round(os.path.getsize(path) / 2**20, 1),
+                }
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, nargs="+", default=[100, 250])
+    args = parser.parse_args()
+    print(json.dumps(run(args.schemas), indent=2))
+
+
+if __name__ == "__main__":
+    main()
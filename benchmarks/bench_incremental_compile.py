@@ -0,0 +1,57 @@
+# bench_incremental_compile.py
+
+"""
+Full versus incremental model compilation after a single schema change.
+
+    python -m benchmarks.bench_incremental_compile --schemas 600
+"""
+
+import argparse
+import json
+import tempfile
+import time
+
+from api_foundry.utils.model_compiler import IncrementalModelCompiler
+from api_foundry.utils.model_factory import ModelFactory
+from benchmarks.chinook import scaled_chinook
+
+
+def _timed(func) -> tuple:
+    start = time.perf_counter()
+    result = func()
+    return result, round(time.perf_counter() - start, 4)
+
+
+def run(schema_count: int) -> dict:
+    spec = scaled_chinook(schema_count)
+    _, full_seconds = _timed(lambda: ModelFactory(spec).get_config_output())
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        _, cold_seconds = _timed(
+            lambda: IncrementalModelCompiler(cache_dir).compile(spec)
+        )
+
+        album = spec["components"]["schemas"]["album"]
+        album["properties"]["subtitle"] = {"type": "string"}
+        compiler = IncrementalModelCompiler(cache_dir)
+        _, warm_seconds = _timed(lambda: compiler.compile(spec))
+
+    return {
+        "schemas": schema_count,
+        "full_compile_seconds": full_seconds,
+        "incremental_cold_seconds": cold_seconds,
+        "incremental_one_change_seconds": warm_seconds,
+        "rebuilt": compiler.rebuilt,
+        "reused": len(compiler.reused),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, default=600)
+    args = parser.parse_args()
+    print(json.dumps(run(args.schemas), indent=2))
+
+
+if __name__ == "__main__":
+    main()
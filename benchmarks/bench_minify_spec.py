@@ -0,0 +1,61 @@
+# bench_minify_spec.py
+
+"""
+Size of the generated gateway spec as is, without x-af-* extensions, and
+also without documentation, with filters inline and shared.
+
+    python -m benchmarks.bench_minify_spec --schemas 400
+"""
+
+import argparse
+import json
+
+from api_foundry.iac.gateway_spec import APISpecEditor
+from benchmarks.chinook import load_chinook
+from benchmarks.synthetic import synthetic_spec
+
+
+def _report(spec: dict, shared_parameters: bool, strip_docs: bool) -> dict:
+    editor = APISpecEditor(
+        open_api_spec=spec,
+        function=None,
+        batch_path="/batch",
+        shared_parameters=shared_parameters,
+        minify=True,
+        strip_docs=strip_docs,
+    )
+    editor.rest_api_spec()
+    return editor.minify_report()
+
+
+def run(schema_count: int) -> list[dict]:
+    results = []
+    for label, spec in (
+        ("chinook", load_chinook()),
+        (f"synthetic_{schema_count}", synthetic_spec(schema_count, properties=20)),
+    ):
+        for shared_parameters in (False, True):
+            extensions = _report(spec, shared_parameters, False)
+            docs = _report(spec, shared_parameters, True)
+            results.append(
+                {
+                    "spec": label,
+                    "shared_parameters": shared_parameters,
+                    "bytes": extensions["bytes"],
+                    "without_extensions": extensions["minified_bytes"],
+                    "without_docs": docs["minified_bytes"],
+                    "reduction": docs["saved_ratio"],
+                }
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, default=400)
+    args = parser.parse_args()
+    print(json.dumps(run(args.schemas), indent=2))
+
+
+if __name__ == "__main__":
+    main()
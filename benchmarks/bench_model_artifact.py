@@ -0,0 +1,58 @@
+# bench_model_artifact.py
+
+"""
+Cold-start load time of the compiled model: api_spec.yaml versus the
+binary model artifact.
+
+    python -m benchmarks.bench_model_artifact --schemas 1600
+"""
+
+import argparse
+import json
+import time
+
+from api_foundry.utils import model_artifact, yaml_io
+from api_foundry.utils.model_factory import ModelFactory
+from benchmarks.chinook import scaled_chinook
+
+
+def _best_of(repeat: int, func) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(schema_count: int, repeat: int) -> dict:
+    config = ModelFactory(scaled_chinook(schema_count)).get_config_output()
+    as_yaml = yaml_io.safe_dump(config)
+    as_binary = model_artifact.dump_model_artifact(config)
+    assert model_artifact.load_model_artifact(as_binary) == config
+
+    yaml_seconds = _best_of(repeat, lambda: yaml_io.safe_load(as_yaml))
+    binary_seconds = _best_of(
+        repeat, lambda: model_artifact.load_model_artifact(as_binary)
+    )
+    return {
+        "schemas": schema_count,
+        "libyaml": yaml_io.LIBYAML_AVAILABLE,
+        "yaml_bytes": len(as_yaml.encode("utf-8")),
+        "artifact_bytes": len(as_binary),
+        "yaml_load_ms": round(yaml_seconds * 1000, 1),
+        "artifact_load_ms": round(binary_seconds * 1000, 2),
+        "speedup": round(yaml_seconds / binary_seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, default=1600)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.schemas, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench_model_memory.py
+
+"""
+Retained memory of the model objects ModelFactory builds, and the cost of
+converting them back to config dicts.
+
+    python -m benchmarks.bench_model_memory --schemas 100 400 1600
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from api_foundry.utils.model_factory import ModelFactory
+from benchmarks.chinook import scaled_chinook
+
+
+def run(schema_counts: list[int]) -> list[dict]:
+    results = []
+    for count in schema_counts:
+        # Resolve refs outside the traced region so only model objects count
+        factory = ModelFactory(scaled_chinook(count), lazy=True)
+        gc.collect()
+        tracemalloc.start()
+        factory.validate_all()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        properties = sum(
+            len(obj.properties) + len(obj.relations)
+            for obj in factory.schema_objects.values()
+        )
+        start = time.perf_counter()
+        factory.get_config_output()
+        to_dict_seconds = time.perf_counter() - start
+        results.append(
+            {
+                "schemas": count,
+                "properties": properties,
+                "retained_kib": round(retained / 1024, 1),
+                "bytes_per_property": round(retained / properties),
+                "to_dict_seconds": round(to_dict_seconds, 4),
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, nargs="+", default=[100, 400, 1600])
+    args = parser.parse_args()
+    print(json.dumps(run(args.schemas), indent=2))
+
+
+if __name__ == "__main__":
+    main()
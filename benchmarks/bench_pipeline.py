@@ -0,0 +1,175 @@
+# bench_pipeline.py
+
+"""
+Time and memory of each build phase on synthetic specs.
+
+Phases are measured separately: load_api_spec (YAML file to dict, spec
+cache disabled), ModelFactory construction, get_config_output and
+APISpecEditor.rest_api_spec. Results are JSON; pass --output to save them
+and --baseline to report each phase relative to an earlier run.
+
+    python -m benchmarks.bench_pipeline --schemas 100 700 --output run.json
+    python -m benchmarks.bench_pipeline --schemas 100 700 --baseline run.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Optional
+
+from api_foundry.iac.gateway_spec import APISpecEditor
+from api_foundry.iac.pulumi.api_foundry import load_api_spec
+from api_foundry.utils import yaml_io
+from api_foundry.utils.model_factory import ModelFactory
+from benchmarks.synthetic import synthetic_spec
+
+PHASES = ("load_api_spec", "model_factory", "get_config_output", "rest_api_spec")
+
+
+def _measure(func: Callable[[], Any], repeat: int) -> tuple[Any, float, int]:
+    """Result, best wall time over `repeat` runs and peak traced bytes."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    # A separate traced run, as tracing slows the timed ones down
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def run_case(spec_path: str, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Measure every phase for the spec stored at `spec_path`."""
+    phases: Dict[str, Callable[[], Any]] = {}
+    state: Dict[str, Any] = {}
+
+    phases["load_api_spec"] = lambda: load_api_spec(spec_path)
+    phases["model_factory"] = lambda: ModelFactory(state["load_api_spec"])
+    phases["get_config_output"] = lambda: state["model_factory"].get_config_output()
+    phases["rest_api_spec"] = lambda: APISpecEditor(
+        open_api_spec=state["load_api_spec"], function=None
+    ).rest_api_spec()
+
+    results = {}
+    for phase in PHASES:
+        state[phase], seconds, peak = _measure(phases[phase], repeat)
+        results[phase] = {
+            "seconds": round(seconds, 4),
+            "peak_kib": round(peak / 1024, 1),
+        }
+    return results
+
+
+def run(
+    schema_counts: list[int],
+    properties: int,
+    relation_density: float,
+    permissions_ratio: float,
+    soft_delete_ratio: float,
+    repeat: int,
+) -> dict:
+    # Measure parsing, not the on-disk spec cache
+    os.environ["API_FOUNDRY_SPEC_CACHE"] = "0"
+    parameters = {
+        "properties": properties,
+        "relation_density": relation_density,
+        "permissions_ratio": permissions_ratio,
+        "soft_delete_ratio": soft_delete_ratio,
+        "repeat": repeat,
+    }
+    cases = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for count in schema_counts:
+            spec = synthetic_spec(
+                schemas=count,
+                properties=properties,
+                relation_density=relation_density,
+                permissions_ratio=permissions_ratio,
+                soft_delete_ratio=soft_delete_ratio,
+            )
+            spec_path = os.path.join(work_dir, f"synthetic_{count}.yaml")
+            with open(spec_path, "w", encoding="utf-8") as f:
+                yaml_io.safe_dump(spec, f, sort_keys=False)
+            cases.append(
+                {
+                    "schemas": count,
+                    "spec_bytes": os.path.getsize(spec_path),
+                    "phases": run_case(spec_path, repeat),
+                }
+            )
+    return {
+        "python": sys.version.split()[0],
+        "libyaml": yaml_io.LIBYAML_AVAILABLE,
+        "parameters": parameters,
+        "cases": cases,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list[dict]:
+    """Per case and phase, the ratio of current to baseline time and memory."""
+    previous = {case["schemas"]: case["phases"] for case in baseline["cases"]}
+    rows = []
+    for case in current["cases"]:
+        before: Optional[dict] = previous.get(case["schemas"])
+        if before is None:
+            continue
+        for phase, after in case["phases"].items():
+            if phase not in before:
+                continue
+            rows.append(
+                {
+                    "schemas": case["schemas"],
+                    "phase": phase,
+                    "seconds_ratio": round(
+                        after["seconds"] / max(before[phase]["seconds"], 1e-9), 2
+                    ),
+                    "peak_ratio": round(
+                        after["peak_kib"] / max(before[phase]["peak_kib"], 1e-9), 2
+                    ),
+                }
+            )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, nargs="+", default=[100, 400])
+    parser.add_argument("--properties", type=int, default=10)
+    parser.add_argument("--relation-density", type=float, default=0.5)
+    parser.add_argument("--permissions-ratio", type=float, default=0.5)
+    parser.add_argument("--soft-delete-ratio", type=float, default=0.2)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results JSON to this file")
+    parser.add_argument("--baseline", help="results JSON of an earlier run")
+    args = parser.parse_args()
+
+    results = run(
+        args.schemas,
+        args.properties,
+        args.relation_density,
+        args.permissions_ratio,
+        args.soft_delete_ratio,
+        args.repeat,
+    )
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            results["comparison"] = compare(results, json.load(f))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# bench_ref_resolution.py
+
+"""
+Time and memory of ModelFactory.resolve_all_refs as the spec grows.
+
+    python -m benchmarks.bench_ref_resolution --schemas 100 200 400 800
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from api_foundry.utils.model_factory import ModelFactory
+from benchmarks.chinook import scaled_chinook
+
+
+def run(schema_counts: list[int]) -> list[dict]:
+    factory = ModelFactory({})
+    results = []
+    for count in schema_counts:
+        spec = scaled_chinook(count)
+        tracemalloc.start()
+        start = time.perf_counter()
+        factory.resolve_all_refs(spec)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results.append(
+            {
+                "schemas": count,
+                "seconds": round(elapsed, 4),
+                "peak_kib": round(peak / 1024, 1),
+                "us_per_schema": round(elapsed / count * 1e6, 1),
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, nargs="+", default=[100, 200, 400, 800])
+    args = parser.parse_args()
+    print(json.dumps(run(args.schemas), indent=2))
+
+
+if __name__ == "__main__":
+    main()
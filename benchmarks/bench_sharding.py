@@ -0,0 +1,69 @@
+# bench_sharding.py
+
+"""
+Size of the model each Lambda loads, and of each gateway spec, when a
+synthetic spec spread over several databases is built as one API versus
+one API per database shard.
+
+    python -m benchmarks.bench_sharding --schemas 400 --databases 4
+"""
+
+import argparse
+import io
+import json
+import os
+
+from api_foundry.iac.gateway_spec import APISpecEditor
+from api_foundry.utils import config_writer
+from api_foundry.utils.model_compiler import compile_model
+from api_foundry.utils.sharding import partition_spec
+from benchmarks.synthetic import synthetic_spec
+
+
+def _sizes(spec: dict, crud_schemas=None) -> dict:
+    sink = io.StringIO()
+    config_writer.write_config(compile_model(spec), sink)
+    editor = APISpecEditor(open_api_spec=spec, function=None, crud_schemas=crud_schemas)
+    return {
+        "schemas": len(spec["components"]["schemas"]),
+        "model_bytes": len(sink.getvalue().encode("utf-8")),
+        "gateway_spec_bytes": len(editor.rest_api_spec().encode("utf-8")),
+    }
+
+
+def run(schema_count: int, databases: int, relation_density: float) -> dict:
+    # Measure compilation, not the on-disk model cache
+    os.environ["API_FOUNDRY_MODEL_CACHE"] = "0"
+    spec = synthetic_spec(
+        schema_count, properties=10, relation_density=relation_density
+    )
+    for index, schema in enumerate(spec["components"]["schemas"].values()):
+        schema["x-af-database"] = f"db{index % databases}"
+
+    shards = {
+        shard.name: _sizes(shard.spec, shard.schema_names)
+        for shard in partition_spec(spec, "database").values()
+    }
+    return {
+        "schemas": schema_count,
+        "databases": databases,
+        "relation_density": relation_density,
+        "single": _sizes(spec),
+        "shards": shards,
+        "largest_shard_model_bytes": max(s["model_bytes"] for s in shards.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, default=400)
+    parser.add_argument("--databases", type=int, default=4)
+    parser.add_argument("--relation-density", type=float, default=0.2)
+    args = parser.parse_args()
+    print(
+        json.dumps(run(args.schemas, args.databases, args.relation_density), indent=2)
+    )
+
+
+if __name__ == "__main__":
+    main()
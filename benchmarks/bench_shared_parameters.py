@@ -0,0 +1,55 @@
+# bench_shared_parameters.py
+
+"""
+Size of the generated gateway spec with query filters inlined in every
+operation versus defined once under components/parameters.
+
+    python -m benchmarks.bench_shared_parameters --schemas 400
+"""
+
+import argparse
+import json
+
+from api_foundry.iac.gateway_spec import APISpecEditor
+from benchmarks.chinook import load_chinook
+from benchmarks.synthetic import synthetic_spec
+
+
+def _spec_bytes(spec: dict, shared_parameters: bool) -> int:
+    editor = APISpecEditor(
+        open_api_spec=spec,
+        function=None,
+        batch_path="/batch",
+        shared_parameters=shared_parameters,
+    )
+    return len(editor.rest_api_spec().encode("utf-8"))
+
+
+def run(schema_count: int) -> list[dict]:
+    results = []
+    for label, spec in (
+        ("chinook", load_chinook()),
+        (f"synthetic_{schema_count}", synthetic_spec(schema_count, properties=20)),
+    ):
+        inline = _spec_bytes(spec, False)
+        shared = _spec_bytes(spec, True)
+        results.append(
+            {
+                "spec": label,
+                "inline_bytes": inline,
+                "shared_bytes": shared,
+                "reduction": round(1 - shared / inline, 3),
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, default=400)
+    args = parser.parse_args()
+    print(json.dumps(run(args.schemas), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench_spec_editor.py
+
+"""
+Time and peak memory of generating the gateway spec tree (without YAML
+serialization) on top of the source spec, against working on a deep
+copy of it as APISpecEditor used to.
+
+    python -m benchmarks.bench_spec_editor --schemas 100 400
+"""
+
+import argparse
+import copy
+import gc
+import json
+import time
+import tracemalloc
+
+from api_foundry.iac.gateway_spec import APISpecEditor
+from benchmarks.synthetic import synthetic_spec
+
+
+def _generate(spec: dict) -> APISpecEditor:
+    """rest_api_spec() up to, but not including, the YAML dump."""
+    editor = APISpecEditor(open_api_spec=spec, function=None, batch_path="/batch")
+    editor.process_existing_path_operations()
+    for schema_name, schema_object in spec["components"]["schemas"].items():
+        editor.generate_crud_operations(schema_name, schema_object)
+    editor.generate_batch_operation("/batch")
+    editor.correct_schema_names()
+    return editor
+
+
+def _measure(func) -> dict:
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 3), "peak_mib": round(peak / 2**20, 1)}
+
+
+def run(schema_counts: list[int]) -> list[dict]:
+    results = []
+    for count in schema_counts:
+        spec = synthetic_spec(count, properties=20, relation_density=1.0)
+        results.append(
+            {
+                "schemas": count,
+                "deepcopy": _measure(lambda: _generate(copy.deepcopy(spec))),
+                "copy_on_write": _measure(lambda: _generate(spec)),
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, nargs="+", default=[100, 400])
+    args = parser.parse_args()
+    print(json.dumps(run(args.schemas), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# bench_yaml_io.py
+
+"""
+Compare pure-Python and libyaml spec I/O on a scaled chinook spec.
+
+    python -m benchmarks.bench_yaml_io --schemas 1000
+"""
+
+import argparse
+import json
+import time
+
+import yaml
+
+from api_foundry.iac.gateway_spec import APISpecEditor
+from api_foundry.utils import yaml_io
+from api_foundry.utils.model_factory import ModelFactory
+from benchmarks.chinook import scaled_chinook
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(schema_count: int, repeat: int) -> dict:
+    spec = scaled_chinook(schema_count)
+    spec_text = yaml.dump(spec, Dumper=yaml.SafeDumper, sort_keys=False)
+    config = ModelFactory(spec).get_config_output()
+    gateway = APISpecEditor(open_api_spec=spec, function=None)
+    gateway.rest_api_spec()
+    gateway_spec = gateway.editor.openapi_spec
+
+    cases = {
+        "load_spec": (
+            lambda: yaml.load(spec_text, Loader=yaml.SafeLoader),
+            lambda: yaml_io.safe_load(spec_text),
+        ),
+        "dump_model_config": (
+            lambda: yaml.dump(config, Dumper=yaml.SafeDumper),
+            lambda: yaml_io.safe_dump(config),
+        ),
+        "dump_gateway_spec": (
+            lambda: yaml.dump(gateway_spec, Dumper=yaml.SafeDumper, sort_keys=False),
+            lambda: yaml_io.safe_dump(gateway_spec, sort_keys=False),
+        ),
+    }
+
+    results = {
+        "schemas": schema_count,
+        "spec_bytes": len(spec_text),
+        "libyaml": yaml_io.LIBYAML_AVAILABLE,
+        "cases": {},
+    }
+    for name, (pure, fast) in cases.items():
+        pure_s = best_of(repeat, pure)
+        fast_s = best_of(repeat, fast)
+        results["cases"][name] = {
+            "pure_python_s": round(pure_s, 4),
+            "yaml_io_s": round(fast_s, 4),
+            "speedup": round(pure_s / fast_s, 2) if fast_s else None,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--schemas", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.schemas, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
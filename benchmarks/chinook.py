@@ -0,0 +1,77 @@
+# chinook.py
+
+"""Scaled copies of resources/chinook_api.yaml for benchmarks."""
+
+import copy
+import os
+from typing import Any
+
+from api_foundry.utils import yaml_io
+
+CHINOOK_SPEC = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "resources",
+    "chinook_api.yaml",
+)
+
+
+def load_chinook() -> dict:
+    with open(CHINOOK_SPEC, "r", encoding="utf-8") as f:
+        spec = yaml_io.safe_load(f)
+
+    # ModelFactory supports a single primary key per schema; playlist_track
+    # declares a composite key, so keep only its first column.
+    for schema in spec["components"]["schemas"].values():
+        keys = [
+            n
+            for n, p in schema.get("properties", {}).items()
+            if "x-af-primary-key" in p
+        ]
+        for name in keys[1:]:
+            del schema["properties"][name]["x-af-primary-key"]
+    return spec
+
+
+def _rename_refs(node: Any, suffix: str, names: set) -> Any:
+    """Point $refs at the suffixed copy of their target when it exists."""
+    if isinstance(node, dict):
+        result = {}
+        for key, value in node.items():
+            if key == "$ref" and isinstance(value, str):
+                target = value.rsplit("/", 1)[-1]
+                if target in names:
+                    value = f"#/components/schemas/{target}{suffix}"
+            result[key] = _rename_refs(value, suffix, names)
+        return result
+    if isinstance(node, list):
+        return [_rename_refs(item, suffix, names) for item in node]
+    return node
+
+
+def scaled_chinook(schema_count: int) -> dict:
+    """
+    Return the chinook spec with its schemas cloned until there are
+    `schema_count` of them. Each clone set gets a numeric suffix and its
+    $refs point at schemas of the same set, so relations stay valid.
+    """
+    base = load_chinook()
+    schemas = base["components"]["schemas"]
+    scaled = {}
+    copy_index = 0
+    while len(scaled) < schema_count:
+        suffix = f"_{copy_index}" if copy_index else ""
+        # the last copy may be partial; refs to schemas it lacks stay on
+        # the original set
+        names = set(list(schemas)[: schema_count - len(scaled)])
+        for name, schema in schemas.items():
+            if len(scaled) >= schema_count:
+                break
+            clone = _rename_refs(copy.deepcopy(schema), suffix, names)
+            if suffix:
+                clone["x-af-table"] = schema.get("x-af-table", name)
+            scaled[f"{name}{suffix}"] = clone
+        copy_index += 1
+
+    spec = copy.deepcopy(base)
+    spec["components"]["schemas"] = scaled
+    return spec
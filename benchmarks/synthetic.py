@@ -0,0 +1,133 @@
+# synthetic.py
+
+"""
+Generator for synthetic OpenAPI specs of arbitrary size.
+
+Unlike the scaled chinook copies, every dimension is a parameter: the
+number of schemas, properties per schema, how densely schemas relate to
+each other, and the share of schemas carrying permissions or a soft
+delete property. Output is deterministic for a given seed.
+"""
+
+import random
+from typing import Any, Dict
+
+SCALAR_PROPERTIES = [
+    {"type": "string", "maxLength": 200},
+    {"type": "string", "format": "date-time"},
+    {"type": "integer"},
+    {"type": "number"},
+    {"type": "boolean"},
+    {"type": "string", "format": "date"},
+]
+
+SOFT_DELETE_PROPERTIES = [
+    {
+        "type": "string",
+        "format": "date-time",
+        "x-af-soft-delete": {"strategy": "null_check"},
+    },
+    {
+        "type": "boolean",
+        "x-af-soft-delete": {"strategy": "boolean_flag", "active_value": True},
+    },
+    {
+        "type": "string",
+        "x-af-soft-delete": {
+            "strategy": "exclude_values",
+            "values": ["deleted", "archived"],
+            "delete_value": "deleted",
+        },
+    },
+]
+
+
+def _schema_name(index: int) -> str:
+    return f"entity_{index:05d}"
+
+
+def _permissions(rng: random.Random) -> Dict[str, Any]:
+    """Provider-form permissions, with a row filter on some schemas."""
+    user: Dict[str, Any] = {"properties": "^(id|name|attr_.*)$"}
+    if rng.random() < 0.5:
+        user["where"] = "owner_id = ${claims.sub}"
+    return {
+        "default": {
+            "read": {"user": user, "admin": ".*"},
+            "write": {"admin": ".*"},
+            "delete": {"admin": True},
+        }
+    }
+
+
+def synthetic_spec(
+    schemas: int = 100,
+    properties: int = 10,
+    relation_density: float = 0.2,
+    permissions_ratio: float = 0.5,
+    soft_delete_ratio: float = 0.2,
+    seed: int = 0,
+) -> dict:
+    """
+    Return an OpenAPI spec with `schemas` database-backed schema objects.
+
+    Each schema has an integer primary key, a name and `properties` scalar
+    attributes. `relation_density` is the expected number of parent
+    relations per schema; each relation adds a foreign key column, a
+    many-to-one property and the matching one-to-many array on the parent.
+    `permissions_ratio` and `soft_delete_ratio` are the shares of schemas
+    with x-af-permissions and a soft delete property.
+    """
+    rng = random.Random(seed)
+    components: Dict[str, Any] = {}
+
+    for index in range(schemas):
+        name = _schema_name(index)
+        schema_properties: Dict[str, Any] = {
+            "id": {"type": "integer", "x-af-primary-key": "auto"},
+            "name": {"type": "string", "maxLength": 100},
+            "owner_id": {"type": "string"},
+        }
+        for attribute in range(properties):
+            schema_properties[f"attr_{attribute}"] = dict(
+                SCALAR_PROPERTIES[attribute % len(SCALAR_PROPERTIES)]
+            )
+        if rng.random() < soft_delete_ratio:
+            schema_properties["deleted"] = dict(rng.choice(SOFT_DELETE_PROPERTIES))
+
+        schema: Dict[str, Any] = {
+            "type": "object",
+            "x-af-database": "synthetic",
+            "properties": schema_properties,
+            "required": ["name"],
+        }
+        if rng.random() < permissions_ratio:
+            schema["x-af-permissions"] = _permissions(rng)
+        components[name] = schema
+
+    # Relations point at earlier schemas so every target exists
+    for index in range(1, schemas):
+        relation_count = int(relation_density) + (
+            rng.random() < relation_density - int(relation_density)
+        )
+        child = _schema_name(index)
+        child_properties = components[child]["properties"]
+        for parent_index in rng.sample(range(index), min(relation_count, index)):
+            parent = _schema_name(parent_index)
+            child_properties[f"{parent}_id"] = {"type": "integer"}
+            child_properties[parent] = {
+                "$ref": f"#/components/schemas/{parent}",
+                "x-af-parent-property": f"{parent}_id",
+            }
+            components[parent]["properties"][f"{child}_items"] = {
+                "type": "array",
+                "items": {"$ref": f"#/components/schemas/{child}"},
+                "x-af-child-property": f"{parent}_id",
+            }
+
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Synthetic API", "version": "1.0.0"},
+        "paths": {},
+        "components": {"schemas": components},
+    }
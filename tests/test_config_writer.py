@@ -0,0 +1,190 @@
+# test_config_writer.py
+
+import io
+
+import pytest
+
+from api_foundry.iac.pulumi import api_foundry as api_foundry_module
+from api_foundry.iac.pulumi.api_foundry import APIFoundry
+from api_foundry.utils import yaml_io
+from api_foundry.utils.config_writer import (
+    stream_model_config,
+    stream_model_config_file,
+    write_config,
+    write_config_file,
+)
+from api_foundry.utils.instrumentation import BuildInstrumentation
+from api_foundry.utils.model_factory import ModelFactory
+
+SPEC = {
+    "paths": {
+        "/album_count": {
+            "get": {
+                "x-af-database": "db",
+                "x-af-sql": "SELECT count(*) AS total\nFROM album",
+                "responses": {
+                    "200": {
+                        "content": {
+                            "application/json": {
+                                "schema": {
+                                    "type": "array",
+                                    "items": {
+                                        "properties": {"total": {"type": "integer"}}
+                                    },
+                                }
+                            }
+                        }
+                    }
+                },
+            }
+        }
+    },
+    "components": {
+        "schemas": {
+            "artist": {
+                "type": "object",
+                "x-af-database": "db",
+                "properties": {
+                    "artist_id": {"type": "integer", "x-af-primary-key": "auto"},
+                    "name": {"type": "string", "description": "Name: 'quoted'"},
+                    "album_items": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/album"},
+                        "x-af-child-property": "artist_id",
+                    },
+                },
+            },
+            "album": {
+                "type": "object",
+                "x-af-database": "db",
+                "properties": {
+                    "album_id": {"type": "integer", "x-af-primary-key": "auto"},
+                    "artist_id": {"type": "integer"},
+                    "created_by": {
+                        "type": "string",
+                        "x-af-inject-value": "claim:sub",
+                        "x-af-inject-on": ["create"],
+                    },
+                    "updated_by": {
+                        "type": "string",
+                        "x-af-inject-value": "claim:sub",
+                        "x-af-inject-on": ["create"],
+                    },
+                    "deleted_at": {
+                        "type": "string",
+                        "format": "date-time",
+                        "x-af-soft-delete": {"strategy": "null_check"},
+                    },
+                    "artist": {
+                        "$ref": "#/components/schemas/artist",
+                        "x-af-parent-property": "artist_id",
+                    },
+                },
+            },
+        }
+    },
+}
+
+
+@pytest.mark.unit
+def test_write_config_loads_as_config_output():
+    config = ModelFactory(SPEC).get_config_output()
+    sink = io.StringIO()
+    write_config(config, sink)
+
+    assert yaml_io.safe_load(sink.getvalue()) == config
+    # objects shared within an entry are repeated, not aliased
+    assert "&id" not in sink.getvalue()
+
+
+@pytest.mark.unit
+def test_stream_model_config_matches_config_output():
+    config = ModelFactory(SPEC).get_config_output()
+    factory = ModelFactory(SPEC, lazy=True)
+    sink = io.StringIO()
+    stream_model_config(factory, sink)
+
+    assert yaml_io.safe_load(sink.getvalue()) == config
+    # a lazy factory does not keep the elements it streamed
+    assert factory.schema_objects.built_count == 0
+
+
+@pytest.mark.unit
+def test_empty_sections_are_written_as_mappings():
+    sink = io.StringIO()
+    stream_model_config(ModelFactory({}), sink)
+
+    assert yaml_io.safe_load(sink.getvalue()) == {
+        "path_operations": {},
+        "schema_objects": {},
+        "sql_templates": {},
+        "relation_graph": {},
+    }
+
+
+@pytest.mark.unit
+def test_write_config_file_replaces_file(tmp_path):
+    config = ModelFactory(SPEC).get_config_output()
+    path = tmp_path / "model" / "api_spec.yaml"
+    path.parent.mkdir()
+    path.write_text("stale")
+
+    assert write_config_file(config, str(path)) == str(path)
+    assert yaml_io.safe_load(path.read_text()) == config
+    assert [p.name for p in path.parent.iterdir()] == ["api_spec.yaml"]
+
+
+@pytest.mark.unit
+def test_stream_model_config_file_counts_entries(tmp_path):
+    config = ModelFactory(SPEC).get_config_output()
+    path = tmp_path / "model" / "api_spec.yaml"
+
+    counts = stream_model_config_file(ModelFactory(SPEC, lazy=True), str(path))
+
+    assert yaml_io.safe_load(path.read_text()) == config
+    assert counts == {
+        "schema_objects": len(config["schema_objects"]),
+        "path_operations": len(config["path_operations"]),
+        "properties": sum(
+            len(s["properties"]) for s in config["schema_objects"].values()
+        ),
+    }
+
+
+@pytest.mark.unit
+def test_uncached_yaml_model_is_streamed_on_deploy(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("API_FOUNDRY_MODEL_CACHE", raising=False)
+    monkeypatch.delenv("API_FOUNDRY_MODEL_CACHE_DIR", raising=False)
+
+    def compile_model(*args):
+        raise AssertionError("the config dict should not be compiled")
+
+    monkeypatch.setattr(api_foundry_module, "compile_model", compile_model)
+    monkeypatch.setattr(
+        api_foundry_module.cloud_foundry,
+        "python_function",
+        lambda name, **settings: settings,
+    )
+    foundry = object.__new__(APIFoundry)
+    foundry.instrumentation = BuildInstrumentation()
+    foundry.functions = {}
+
+    settings = foundry._build_function(
+        "api",
+        SPEC,
+        env_vars={},
+        requirements=[],
+        policy_statements=[],
+        timeout_seconds=None,
+        vpc_config={},
+        model_format="yaml",
+    )
+
+    model_path = tmp_path / "temp" / "api" / "api_spec.yaml"
+    assert settings["sources"] == {"api_spec.yaml": f"file://{model_path}"}
+    config = ModelFactory(SPEC).get_config_output()
+    assert yaml_io.safe_load(model_path.read_text()) == config
+    counters = foundry.instrumentation.counters
+    assert counters["schemas"] == len(config["schema_objects"])
+    assert counters["model_bytes"] == model_path.stat().st_size
@@ -0,0 +1,70 @@
+# test_copy_on_write.py
+
+import copy
+
+import pytest
+
+from api_foundry.utils.copy_on_write import CopyOnWriteSpec
+
+
+def _source() -> dict:
+    shared = {"$ref": "#/components/schemas/a_b"}
+    return {
+        "paths": {"/a": {"get": {"schema": shared}}, "/b": {"get": {}}},
+        "components": {"schemas": {"a_b": {"items": [shared]}}},
+    }
+
+
+@pytest.mark.unit
+def test_writable_copies_only_the_path_written():
+    source = _source()
+    snapshot = copy.deepcopy(source)
+    cow = CopyOnWriteSpec(source)
+    root = dict(source)
+
+    node = cow.writable(root, ["paths", "/a", "get"])
+    node["post"] = {}
+
+    assert source == snapshot
+    assert root["paths"] is not source["paths"]
+    assert root["paths"]["/a"]["get"] == {
+        "schema": source["paths"]["/a"]["get"]["schema"],
+        "post": {},
+    }
+    # untouched siblings and descendants stay shared
+    assert root["paths"]["/b"] is source["paths"]["/b"]
+    assert root["components"] is source["components"]
+    assert (
+        root["paths"]["/a"]["get"]["schema"] is source["paths"]["/a"]["get"]["schema"]
+    )
+
+
+@pytest.mark.unit
+def test_writable_stops_at_missing_key():
+    source = _source()
+    cow = CopyOnWriteSpec(source)
+    root = dict(source)
+
+    node = cow.writable(root, ["paths", "/missing", "get"])
+
+    assert node is root["paths"]
+    assert node is not source["paths"]
+
+
+@pytest.mark.unit
+def test_rewrite_refs_copies_changed_source_nodes_once():
+    source = _source()
+    snapshot = copy.deepcopy(source)
+    cow = CopyOnWriteSpec(source)
+    private = {"$ref": "#/components/schemas/a_b"}
+    root = {**source, "extra": private}
+
+    cow.rewrite_refs(root, lambda ref: ref.replace("a_b", "ab"))
+
+    assert source == snapshot
+    assert private["$ref"] == "#/components/schemas/ab"
+    schema = root["paths"]["/a"]["get"]["schema"]
+    assert schema == {"$ref": "#/components/schemas/ab"}
+    # a node shared within the source is still shared after the copy
+    assert root["components"]["schemas"]["a_b"]["items"][0] is schema
+    assert root["paths"]["/b"] is source["paths"]["/b"]
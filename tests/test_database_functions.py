@@ -0,0 +1,159 @@
+# test_database_functions.py
+
+import json
+
+import pytest
+import yaml
+
+from api_foundry.iac.gateway_spec import APISpecEditor
+from api_foundry.iac.pulumi import api_foundry as api_foundry_module
+from api_foundry.iac.pulumi.api_foundry import (
+    APIFoundry,
+    database_secrets,
+    driver_requirements,
+)
+from api_foundry.utils.instrumentation import BuildInstrumentation
+from api_foundry.utils.sharding import partition_spec
+
+
+class MockFunction:
+    def __init__(self, name: str, **settings):
+        self.name = name
+        self.settings = settings
+        self.invoke_arn = f"arn:aws:lambda:us-east-1:123456789012:function:{name}"
+
+
+def _schema(database: str, engine: str) -> dict:
+    return {
+        "type": "object",
+        "x-af-database": database,
+        "x-af-engine": engine,
+        "properties": {
+            "id": {"type": "integer", "x-af-primary-key": "auto"},
+            "name": {"type": "string"},
+        },
+    }
+
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Shop", "version": "1"},
+    "paths": {
+        "/report": {
+            "get": {
+                "x-af-database": "sales",
+                "x-af-sql": "SELECT 1",
+                "responses": {"200": {"description": "ok"}},
+            }
+        }
+    },
+    "components": {
+        "schemas": {
+            "invoice": _schema("sales", "postgres"),
+            "employee": _schema("hr", "mysql"),
+        }
+    },
+}
+
+
+@pytest.mark.unit
+def test_driver_requirements():
+    assert driver_requirements(["postgres"], {}) == ["psycopg2-binary"]
+    assert driver_requirements(["postgres:data-api", "oracle"], {}) == ["cx_Oracle"]
+    assert driver_requirements(["postgres", "postgres:psycopg2"], {}) == [
+        "psycopg2-binary"
+    ]
+    # a bare dialect uses the driver configured in the Lambda environment
+    env = {"POSTGRES_DEFAULT_DRIVER": "data-api"}
+    assert driver_requirements(["postgres"], env) == []
+
+
+@pytest.mark.unit
+def test_database_secrets():
+    secrets_map = {"sales": "arn:sales", "hr": "arn:hr"}
+    assert database_secrets(secrets_map, ["Sales"]) == {"sales": "arn:sales"}
+    assert database_secrets(secrets_map, ["hr", "missing"]) == {"hr": "arn:hr"}
+
+
+@pytest.mark.unit
+def test_attribute_values():
+    shards = partition_spec(SPEC, "database")
+    assert shards["sales"].attribute_values("x-af-database") == ["sales"]
+    assert shards["sales"].attribute_values("x-af-engine") == ["postgres"]
+    assert shards["hr"].attribute_values("x-af-engine") == ["mysql"]
+
+
+@pytest.mark.unit
+def test_operations_route_to_database_functions():
+    default, sales, hr = MockFunction("api"), MockFunction("sales"), MockFunction("hr")
+    editor = APISpecEditor(
+        open_api_spec=SPEC,
+        function=default,
+        batch_path="/batch",
+        database_functions={"sales": sales, "hr": hr},
+    )
+    editor.rest_api_spec()
+
+    functions = {
+        (integration["path"], integration["method"]): integration["function"]
+        for integration in editor.integrations
+    }
+    assert functions[("/report", "get")] is sales
+    assert functions[("/invoice", "get")] is sales
+    assert functions[("/employee/{id}", "delete")] is hr
+    assert functions[("/batch", "post")] is default
+
+
+@pytest.mark.unit
+def test_database_function_gets_trimmed_config(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("API_FOUNDRY_MODEL_CACHE", "0")
+    monkeypatch.setattr(
+        api_foundry_module.cloud_foundry,
+        "python_function",
+        lambda name, **settings: MockFunction(name, **settings),
+    )
+    foundry = object.__new__(APIFoundry)
+    foundry.instrumentation = BuildInstrumentation()
+    foundry.functions = {}
+
+    secrets_statement = {
+        "Effect": "Allow",
+        "Actions": ["secretsmanager:GetSecretValue"],
+        "Resources": ["arn:sales", "arn:hr"],
+    }
+    other_statement = {"Effect": "Allow", "Actions": ["s3:GetObject"], "Resources": "*"}
+    hr = partition_spec(SPEC, "database")["hr"]
+    functions = foundry._database_function(
+        "shop",
+        hr,
+        {"hr": {"memory_size": 256, "timeout": 10}},
+        secrets_map={"sales": "arn:sales", "hr": "arn:hr"},
+        secrets_statement=secrets_statement,
+        env_vars={"SECRETS": "...", "POSTGRES_DEFAULT_DRIVER": "data-api"},
+        requirements=["psycopg2-binary", "pyyaml", "api_foundry_query_engine"],
+        policy_statements=[other_statement, secrets_statement],
+        timeout_seconds=None,
+        vpc_config={},
+        model_format="yaml",
+    )
+
+    function = functions["hr"]
+    assert function.name == "shop-hr" and foundry.functions == {"shop-hr": function}
+    settings = function.settings
+    assert json.loads(settings["environment"]["SECRETS"]) == {"hr": "arn:hr"}
+    assert settings["policy_statements"] == [
+        other_statement,
+        {**secrets_statement, "Resources": ["arn:hr"]},
+    ]
+    assert settings["requirements"] == [
+        "mysqlclient",
+        "pyyaml",
+        "api_foundry_query_engine",
+    ]
+    assert settings["memory_size"] == 256 and settings["timeout"] == 10
+
+    with open(tmp_path / "temp" / "shop-hr" / "api_spec.yaml") as f:
+        model = yaml.safe_load(f)
+    assert set(model["schema_objects"]) == {"employee"}
+    assert model["path_operations"] == {}
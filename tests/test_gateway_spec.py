@@ -1,11 +1,13 @@
 # test_gateway_spec.py
 
+import copy
 import re
 import pytest
 from typing import Any
 from cloud_foundry import logger
 
-from api_foundry.iac.gateway_spec import APISpecEditor
+from api_foundry.iac.gateway_spec import APISpecEditor, SchemaAnalysis
+from api_foundry.utils import yaml_io
 
 log = logger(__name__)
 
@@ -764,6 +766,250 @@ class TestGatewaySpec:
         assert result is None
 
 
+@pytest.mark.unit
+def test_batch_operation_edits_spec_in_place():
+    spec = {
+        "openapi": "3.0.0",
+        "paths": {"/ping": {"get": {"responses": {"200": {"description": "ok"}}}}},
+        "components": {"schemas": {"BatchRequest": {"type": "string"}}},
+    }
+    spec_editor = APISpecEditor(open_api_spec=spec, function=MockFunction("url"))
+    openapi_spec = spec_editor.editor.openapi_spec
+
+    spec_editor.generate_batch_operation("/batch")
+
+    # the spec tree is edited, not re-parsed into a new editor
+    assert spec_editor.editor.openapi_spec is openapi_spec
+    schemas = openapi_spec["components"]["schemas"]
+    assert {
+        "BatchRequest",
+        "BatchOperation",
+        "BatchResponse",
+        "OperationError",
+        "ErrorResponse",
+    } <= set(schemas)
+    assert schemas["BatchRequest"]["type"] == "object"
+    assert list(openapi_spec["paths"]) == ["/ping", "/batch"]
+    assert "post" in openapi_spec["paths"]["/batch"]
+
+
+@pytest.mark.unit
+def test_add_component_schemas_copies_definitions():
+    spec_editor = APISpecEditor(open_api_spec=None, function=None)
+    definition = {"type": "object", "properties": {"id": {"type": "integer"}}}
+
+    spec_editor.add_component_schemas({"A": definition, "B": definition})
+
+    schemas = spec_editor.editor.get_spec_part(["components", "schemas"])
+    assert schemas["A"] == schemas["B"] == definition
+    assert schemas["A"] is not definition
+    assert schemas["A"] is not schemas["B"]
+    # copies keep the serialized spec free of YAML anchors
+    assert "&id" not in spec_editor.spec_yaml()
+
+
+@pytest.mark.unit
+def test_shared_query_parameters_match_inline(chinook_api_model):
+    def generate(shared: bool) -> dict:
+        spec_editor = APISpecEditor(
+            open_api_spec=chinook_api_model,
+            function=MockFunction("url"),
+            shared_parameters=shared,
+        )
+        spec_editor.rest_api_spec()
+        return spec_editor.editor.openapi_spec
+
+    inline = generate(False)
+    shared = generate(True)
+    components = shared["components"]["parameters"]
+
+    operations = shared["paths"]["/media_type"]
+    refs = [p["$ref"] for p in operations["get"]["parameters"]]
+    assert refs == [
+        "#/components/parameters/mediatypemediatypeidFilter",
+        "#/components/parameters/mediatypenameFilter",
+    ]
+    # GET, PUT and DELETE many share the same definitions
+    for method in ("put", "delete"):
+        assert operations[method]["parameters"] == [{"$ref": ref} for ref in refs]
+
+    for path, methods in inline["paths"].items():
+        for method, operation in methods.items():
+            if "parameters" not in operation:
+                continue
+            resolved = [
+                components[p["$ref"].rsplit("/", 1)[-1]] if "$ref" in p else p
+                for p in shared["paths"][path][method]["parameters"]
+            ]
+            assert resolved == operation["parameters"]
+
+
+@pytest.mark.unit
+def test_shared_parameter_names_do_not_clash():
+    spec_editor = APISpecEditor(
+        open_api_spec={
+            "components": {"parameters": {"aFilter": {"in": "query", "name": "x"}}}
+        },
+        function=None,
+        shared_parameters=True,
+    )
+    schema = {"properties": {"": {"type": "string"}, "b_c": {"type": "string"}}}
+
+    first = spec_editor.generate_query_parameters(schema, "a")
+    second = spec_editor.generate_query_parameters(
+        {"properties": {"c": {"type": "string"}}}, "a_b"
+    )
+    again = spec_editor.generate_query_parameters(schema, "a")
+
+    assert first == [
+        {"$ref": "#/components/parameters/aFilter2"},
+        {"$ref": "#/components/parameters/abcFilter"},
+    ]
+    assert second == [{"$ref": "#/components/parameters/abcFilter2"}]
+    assert again == first
+    parameters = spec_editor.editor.get_spec_part(["components", "parameters"])
+    assert parameters["aFilter"] == {"in": "query", "name": "x"}
+
+
+@pytest.mark.unit
+def test_generate_regex_reuses_patterns_by_signature():
+    spec_editor = APISpecEditor(open_api_spec={}, function=None)
+
+    first = spec_editor.generate_regex({"type": "integer", "description": "a"})
+    second = spec_editor.generate_regex({"type": "integer", "minimum": 5})
+    unsigned = spec_editor.generate_regex({"type": "integer", "signed": False})
+
+    assert second is first
+    assert unsigned != first
+    assert spec_editor.regex_patterns == {
+        ("integer", None, None, None, None, None): first,
+        ("integer", None, None, None, None, False): unsigned,
+    }
+    # failures are not cached
+    for _ in range(2):
+        with pytest.raises(KeyError):
+            spec_editor.generate_regex({"format": "date"})
+
+
+@pytest.mark.unit
+def test_rest_api_spec_leaves_source_spec_unchanged(chinook_api_model):
+    spec = copy.deepcopy(chinook_api_model)
+    spec["paths"] = {"/ping": {"get": {"responses": {"200": {"description": "ok"}}}}}
+    spec["components"]["schemas"]["ping_result"] = {
+        "type": "object",
+        "properties": {"album": {"$ref": "#/components/schemas/album"}},
+    }
+    snapshot = copy.deepcopy(spec)
+
+    generated = APISpecEditor(
+        open_api_spec=spec, function=MockFunction("url"), shared_parameters=True
+    ).rest_api_spec()
+
+    assert spec == snapshot
+    # the same spec as one generated from a private deep copy
+    assert (
+        APISpecEditor(
+            open_api_spec=copy.deepcopy(spec),
+            function=MockFunction("url"),
+            shared_parameters=True,
+        ).rest_api_spec()
+        == generated
+    )
+    result = yaml_io.safe_load(generated)
+    assert "pingresult" in result["components"]["schemas"]
+    assert set(result["paths"]["/ping"]) == {"get"}
+
+
+@pytest.mark.unit
+def test_schema_analysis_resolves_properties_once():
+    schema_object = {
+        "required": ["name", "status"],
+        "x-af-concurrency-control": "version",
+        "properties": {
+            "id": {"type": "integer", "x-af-primary-key": "auto"},
+            "name": {"type": "string"},
+            "status": {"$ref": "#/components/schemas/status"},
+            "version": {"type": "integer"},
+            "parent": {
+                "$ref": "#/components/schemas/parent",
+                "x-af-parent-property": "parent_id",
+            },
+        },
+    }
+    lookups = []
+
+    def resolve(keys):
+        lookups.append(keys)
+        return {"type": "string", "enum": ["on", "off"]}
+
+    analysis = SchemaAnalysis(schema_object, resolve)
+
+    assert analysis.primary_key == ("id", schema_object["properties"]["id"])
+    assert analysis.concurrency_property[0] == "version"
+    assert lookups == [
+        ["components", "schemas", "status"],
+        ["components", "schemas", "parent"],
+    ]
+    first = analysis.input_properties()
+    assert list(first) == ["name", "status"]
+    assert first["status"] == {"type": "string", "enum": ["on", "off"]}
+    assert list(analysis.input_properties(include_primary_key=True)) == [
+        "id",
+        "name",
+        "status",
+    ]
+    # merged $ref properties are not shared between operations
+    assert analysis.input_properties()["status"] is not first["status"]
+    assert analysis.required_properties(first) == ["name", "status"]
+    assert len(lookups) == 2
+
+
+@pytest.mark.unit
+def test_crud_generators_share_one_analysis(chinook_api_model):
+    spec_editor = APISpecEditor(open_api_spec=chinook_api_model, function=None)
+    schema_object = chinook_api_model["components"]["schemas"]["album"]
+
+    spec_editor.generate_crud_operations("album", schema_object)
+
+    assert list(spec_editor.schema_analyses) == [id(schema_object)]
+    analysis = spec_editor.analyze(schema_object)
+    assert analysis.filters is not None
+    assert [name for name, _, _ in analysis.filters] == [
+        p["name"]
+        for p in spec_editor.editor.openapi_spec["paths"]["/album"]["get"]["parameters"]
+    ]
+
+
+@pytest.mark.unit
+def test_minified_rest_api_spec(chinook_api_model):
+    snapshot = copy.deepcopy(chinook_api_model)
+    full = APISpecEditor(
+        open_api_spec=chinook_api_model, function=MockFunction("url")
+    ).rest_api_spec()
+    spec_editor = APISpecEditor(
+        open_api_spec=chinook_api_model,
+        function=MockFunction("url"),
+        strip_docs=True,
+    )
+
+    minified = spec_editor.rest_api_spec()
+
+    assert chinook_api_model == snapshot
+    assert "x-af-" in full and "x-af-" not in minified
+    assert spec_editor.minify
+    result = yaml_io.safe_load(minified)
+    operation = result["paths"]["/album"]["get"]
+    assert "summary" not in operation
+    assert "description" in operation["responses"]["200"]
+    assert set(result["paths"]) == set(yaml_io.safe_load(full)["paths"])
+    assert spec_editor.minify_report() == {
+        "bytes": len(full),
+        "minified_bytes": len(minified),
+        "saved_bytes": len(full) - len(minified),
+        "saved_ratio": round(1 - len(minified) / len(full), 4),
+    }
+
+
 class MockFunction:
     """
     Minimal stand‑in for a deployed cloud_foundry Function used by APISpecEditor.
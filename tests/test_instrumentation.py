@@ -0,0 +1,105 @@
+# test_instrumentation.py
+
+import pstats
+
+import pytest
+
+from api_foundry.utils.instrumentation import (
+    PROFILE_DIR_ENV,
+    BuildInstrumentation,
+    profiled,
+)
+from api_foundry.utils.model_compiler import compile_model
+
+SPEC = {
+    "components": {
+        "schemas": {
+            "artist": {
+                "type": "object",
+                "x-af-database": "db",
+                "properties": {
+                    "artist_id": {"type": "integer", "x-af-primary-key": "auto"},
+                    "name": {"type": "string"},
+                },
+            },
+            "album": {
+                "type": "object",
+                "x-af-database": "db",
+                "properties": {
+                    "album_id": {"type": "integer", "x-af-primary-key": "auto"},
+                    "artist_id": {"type": "integer"},
+                    "artist": {
+                        "$ref": "#/components/schemas/artist",
+                        "x-af-parent-property": "artist_id",
+                    },
+                },
+            },
+        }
+    }
+}
+
+
+@pytest.mark.unit
+def test_phases_are_timed_and_reported_to_callback():
+    events = []
+    instrumentation = BuildInstrumentation(
+        on_phase=lambda name, seconds, counters: events.append((name, counters))
+    )
+
+    with instrumentation.phase("load_spec"):
+        instrumentation.count("schemas", 2)
+    with pytest.raises(RuntimeError):
+        with instrumentation.phase("compile_model"):
+            instrumentation.count("schemas")
+            raise RuntimeError("boom")
+
+    # a failing phase is still recorded
+    assert events == [("load_spec", {"schemas": 2}), ("compile_model", {"schemas": 3})]
+    report = instrumentation.report()
+    assert list(report["phases"]) == ["load_spec", "compile_model"]
+    assert report["counters"] == {"schemas": 3}
+    assert report["total_seconds"] >= 0
+
+
+@pytest.mark.unit
+def test_compile_model_records_counters(monkeypatch, tmp_path):
+    monkeypatch.setenv("API_FOUNDRY_MODEL_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("API_FOUNDRY_MODEL_CACHE", raising=False)
+
+    first = BuildInstrumentation()
+    compile_model(SPEC, first)
+    assert first.counters == {
+        "refs_resolved": 1,
+        "entries_rebuilt": 2,
+        "entries_reused": 0,
+    }
+
+    second = BuildInstrumentation()
+    compile_model(SPEC, second)
+    assert second.counters == {
+        "refs_resolved": 0,
+        "entries_rebuilt": 0,
+        "entries_reused": 2,
+    }
+
+    monkeypatch.setenv("API_FOUNDRY_MODEL_CACHE", "0")
+    uncached = BuildInstrumentation()
+    compile_model(SPEC, uncached)
+    assert uncached.counters["entries_rebuilt"] == 2
+    assert uncached.counters["refs_resolved"] == 1
+
+
+@pytest.mark.unit
+def test_profile_written_only_when_enabled(monkeypatch, tmp_path):
+    monkeypatch.setenv("API_FOUNDRY_MODEL_CACHE", "0")
+    monkeypatch.delenv(PROFILE_DIR_ENV, raising=False)
+    with profiled("api") as profiler:
+        assert profiler is None
+
+    monkeypatch.setenv(PROFILE_DIR_ENV, str(tmp_path / "profiles"))
+    with profiled("api") as profiler:
+        assert profiler is not None
+        compile_model(SPEC)
+
+    stats = pstats.Stats(str(tmp_path / "profiles" / "api.pstats"))
+    assert any(name == "compile_model" for _, _, name in stats.stats)
@@ -0,0 +1,268 @@
+# test_load_api_spec.py
+
+import datetime
+import hashlib
+import os
+import pickle
+import threading
+
+import pytest
+import yaml
+
+from api_foundry.iac.pulumi import api_foundry as api_foundry_module
+from api_foundry.iac.pulumi.api_foundry import load_api_spec
+from api_foundry.utils.spec_cache import SpecCache
+
+
+class FakeBody:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def read(self) -> bytes:
+        return self.content
+
+
+class FakePaginator:
+    def __init__(self, client, page_size: int):
+        self.client = client
+        self.page_size = page_size
+
+    def paginate(self, Bucket: str, Prefix: str):
+        keys = sorted(
+            k for (b, k) in self.client.objects if b == Bucket and k.startswith(Prefix)
+        )
+        for start in range(0, len(keys), self.page_size):
+            end = start + self.page_size
+            self.client.list_calls += 1
+            yield {
+                "Contents": [
+                    {"Key": k, "ETag": self.client.etag(Bucket, k)}
+                    for k in keys[start:end]
+                ]
+            }
+
+
+class FakeS3:
+    """In-memory stand-in for a boto3 S3 client."""
+
+    def __init__(self, objects: dict, page_size: int = 2):
+        self.objects = objects
+        self.page_size = page_size
+        self.list_calls = 0
+        self.get_calls = []
+        self.head_calls = []
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def get_paginator(self, name: str):
+        assert name == "list_objects_v2"
+        return FakePaginator(self, self.page_size)
+
+    def etag(self, bucket: str, key: str) -> str:
+        content = self.objects[(bucket, key)].encode("utf-8")
+        return '"' + hashlib.md5(content).hexdigest() + '"'
+
+    def head_object(self, Bucket: str, Key: str):
+        with self.lock:
+            self.head_calls.append(Key)
+        return {"ETag": self.etag(Bucket, Key)}
+
+    def get_object(self, Bucket: str, Key: str):
+        with self.lock:
+            self.get_calls.append(Key)
+            self.threads.add(threading.get_ident())
+        return {
+            "Body": FakeBody(self.objects[(Bucket, Key)].encode("utf-8")),
+            "ETag": self.etag(Bucket, Key),
+        }
+
+
+def fragment(title: str, schema: str) -> str:
+    return yaml.safe_dump(
+        {
+            "openapi": "3.0.0",
+            "info": {"title": title},
+            "components": {"schemas": {schema: {"type": "object"}}},
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def spec_cache_dir(monkeypatch, tmp_path):
+    cache_dir = tmp_path / "spec_cache"
+    monkeypatch.setenv("API_FOUNDRY_SPEC_CACHE_DIR", str(cache_dir))
+    monkeypatch.delenv("API_FOUNDRY_SPEC_CACHE", raising=False)
+    return cache_dir
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+    objects = {
+        ("specs", "api/c.yaml"): fragment("c", "gamma"),
+        ("specs", "api/a.yaml"): fragment("a", "alpha"),
+        ("specs", "api/b.yml"): fragment("b", "beta"),
+        ("specs", "api/readme.txt"): "not a spec",
+        ("specs", "api/d.yaml"): fragment("d", "delta"),
+        ("specs", "api/e.yaml"): fragment("e", "epsilon"),
+    }
+    client = FakeS3(objects)
+    created = []
+
+    def _client(service):
+        assert service == "s3"
+        created.append(client)
+        return client
+
+    monkeypatch.setattr(api_foundry_module.boto3, "client", _client)
+    client.created = created
+    return client
+
+
+@pytest.mark.unit
+def test_s3_prefix_is_paginated_and_merged_in_sorted_order(fake_s3):
+    spec = load_api_spec("s3://specs/api/")
+
+    # later documents win on conflicts, so the last sorted key supplies info
+    assert spec["info"] == {"title": "e"}
+    assert spec["components"]["schemas"] == {"epsilon": {"type": "object"}}
+    assert fake_s3.list_calls == 3
+    assert sorted(fake_s3.get_calls) == [
+        "api/a.yaml",
+        "api/b.yml",
+        "api/c.yaml",
+        "api/d.yaml",
+        "api/e.yaml",
+    ]
+
+
+@pytest.mark.unit
+def test_s3_fetches_share_one_client(fake_s3):
+    load_api_spec(["s3://specs/api/", "s3://specs/api/a.yaml"])
+
+    assert len(fake_s3.created) == 1
+    # the explicit key duplicates a prefix entry and is only fetched once
+    assert len(fake_s3.get_calls) == 5
+
+
+@pytest.mark.unit
+def test_s3_fetch_respects_max_workers(fake_s3):
+    spec = load_api_spec("s3://specs/api/", max_workers=1)
+
+    assert len(fake_s3.threads) == 1
+    assert spec["info"] == {"title": "e"}
+
+
+@pytest.mark.unit
+def test_local_sources_do_not_create_s3_client(fake_s3, tmp_path):
+    spec_dir = tmp_path / "specs"
+    spec_dir.mkdir()
+    (spec_dir / "a.yaml").write_text(fragment("a", "alpha"))
+    spec = load_api_spec(str(spec_dir))
+
+    assert spec["info"] == {"title": "a"}
+    assert fake_s3.created == []
+
+
+@pytest.mark.unit
+def test_unchanged_s3_objects_load_from_cache(fake_s3):
+    first = load_api_spec("s3://specs/api/")
+    fake_s3.get_calls.clear()
+
+    second = load_api_spec("s3://specs/api/")
+
+    assert second == first
+    # ETags come from the listing, so a warm cache needs no GET or HEAD
+    assert fake_s3.get_calls == []
+    assert fake_s3.head_calls == []
+
+
+@pytest.mark.unit
+def test_changed_s3_object_is_refetched(fake_s3):
+    load_api_spec("s3://specs/api/")
+    fake_s3.get_calls.clear()
+    fake_s3.objects[("specs", "api/e.yaml")] = fragment("e2", "epsilon")
+
+    spec = load_api_spec(["s3://specs/api/e.yaml"])
+
+    assert spec["info"] == {"title": "e2"}
+    assert fake_s3.head_calls == ["api/e.yaml"]
+    assert fake_s3.get_calls == ["api/e.yaml"]
+
+
+@pytest.mark.unit
+def test_local_file_cache_keyed_by_content(spec_cache_dir, tmp_path, monkeypatch):
+    spec_file = tmp_path / "api.yaml"
+    spec_file.write_text(fragment("a", "alpha"))
+    load_api_spec(str(spec_file))
+    assert len(os.listdir(spec_cache_dir)) == 1
+
+    parses = []
+    original = api_foundry_module.yaml_io.safe_load
+
+    def _counting_safe_load(stream):
+        parses.append(stream)
+        return original(stream)
+
+    monkeypatch.setattr(api_foundry_module.yaml_io, "safe_load", _counting_safe_load)
+    assert load_api_spec(str(spec_file))["info"] == {"title": "a"}
+    assert parses == []
+
+    spec_file.write_text(fragment("b", "beta"))
+    assert load_api_spec(str(spec_file))["info"] == {"title": "b"}
+    assert len(parses) == 1
+
+
+@pytest.mark.unit
+def test_spec_cache_can_be_disabled(fake_s3, spec_cache_dir, monkeypatch):
+    monkeypatch.setenv("API_FOUNDRY_SPEC_CACHE", "0")
+
+    load_api_spec("s3://specs/api/")
+    load_api_spec("s3://specs/api/")
+
+    assert not spec_cache_dir.exists()
+    assert len(fake_s3.get_calls) == 10
+
+
+@pytest.mark.unit
+def test_spec_cache_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("API_FOUNDRY_SPEC_CACHE_DIR", raising=False)
+    spec_file = tmp_path / "api.yaml"
+    spec_file.write_text(fragment("a", "alpha"))
+
+    assert load_api_spec(str(spec_file))["info"] == {"title": "a"}
+    assert not (tmp_path / "temp").exists()
+
+    monkeypatch.setenv("API_FOUNDRY_SPEC_CACHE", "on")
+    load_api_spec(str(spec_file))
+    assert (tmp_path / "temp" / "spec_cache").exists()
+
+
+@pytest.mark.unit
+def test_spec_cache_refuses_arbitrary_objects(tmp_path):
+    cache = SpecCache(directory=str(tmp_path))
+    (tmp_path / "evil.pickle").write_bytes(pickle.dumps(threading.Lock))
+    cache.put("dated", {"released": datetime.date(2020, 1, 1)})
+
+    assert cache.get("evil") is None
+    assert not (tmp_path / "evil.pickle").exists()
+    assert cache.get("dated") == {"released": datetime.date(2020, 1, 1)}
+
+
+@pytest.mark.unit
+def test_spec_cache_evicts_least_recently_used(tmp_path):
+    cache = SpecCache(directory=str(tmp_path), max_bytes=10**9)
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, {"payload": "x" * 1000})
+        path = tmp_path / f"{key}.pickle"
+        os.utime(path, (1000 + i, 1000 + i))
+    size = (tmp_path / "a.pickle").stat().st_size
+
+    # reading "a" makes it the most recently used entry
+    assert cache.get("a") == {"payload": "x" * 1000}
+    cache.max_bytes = 2 * size
+
+    assert cache.prune() == 1
+    assert sorted(os.listdir(tmp_path)) == ["a.pickle", "c.pickle"]
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,113 @@
+# test_model_artifact.py
+
+import pickle
+import struct
+
+import pytest
+import yaml
+
+from api_foundry.utils.app_exception import ApplicationException
+from api_foundry.utils.model_artifact import (
+    MAGIC,
+    MODEL_ARTIFACT_VERSION,
+    dump_model_artifact,
+    load_model_artifact,
+    write_model_artifact,
+)
+from api_foundry.utils.model_factory import ModelFactory
+
+SPEC = {
+    "openapi": "3.0.0",
+    "components": {
+        "schemas": {
+            "album": {
+                "type": "object",
+                "x-af-database": "chinook",
+                "properties": {
+                    "album_id": {"type": "integer", "x-af-primary-key": "auto"},
+                    "title": {"type": "string", "maxLength": 160},
+                },
+            }
+        }
+    },
+}
+
+
+@pytest.mark.unit
+def test_model_artifact_round_trip(tmp_path):
+    config = ModelFactory(SPEC).get_config_output()
+
+    assert load_model_artifact(dump_model_artifact(config)) == config
+
+    path = write_model_artifact(config, str(tmp_path / "model" / "api_model.bin"))
+    loaded = load_model_artifact(path)
+    assert loaded == config
+    assert list(loaded["schema_objects"]["album"]) == list(
+        config["schema_objects"]["album"]
+    )
+
+
+@pytest.mark.unit
+def test_model_artifact_rejects_foreign_data():
+    with pytest.raises(ApplicationException) as exc:
+        load_model_artifact(b"schema_objects: {}\n")
+    assert exc.value.message == "Data is not an API Foundry model artifact"
+
+    with pytest.raises(ApplicationException) as exc:
+        load_model_artifact(MAGIC)
+    assert exc.value.message == "Model artifact is truncated"
+
+
+@pytest.mark.unit
+def test_model_artifact_rejects_other_versions():
+    data = bytearray(dump_model_artifact({"schema_objects": {}}))
+    struct.pack_into(">H", data, len(MAGIC), MODEL_ARTIFACT_VERSION + 1)
+
+    with pytest.raises(ApplicationException) as exc:
+        load_model_artifact(bytes(data))
+    assert "Unsupported model artifact version" in exc.value.message
+
+
+@pytest.mark.unit
+def test_model_artifact_refuses_arbitrary_objects():
+    header = struct.pack(">8sH", MAGIC, MODEL_ARTIFACT_VERSION)
+    payload = pickle.dumps({"schema_objects": ApplicationException(500, "x")})
+
+    with pytest.raises(ApplicationException) as exc:
+        load_model_artifact(header + payload)
+    assert "disallowed global" in exc.value.message
+
+
+@pytest.mark.unit
+def test_model_artifact_round_trips_date_defaults(tmp_path):
+    spec = yaml.safe_load(
+        """
+components:
+    schemas:
+        album:
+            type: object
+            x-af-database: chinook
+            properties:
+                album_id:
+                    type: integer
+                    x-af-primary-key: auto
+                released:
+                    type: string
+                    format: date
+                    default: 2020-01-01
+"""
+    )
+    config = ModelFactory(spec).get_config_output()
+
+    path = write_model_artifact(config, str(tmp_path / "api_model.bin"))
+    assert load_model_artifact(path) == config
+
+
+@pytest.mark.unit
+def test_model_artifact_write_fails_when_unloadable(tmp_path):
+    path = tmp_path / "api_model.bin"
+    config = {"schema_objects": {"album": ApplicationException(500, "x")}}
+
+    with pytest.raises(ApplicationException):
+        write_model_artifact(config, str(path))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,158 @@
+# test_model_compiler.py
+
+import copy
+
+import pytest
+
+from api_foundry.utils import model_factory
+from api_foundry.utils.model_compiler import IncrementalModelCompiler, compile_model
+from api_foundry.utils.model_factory import ModelFactory
+
+SPEC = {
+    "openapi": "3.0.0",
+    "paths": {
+        "/top_albums": {
+            "get": {
+                "x-af-database": "chinook",
+                "x-af-sql": "SELECT * FROM album",
+            }
+        }
+    },
+    "components": {
+        "schemas": {
+            "artist": {
+                "type": "object",
+                "x-af-database": "chinook",
+                "properties": {
+                    "artist_id": {"type": "integer", "x-af-primary-key": "auto"},
+                    "name": {"type": "string"},
+                },
+            },
+            "album": {
+                "type": "object",
+                "x-af-database": "chinook",
+                "properties": {
+                    "album_id": {"type": "integer", "x-af-primary-key": "auto"},
+                    "artist": {
+                        "$ref": "#/components/schemas/artist",
+                        "x-af-parent-property": "artist_id",
+                    },
+                },
+            },
+            "genre": {
+                "type": "object",
+                "x-af-database": "chinook",
+                "properties": {
+                    "genre_id": {"type": "integer", "x-af-primary-key": "auto"},
+                },
+            },
+        }
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def model_cache_dir(monkeypatch, tmp_path):
+    cache_dir = tmp_path / "model_cache"
+    monkeypatch.setenv("API_FOUNDRY_MODEL_CACHE_DIR", str(cache_dir))
+    monkeypatch.delenv("API_FOUNDRY_MODEL_CACHE", raising=False)
+    return cache_dir
+
+
+@pytest.mark.unit
+def test_incremental_compile_matches_full_compile():
+    compiler = IncrementalModelCompiler()
+    expected = ModelFactory(SPEC).get_config_output()
+
+    assert compiler.compile(SPEC) == expected
+    assert compiler.report()["reused"] == []
+    assert len(compiler.rebuilt) == 4
+
+    assert compiler.compile(SPEC) == expected
+    assert compiler.rebuilt == []
+    assert compiler.reused == [
+        "schema_objects/artist",
+        "schema_objects/album",
+        "schema_objects/genre",
+        "path_operations/top_albums_read",
+    ]
+
+
+@pytest.mark.unit
+def test_changed_ref_target_rebuilds_referencing_schemas():
+    IncrementalModelCompiler().compile(SPEC)
+
+    spec = copy.deepcopy(SPEC)
+    artist = spec["components"]["schemas"]["artist"]
+    artist["properties"]["country"] = {"type": "string"}
+    compiler = IncrementalModelCompiler()
+    config = compiler.compile(spec)
+
+    # album embeds the artist definition through its $ref
+    assert compiler.rebuilt == ["schema_objects/artist", "schema_objects/album"]
+    assert "schema_objects/genre" in compiler.reused
+    assert config == ModelFactory(spec).get_config_output()
+
+
+@pytest.mark.unit
+def test_property_order_change_is_rebuilt():
+    IncrementalModelCompiler().compile(SPEC)
+
+    spec = copy.deepcopy(SPEC)
+    properties = spec["components"]["schemas"]["artist"]["properties"]
+    spec["components"]["schemas"]["artist"]["properties"] = dict(
+        reversed(list(properties.items()))
+    )
+    compiler = IncrementalModelCompiler()
+    config = compiler.compile(spec)
+
+    assert "schema_objects/artist" in compiler.rebuilt
+    assert list(config["schema_objects"]["artist"]["properties"]) == [
+        "name",
+        "artist_id",
+    ]
+
+
+@pytest.mark.unit
+def test_model_cache_can_be_disabled(monkeypatch, model_cache_dir):
+    monkeypatch.setenv("API_FOUNDRY_MODEL_CACHE", "off")
+
+    assert compile_model(SPEC) == ModelFactory(SPEC).get_config_output()
+    assert not model_cache_dir.exists()
+
+
+@pytest.mark.unit
+def test_model_cache_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("API_FOUNDRY_MODEL_CACHE", raising=False)
+    monkeypatch.delenv("API_FOUNDRY_MODEL_CACHE_DIR", raising=False)
+
+    assert compile_model(SPEC) == ModelFactory(SPEC).get_config_output()
+    assert list(tmp_path.iterdir()) == []
+
+    monkeypatch.setenv("API_FOUNDRY_MODEL_CACHE", "on")
+    compile_model(SPEC)
+    assert (tmp_path / "temp" / "model_cache").exists()
+
+
+@pytest.mark.unit
+def test_schema_aliases_compile_like_model_factory():
+    spec = copy.deepcopy(SPEC)
+    spec["components"]["schemas"]["performer"] = {"$ref": "#/components/schemas/artist"}
+    compiler = IncrementalModelCompiler()
+
+    config = compiler.compile(spec)
+
+    assert config == ModelFactory(spec).get_config_output()
+    assert "schema_objects/performer" in compiler.rebuilt
+
+
+@pytest.mark.unit
+def test_parallel_incremental_compile_matches_serial(monkeypatch, tmp_path):
+    monkeypatch.setattr(model_factory, "PARALLEL_MIN_SCHEMAS", 1)
+
+    parallel = IncrementalModelCompiler(str(tmp_path / "parallel"), workers=2)
+    serial = IncrementalModelCompiler(str(tmp_path / "serial"))
+
+    assert parallel.compile(SPEC) == serial.compile(SPEC)
+    assert parallel.rebuilt == serial.rebuilt
@@ -4,6 +4,7 @@ import os
 import yaml
 import pytest
 from api_foundry.utils.logger import logger
+from api_foundry.utils import model_factory as model_factory_module
 from api_foundry.utils.model_factory import ModelFactory
 from api_foundry.utils.app_exception import ApplicationException
 
@@ -66,6 +67,31 @@ def test_set_spec():
             }
         },
         "path_operations": {},
+        "relation_graph": {
+            "TestSchema": {
+                "table_name": "TestSchema",
+                "relations": {},
+                "reachable": {},
+            }
+        },
+        "sql_templates": {
+            "TestSchema": {
+                "table_name": "TestSchema",
+                "columns": ["id", "name"],
+                "key_predicate": "id = %(id)s",
+                "read": "SELECT id, name FROM TestSchema",
+                "read_by_key": "SELECT id, name FROM TestSchema WHERE id = %(id)s",
+                "create": (
+                    "INSERT INTO TestSchema ( name ) VALUES ( %(name)s ) "
+                    "RETURNING id, name"
+                ),
+                "update": (
+                    "UPDATE TestSchema SET name = %(name)s WHERE id = %(id)s "
+                    "RETURNING id, name"
+                ),
+                "delete": "DELETE FROM TestSchema WHERE id = %(id)s RETURNING id, name",
+            }
+        },
     }
 
 
@@ -235,6 +261,8 @@ components:
         assert str(ke) == expected
     result = model_factory.get_config_output()
     log.info("result: %s", result)
+    # statement templates are covered by tests/test_sql_templates.py
+    assert list(result.pop("sql_templates")) == ["artist", "album"]
     assert result == {
         "schema_objects": {
             "artist": {
@@ -314,6 +342,38 @@ components:
             },
         },
         "path_operations": {},
+        "relation_graph": {
+            "artist": {
+                "table_name": "artist",
+                "relations": {
+                    "album_items": {
+                        "schema_name": "album",
+                        "cardinality": "many",
+                        "parent_table": "artist",
+                        "parent_column": "artist_id",
+                        "child_table": "album",
+                        # no child_property, so the runtime joins on the
+                        # child's primary key
+                        "child_column": "album_id",
+                    }
+                },
+                "reachable": {"album": ["album_items"]},
+            },
+            "album": {
+                "table_name": "album",
+                "relations": {
+                    "artist": {
+                        "schema_name": "artist",
+                        "cardinality": "one",
+                        "parent_table": "album",
+                        "parent_column": "artist_id",
+                        "child_table": "artist",
+                        "child_column": "artist_id",
+                    }
+                },
+                "reachable": {"artist": ["artist"]},
+            },
+        },
     }
 
 
@@ -802,3 +862,552 @@ def test_permissions_concise_format():
 
     # Role-level WHERE clause should be preserved
     assert album_perms["where"] == "album_id <= 50"
+
+
+@pytest.mark.unit
+def test_resolve_all_refs_shares_bare_references():
+    spec = {
+        "components": {
+            "schemas": {
+                "address": {"type": "object", "properties": {"city": {}}},
+                "a": {"properties": {"home": {"$ref": "#/components/schemas/address"}}},
+                "b": {
+                    "properties": {
+                        "work": {"$ref": "#/components/schemas/address"},
+                        "billing": {
+                            "$ref": "#/components/schemas/address",
+                            "description": "override",
+                        },
+                    }
+                },
+            }
+        }
+    }
+    resolved = ModelFactory({}).resolve_all_refs(spec)
+    schemas = resolved["components"]["schemas"]
+
+    home = schemas["a"]["properties"]["home"]
+    work = schemas["b"]["properties"]["work"]
+    billing = schemas["b"]["properties"]["billing"]
+    assert home is work
+    assert home == {
+        "type": "object",
+        "properties": {"city": {}},
+        "$ref": "#/components/schemas/address",
+    }
+    # sibling keys still produce their own merged node
+    assert billing is not home
+    assert billing["description"] == "override"
+    assert "description" not in home
+    # the source spec is left untouched
+    assert spec["components"]["schemas"]["a"]["properties"]["home"] == {
+        "$ref": "#/components/schemas/address"
+    }
+
+
+@pytest.mark.unit
+def test_resolve_all_refs_follows_alias_chain():
+    spec = {
+        "components": {
+            "schemas": {
+                "customer": {"type": "object", "x-af-database": "db"},
+                "client": {"$ref": "#/components/schemas/customer"},
+                "order": {
+                    "properties": {"buyer": {"$ref": "#/components/schemas/client"}}
+                },
+            }
+        }
+    }
+    resolved = ModelFactory({}).resolve_all_refs(spec)
+    buyer = resolved["components"]["schemas"]["order"]["properties"]["buyer"]
+    assert buyer == {
+        "type": "object",
+        "x-af-database": "db",
+        "$ref": "#/components/schemas/client",
+    }
+
+
+@pytest.mark.unit
+def test_resolve_all_refs_detects_cycles():
+    spec = {
+        "components": {
+            "schemas": {
+                "a": {"$ref": "#/components/schemas/b"},
+                "b": {"$ref": "#/components/schemas/a"},
+                "c": {"properties": {"x": {"$ref": "#/components/schemas/a"}}},
+            }
+        }
+    }
+    with pytest.raises(ApplicationException) as exc:
+        ModelFactory({}).resolve_all_refs(spec)
+    assert exc.value.message == (
+        "Circular $ref chain detected: #/components/schemas/b -> "
+        "#/components/schemas/a -> #/components/schemas/b"
+    )
+
+
+LAZY_SPEC = {
+    "openapi": "3.0.0",
+    "paths": {
+        "/api/active": {
+            "get": {
+                "x-af-database": "db",
+                "x-af-sql": "SELECT 1",
+            }
+        }
+    },
+    "components": {
+        "schemas": {
+            "good": {
+                "type": "object",
+                "x-af-database": "db",
+                "properties": {"id": {"type": "integer", "x-af-primary-key": "auto"}},
+            },
+            "bad": {
+                "type": "object",
+                "x-af-database": "db",
+                "properties": {"price": {"type": "float"}},
+            },
+            "dto": {"type": "object", "properties": {"name": {"type": "string"}}},
+        }
+    },
+}
+
+
+@pytest.mark.unit
+def test_lazy_factory_builds_entries_on_first_access():
+    model_factory = ModelFactory(LAZY_SPEC, lazy=True)
+
+    assert list(model_factory.schema_objects) == ["good", "bad"]
+    assert "bad" in model_factory.schema_objects
+    assert model_factory.schema_objects.built_count == 0
+
+    good = model_factory.schema_objects["good"]
+    assert good.primary_key == "id"
+    assert model_factory.schema_objects["good"] is good
+    assert model_factory.schema_objects.built_count == 1
+
+    assert model_factory.path_operations["active_read"].sql == "SELECT 1"
+    with pytest.raises(KeyError):
+        model_factory.schema_objects["dto"]
+
+
+@pytest.mark.unit
+def test_lazy_factory_reports_same_errors_as_eager():
+    with pytest.raises(ApplicationException) as eager:
+        ModelFactory(LAZY_SPEC)
+
+    model_factory = ModelFactory(LAZY_SPEC, lazy=True)
+    with pytest.raises(ApplicationException) as lazy:
+        model_factory.schema_objects["bad"]
+    assert lazy.value.message == eager.value.message
+
+    with pytest.raises(ApplicationException) as validated:
+        ModelFactory(LAZY_SPEC, lazy=True).validate_all()
+    assert validated.value.message == eager.value.message
+
+
+@pytest.mark.unit
+def test_lazy_factory_config_output_matches_eager():
+    spec = {
+        "openapi": "3.0.0",
+        "paths": LAZY_SPEC["paths"],
+        "components": {"schemas": {"good": LAZY_SPEC["components"]["schemas"]["good"]}},
+    }
+    lazy = ModelFactory(spec, lazy=True)
+    lazy.validate_all()
+    assert lazy.get_config_output() == ModelFactory(spec).get_config_output()
+
+
+@pytest.mark.unit
+def test_model_elements_use_slots_and_field_order():
+    model_factory = ModelFactory(LAZY_SPEC, lazy=True)
+    schema_object = model_factory.schema_objects["good"]
+    key = schema_object.properties["id"]
+
+    assert not hasattr(schema_object, "__dict__")
+    assert not hasattr(key, "__dict__")
+    with pytest.raises(AttributeError):
+        key.unknown_attribute = 1
+
+    # None-valued fields are omitted and the rest keep declaration order
+    assert list(key.to_dict()) == [
+        "api_name",
+        "api_type",
+        "column_name",
+        "column_type",
+        "required",
+        "key_type",
+    ]
+    assert list(schema_object.to_dict()) == [
+        "api_name",
+        "database",
+        "table_name",
+        "properties",
+        "primary_key",
+        "relations",
+        "permissions",
+        "inject_properties",
+    ]
+
+
+@pytest.mark.unit
+def test_relation_graph_resolves_columns_and_reachability():
+    spec = {
+        "openapi": "3.0.0",
+        "components": {
+            "schemas": {
+                "customer": {
+                    "type": "object",
+                    "x-af-database": "chinook",
+                    "x-af-schema": "sales",
+                    "properties": {
+                        "customer_id": {
+                            "type": "integer",
+                            "x-af-primary-key": "auto",
+                            "x-af-column-name": "cust_id",
+                        },
+                        "invoices": {
+                            "type": "array",
+                            "items": {"$ref": "#/components/schemas/invoice"},
+                            "x-af-child-property": "customer_id",
+                        },
+                    },
+                },
+                "invoice": {
+                    "type": "object",
+                    "x-af-database": "chinook",
+                    "properties": {
+                        "invoice_id": {"type": "integer", "x-af-primary-key": "auto"},
+                        "customer_id": {
+                            "type": "integer",
+                            "x-af-column-name": "invoice_customer_id",
+                        },
+                        "lines": {
+                            "type": "array",
+                            "items": {"$ref": "#/components/schemas/invoice_line"},
+                            "x-af-child-property": "invoice_id",
+                        },
+                    },
+                },
+                "invoice_line": {
+                    "type": "object",
+                    "x-af-database": "chinook",
+                    "properties": {
+                        "invoice_line_id": {
+                            "type": "integer",
+                            "x-af-primary-key": "auto",
+                        },
+                        "invoice_id": {"type": "integer"},
+                    },
+                },
+            }
+        },
+    }
+    graph = ModelFactory(spec).get_config_output()["relation_graph"]
+
+    assert graph["customer"]["table_name"] == "sales.customer"
+    assert graph["customer"]["relations"]["invoices"] == {
+        "schema_name": "invoice",
+        "cardinality": "many",
+        "parent_table": "sales.customer",
+        "parent_column": "cust_id",
+        "child_table": "invoice",
+        "child_column": "invoice_customer_id",
+    }
+    assert graph["customer"]["reachable"] == {
+        "invoice": ["invoices"],
+        "invoice_line": ["invoices", "lines"],
+    }
+    assert graph["invoice_line"]["reachable"] == {}
+
+
+@pytest.mark.unit
+def test_permission_masks_resolved_against_properties():
+    spec = yaml.safe_load(
+        """
+paths:
+    /account_summary:
+        get:
+            x-af-database: db
+            x-af-sql: SELECT id, email, balance FROM account
+            responses:
+                "200":
+                    content:
+                        application/json:
+                            schema:
+                                type: array
+                                items:
+                                    properties:
+                                        id: {type: integer}
+                                        email: {type: string}
+                                        balance: {type: number}
+            x-af-permissions:
+                default:
+                    read:
+                        auditor: "^(id|balance)$"
+components:
+    schemas:
+        Account:
+            type: object
+            x-af-database: db
+            properties:
+                id:
+                    type: integer
+                    x-af-primary-key: auto
+                email:
+                    type: string
+                email_verified:
+                    type: boolean
+            x-af-permissions:
+                default:
+                    read:
+                        user:
+                            properties: "email"
+                            where: "id = ${claims.sub}"
+                        admin: ".*"
+                    create:
+                        admin: "^(email|email_verified)$"
+                    delete:
+                        admin: true
+        Invoice:
+            type: object
+            x-af-database: db
+            properties:
+                id:
+                    type: integer
+                    x-af-primary-key: auto
+                total:
+                    type: number
+            x-af-permissions:
+                sales_associate:
+                    where: "region = '${claims.territory}'"
+                    read:
+                        properties: ".*"
+                    write:
+                        properties: "total"
+"""
+    )
+    out = ModelFactory(spec).get_config_output()
+
+    account = out["schema_objects"]["Account"]
+    # re.match semantics: "email" is a prefix match, like the runtime
+    assert account["permission_properties"] == {
+        "default": {
+            "read": {
+                "user": ["email", "email_verified"],
+                "admin": ["id", "email", "email_verified"],
+            },
+            "write": {"admin": ["email", "email_verified"]},
+        }
+    }
+    # the raw rules are kept alongside
+    assert account["permissions"]["default"]["read"]["admin"] == ".*"
+
+    # legacy role-first rules are reported under the default provider
+    assert out["schema_objects"]["Invoice"]["permission_properties"] == {
+        "default": {
+            "read": {"sales_associate": ["id", "total"]},
+            "write": {"sales_associate": ["total"]},
+        }
+    }
+
+    operation = out["path_operations"]["account_summary_read"]
+    assert operation["permission_properties"] == {
+        "default": {"read": {"auditor": ["id", "balance"]}}
+    }
+
+
+@pytest.mark.unit
+def test_legacy_create_and_update_masks_fold_into_write():
+    permissions = {
+        "user": {"read": ".*", "update": "^name$"},
+        "admin": {"create": "^id$", "update": ".*"},
+    }
+    masks = model_factory_module.compile_permission_masks(
+        permissions, {"read": ["id", "name"], "write": ["id", "name"]}
+    )
+    # as in the runtime, a later rule for the same action wins
+    assert masks == {
+        "default": {
+            "read": {"user": ["id", "name"]},
+            "write": {"user": ["name"], "admin": ["id", "name"]},
+        }
+    }
+
+
+@pytest.mark.unit
+def test_permission_where_compiled_to_claim_templates():
+    spec = yaml.safe_load(
+        """
+components:
+    schemas:
+        Account:
+            type: object
+            x-af-database: db
+            properties:
+                id:
+                    type: integer
+                    x-af-primary-key: auto
+                email:
+                    type: string
+            x-af-permissions:
+                default:
+                    read:
+                        user:
+                            properties: ".*"
+                            where: "id = ${claims.sub} AND email LIKE '%@' || ${claims.domain}"
+                        admin: ".*"
+        Invoice:
+            type: object
+            x-af-database: db
+            properties:
+                id:
+                    type: integer
+                    x-af-primary-key: auto
+                total:
+                    type: number
+            x-af-permissions:
+                sales_associate:
+                    where: "region = '${claims.territory}'"
+                    read:
+                        properties: ".*"
+                    write:
+                        properties: "total"
+                        where: "owner_id = ${claims.sub} OR manager_id = ${claims.sub}"
+"""
+    )
+    out = ModelFactory(spec).get_config_output()
+
+    assert out["schema_objects"]["Account"]["permission_where"] == {
+        "default": {
+            "read": {
+                "user": {
+                    "sql": "id = %(claim_sub)s AND email LIKE '%%@' || %(claim_domain)s",
+                    "claims": ["sub", "domain"],
+                }
+            }
+        }
+    }
+    # role-level where applies where the action has none; the quotes
+    # around the reference go since the claim is bound as a parameter
+    assert out["schema_objects"]["Invoice"]["permission_where"] == {
+        "default": {
+            "read": {
+                "sales_associate": {
+                    "sql": "region = %(claim_territory)s",
+                    "claims": ["territory"],
+                }
+            },
+            "write": {
+                "sales_associate": {
+                    "sql": "owner_id = %(claim_sub)s OR manager_id = %(claim_sub)s",
+                    "claims": ["sub"],
+                }
+            },
+        }
+    }
+
+
+@pytest.mark.unit
+def test_legacy_update_where_compiled_under_write():
+    permissions = {
+        "user": {
+            "where": "tenant = ${claims.tenant}",
+            "read": ".*",
+            "update": {"properties": "^name$", "where": "id = ${claims.sub}"},
+        }
+    }
+    where = model_factory_module.compile_permission_where(permissions, "Account")
+    assert where == {
+        "default": {
+            "read": {
+                "user": {"sql": "tenant = %(claim_tenant)s", "claims": ["tenant"]}
+            },
+            "write": {"user": {"sql": "id = %(claim_sub)s", "claims": ["sub"]}},
+        }
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "where",
+    ["id = ${claim.sub}", "id = ${claims.}", "id = ${claims.a.b}", "id = ${claims.sub"],
+)
+def test_permission_where_rejects_malformed_claim_reference(where):
+    spec = {
+        "components": {
+            "schemas": {
+                "Account": {
+                    "type": "object",
+                    "x-af-database": "db",
+                    "properties": {
+                        "id": {"type": "integer", "x-af-primary-key": "auto"}
+                    },
+                    "x-af-permissions": {
+                        "default": {
+                            "read": {"user": {"properties": ".*", "where": where}}
+                        }
+                    },
+                }
+            }
+        }
+    }
+    with pytest.raises(ApplicationException) as exc_info:
+        ModelFactory(spec).get_config_output()
+    assert "schema object 'Account'" in exc_info.value.message
+    assert "'user'" in exc_info.value.message
+
+
+def parallel_spec(count: int, bad: set = frozenset()) -> dict:
+    schemas = {}
+    for i in range(count):
+        schemas[f"schema_{i}"] = {
+            "type": "object",
+            "x-af-database": "db",
+            "properties": {
+                "id": {
+                    "type": "integer",
+                    "x-af-primary-key": "unknown" if i in bad else "auto",
+                },
+                "name": {"type": "string"},
+            },
+        }
+    return {"components": {"schemas": schemas}}
+
+
+@pytest.mark.unit
+def test_parallel_factory_matches_serial(monkeypatch):
+    monkeypatch.setattr(model_factory_module, "PARALLEL_MIN_SCHEMAS", 4)
+    spec = parallel_spec(12)
+
+    parallel = ModelFactory(spec, workers=2)
+    serial = ModelFactory(spec)
+
+    assert list(parallel.schema_objects) == list(serial.schema_objects)
+    assert parallel.get_config_output() == serial.get_config_output()
+
+
+@pytest.mark.unit
+def test_parallel_factory_raises_first_serial_error(monkeypatch):
+    monkeypatch.setattr(model_factory_module, "PARALLEL_MIN_SCHEMAS", 4)
+    spec = parallel_spec(12, bad={5, 10})
+
+    with pytest.raises(ApplicationException) as serial:
+        ModelFactory(spec)
+    with pytest.raises(ApplicationException) as parallel:
+        ModelFactory(spec, workers=3)
+
+    assert "schema_5" in serial.value.message
+    assert parallel.value.message == serial.value.message
+    assert parallel.value.status_code == serial.value.status_code
+
+
+@pytest.mark.unit
+def test_parallel_factory_is_serial_below_threshold(monkeypatch):
+    def fail(*args):
+        raise AssertionError("process pool used for a small spec")
+
+    monkeypatch.setattr(model_factory_module, "build_elements_parallel", fail)
+    factory = ModelFactory(parallel_spec(3), workers=4)
+    assert list(factory.schema_objects) == ["schema_0", "schema_1", "schema_2"]
@@ -0,0 +1,56 @@
+# test_schema_validator.py
+
+import re
+
+import pytest
+
+from api_foundry.utils.schema_validator import (
+    compiled_pattern,
+    pattern_cache_info,
+    validate_permissions,
+    validate_tags,
+)
+
+
+@pytest.mark.unit
+def test_compiled_pattern_is_shared():
+    first = compiled_pattern("^(id|email)$")
+
+    assert compiled_pattern("^(id|email)$") is first
+    assert first.match("email")
+
+
+@pytest.mark.unit
+def test_invalid_pattern_is_reported_and_not_cached():
+    before = pattern_cache_info().currsize
+    with pytest.raises(re.error):
+        compiled_pattern("([unclosed")
+    assert pattern_cache_info().currsize == before
+
+    with pytest.raises(ValueError) as exc:
+        validate_permissions({"default": {"read": {"user": "([unclosed"}}})
+    assert "Invalid regex pattern '([unclosed'" in str(exc.value)
+
+
+@pytest.mark.unit
+def test_validation_reuses_compiled_patterns():
+    permissions = {
+        "default": {
+            "read": {"user": ".*", "auditor": {"properties": "^validator_.*$"}},
+            "write": {"admin": "^validator_.*$"},
+        }
+    }
+    validate_permissions(permissions)
+    hits = pattern_cache_info().hits
+
+    validate_permissions(permissions)
+
+    assert pattern_cache_info().hits == hits + 3
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("tags", ["sales", ["sales", 1], {"sales": True}])
+def test_invalid_tags_are_rejected(tags):
+    assert validate_tags(["sales", "reports"], "schema object 'invoice'")
+    with pytest.raises(ValueError, match="schema object 'invoice'"):
+        validate_tags(tags, "schema object 'invoice'")
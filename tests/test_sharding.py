@@ -0,0 +1,166 @@
+# test_sharding.py
+
+import pytest
+
+from api_foundry.iac.gateway_spec import APISpecEditor
+from api_foundry.iac.pulumi.api_foundry import APIFoundry
+from api_foundry.utils.model_compiler import compile_model
+from api_foundry.utils.sharding import DEFAULT_SHARD, partition_spec, shard_name
+
+
+def _schema(database: str, **properties) -> dict:
+    return {
+        "type": "object",
+        "x-af-database": database,
+        "properties": {
+            "id": {"type": "integer", "x-af-primary-key": "auto"},
+            **properties,
+        },
+    }
+
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Shop", "version": "1"},
+    "paths": {
+        "/report": {
+            "parameters": [{"name": "year", "in": "query"}],
+            "get": {
+                "x-af-database": "Sales",
+                "x-af-sql": "SELECT 1",
+                "tags": ["reports"],
+                "responses": {
+                    "200": {
+                        "description": "ok",
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/invoice"}
+                            }
+                        },
+                    }
+                },
+            },
+            "post": {
+                "x-af-database": "hr",
+                "x-af-sql": "SELECT 2",
+                "responses": {"200": {"description": "ok"}},
+            },
+        },
+        "/health": {"get": {"responses": {"200": {"description": "ok"}}}},
+    },
+    "components": {
+        "schemas": {
+            "customer": _schema("Sales", name={"type": "string"}),
+            "invoice": _schema(
+                "Sales",
+                customer_id={"type": "integer"},
+                customer={
+                    "$ref": "#/components/schemas/customer",
+                    "x-af-parent-property": "customer_id",
+                },
+            ),
+            "employee": {**_schema("hr"), "x-af-tags": ["people"]},
+            "review": _schema(
+                "hr",
+                invoice_id={"type": "integer"},
+                invoice={
+                    "$ref": "#/components/schemas/invoice",
+                    "x-af-parent-property": "invoice_id",
+                },
+            ),
+        }
+    },
+}
+
+
+@pytest.mark.unit
+def test_shard_name():
+    assert shard_name("Sales DB") == "sales-db"
+    assert shard_name("__") == DEFAULT_SHARD
+
+
+@pytest.mark.unit
+def test_partition_by_database():
+    shards = partition_spec(SPEC, "database")
+
+    assert list(shards) == ["sales", "hr", DEFAULT_SHARD]
+    sales, hr, default = shards.values()
+    assert sales.schema_names == ["customer", "invoice"]
+    assert hr.schema_names == ["employee", "review"]
+    assert default.schema_names == []
+
+    # referenced schemas come along so relations still resolve
+    assert list(hr.spec["components"]["schemas"]) == [
+        "customer",
+        "invoice",
+        "employee",
+        "review",
+    ]
+    assert list(sales.spec["components"]["schemas"]) == ["customer", "invoice"]
+    # a path item is split by method, keeping path-level keys
+    assert list(sales.paths["/report"]) == ["parameters", "get"]
+    assert list(hr.paths["/report"]) == ["parameters", "post"]
+    assert list(default.paths) == ["/health"]
+    assert list(default.spec["components"]["schemas"]) == []
+    # the source is shared, not copied or modified
+    assert sales.spec["info"] is SPEC["info"]
+    assert list(SPEC["paths"]["/report"]) == ["parameters", "get", "post"]
+
+
+@pytest.mark.unit
+def test_partition_by_tag_and_mapping():
+    by_tag = partition_spec(SPEC, "tag")
+    assert by_tag["people"].schema_names == ["employee"]
+    assert list(by_tag["reports"].paths) == ["/report"]
+    assert list(by_tag["reports"].spec["components"]["schemas"]) == [
+        "customer",
+        "invoice",
+    ]
+
+    mapped = partition_spec(
+        SPEC, {"Billing": ["customer", "invoice", "/report"], "ops": ["/health"]}
+    )
+    assert list(mapped) == ["billing", DEFAULT_SHARD, "ops"]
+    assert list(mapped["billing"].paths["/report"]) == ["parameters", "get", "post"]
+    assert mapped[DEFAULT_SHARD].schema_names == ["employee", "review"]
+
+    with pytest.raises(ValueError):
+        partition_spec(SPEC, "size")
+
+
+@pytest.mark.unit
+def test_shard_specs_compile_and_generate_only_own_operations(monkeypatch):
+    monkeypatch.setenv("API_FOUNDRY_MODEL_CACHE", "0")
+    hr = partition_spec(SPEC, "database")["hr"]
+
+    config = compile_model(hr.spec)
+    assert set(config["schema_objects"]) == {
+        "customer",
+        "invoice",
+        "employee",
+        "review",
+    }
+    assert list(config["path_operations"]) == ["report_create"]
+
+    editor = APISpecEditor(
+        open_api_spec=hr.spec, function=None, crud_schemas=hr.schema_names
+    )
+    editor.rest_api_spec()
+    paths = {integration["path"] for integration in editor.integrations}
+    assert "/employee" in paths and "/review" in paths
+    assert "/customer" not in paths and "/invoice" not in paths
+
+
+@pytest.mark.unit
+def test_integrations_assigned_by_path_and_method():
+    shards = partition_spec(SPEC, "database")
+    report_get = {"path": "/report", "method": "get", "function": None}
+    report_post = {"path": "/report", "method": "POST", "function": None}
+    unknown = {"path": "/other", "method": "get", "function": None}
+
+    assigned = APIFoundry._assign_integrations(
+        [report_get, report_post, unknown], shards
+    )
+    # /report is split by method between the sales and hr shards
+    assert assigned["sales"] == [report_get, unknown]
+    assert assigned["hr"] == [report_post]
@@ -0,0 +1,98 @@
+# test_spec_minifier.py
+
+import copy
+
+import pytest
+
+from api_foundry.utils.spec_minifier import minify_spec
+
+
+def _spec() -> dict:
+    album = {
+        "type": "object",
+        "description": "An album",
+        "x-af-database": "chinook",
+        "properties": {
+            "description": {"type": "string", "description": "Liner notes"},
+            "title": {"type": "string", "example": "Abbey Road", "default": None},
+            "format": {
+                "type": "string",
+                "enum": ["cd", "vinyl"],
+                "default": {"description": "literal data is kept"},
+            },
+        },
+    }
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Music", "version": "1", "description": "Docs"},
+        "security": [{"description": []}],
+        "paths": {
+            "/album": {
+                "get": {
+                    "summary": "List albums",
+                    "x-af-permissions": {"default": {"read": {"user": ".*"}}},
+                    "x-amazon-apigateway-integration": {"description": "kept"},
+                    "parameters": [
+                        {"name": "title", "in": "query", "description": "Filter"}
+                    ],
+                    "responses": {
+                        "200": {
+                            "description": "A list of album.",
+                            "content": {"application/json": {"schema": album}},
+                        }
+                    },
+                }
+            }
+        },
+        "components": {
+            "schemas": {"album": album},
+            "parameters": {"description": {"name": "d", "in": "query"}},
+        },
+    }
+
+
+@pytest.mark.unit
+def test_minify_drops_extensions_only():
+    spec = _spec()
+    snapshot = copy.deepcopy(spec)
+
+    result = minify_spec(spec)
+
+    assert spec == snapshot
+    album = result["components"]["schemas"]["album"]
+    assert "x-af-database" not in album
+    assert album["description"] == "An album"
+    operation = result["paths"]["/album"]["get"]
+    assert "x-af-permissions" not in operation
+    assert operation["summary"] == "List albums"
+    # the schema is minified once and stays shared
+    schema = operation["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema is album
+    # untouched subtrees are shared with the source
+    assert result["info"] is spec["info"]
+    assert result["components"]["parameters"] is spec["components"]["parameters"]
+
+
+@pytest.mark.unit
+def test_minify_strip_docs_keeps_names_and_data():
+    spec = _spec()
+    snapshot = copy.deepcopy(spec)
+
+    result = minify_spec(spec, strip_docs=True)
+
+    assert spec == snapshot
+    assert result["info"] == {"title": "Music", "version": "1"}
+    album = result["components"]["schemas"]["album"]
+    assert album["properties"] == {
+        "description": {"type": "string"},
+        "title": {"type": "string", "default": None},
+        "format": spec["components"]["schemas"]["album"]["properties"]["format"],
+    }
+    operation = result["paths"]["/album"]["get"]
+    assert "summary" not in operation
+    assert operation["parameters"] == [{"name": "title", "in": "query"}]
+    # response objects require a description
+    assert operation["responses"]["200"]["description"] == "A list of album."
+    assert operation["x-amazon-apigateway-integration"] == {"description": "kept"}
+    assert result["security"] == [{"description": []}]
+    assert "description" in result["components"]["parameters"]
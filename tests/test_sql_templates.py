@@ -0,0 +1,72 @@
+# test_sql_templates.py
+
+"""
+Golden-file tests for the SQL statement templates in the model config.
+
+Set UPDATE_GOLDEN=1 to rewrite tests/golden/sql_templates.yaml after an
+intended template change, then review the diff.
+"""
+
+import os
+
+import pytest
+import yaml
+
+from api_foundry.utils.model_factory import ModelFactory
+from api_foundry.utils.sql_templates import schema_sql_templates, soft_delete_filter
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), "golden")
+SPEC_FILE = os.path.join(GOLDEN_DIR, "sql_templates_spec.yaml")
+GOLDEN_FILE = os.path.join(GOLDEN_DIR, "sql_templates.yaml")
+
+
+@pytest.fixture(scope="module")
+def config():
+    with open(SPEC_FILE, "r", encoding="utf-8") as f:
+        return ModelFactory(yaml.safe_load(f)).get_config_output()
+
+
+@pytest.mark.unit
+def test_sql_templates_match_golden_file(config):
+    templates = config["sql_templates"]
+    if os.environ.get("UPDATE_GOLDEN"):
+        with open(GOLDEN_FILE, "w", encoding="utf-8") as f:
+            yaml.safe_dump(templates, f, sort_keys=False, width=1000)
+
+    with open(GOLDEN_FILE, "r", encoding="utf-8") as f:
+        assert templates == yaml.safe_load(f)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("schema", ["album", "artist", "invoice", "customer"])
+def test_key_statements_bind_primary_key(config, schema):
+    templates = config["sql_templates"][schema]
+    key = config["schema_objects"][schema]["primary_key"]
+
+    for action in ("read_by_key", "update", "delete"):
+        assert f"%({key})s" in templates[action]
+
+
+@pytest.mark.unit
+def test_schema_without_primary_key_has_no_key_statements(config):
+    templates = config["sql_templates"]["audit_log"]
+
+    assert set(templates) == {"table_name", "columns", "read", "create"}
+
+
+@pytest.mark.unit
+def test_soft_delete_filter_quotes_literals():
+    schema_object = {
+        "properties": {
+            "status": {
+                "api_name": "status",
+                "column_name": "status",
+                "soft_delete": {"strategy": "exclude_values", "values": ["it's", 3]},
+            }
+        }
+    }
+
+    assert soft_delete_filter(schema_object) == "status NOT IN ('it''s', 3)"
+    assert "soft_delete_filter" not in schema_sql_templates(
+        {"table_name": "t", "properties": {}}
+    )
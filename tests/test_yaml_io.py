@@ -0,0 +1,48 @@
+# test_yaml_io.py
+
+import importlib
+import os
+
+import pytest
+import yaml
+
+from api_foundry.utils import yaml_io
+
+
+@pytest.fixture
+def chinook_text():
+    path = os.path.join(os.getcwd(), "resources/chinook_api.yaml")
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.unit
+def test_load_matches_pure_python_loader(chinook_text):
+    assert yaml_io.safe_load(chinook_text) == yaml.load(
+        chinook_text, Loader=yaml.SafeLoader
+    )
+
+
+@pytest.mark.unit
+def test_dump_round_trips_like_pure_python_dumper(chinook_text):
+    spec = yaml.safe_load(chinook_text)
+    # libyaml folds long scalars differently, so compare the documents
+    fast = yaml_io.safe_dump(spec, sort_keys=False)
+    pure = yaml.dump(spec, Dumper=yaml.SafeDumper, sort_keys=False)
+    assert yaml.safe_load(fast) == yaml.safe_load(pure) == spec
+    assert list(yaml.safe_load(fast)) == list(spec)
+
+
+@pytest.mark.unit
+def test_falls_back_without_libyaml(monkeypatch, chinook_text):
+    monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+    monkeypatch.delattr(yaml, "CSafeDumper", raising=False)
+    try:
+        fallback = importlib.reload(yaml_io)
+        assert fallback.LIBYAML_AVAILABLE is False
+        assert fallback.SafeLoader is yaml.SafeLoader
+        spec = fallback.safe_load(chinook_text)
+        assert fallback.safe_load(fallback.safe_dump(spec)) == spec
+    finally:
+        monkeypatch.undo()
+        importlib.reload(yaml_io)